@@ -57,6 +57,7 @@ echo.
 
 REM Verificar/Instalar dependências
 echo 📦 Verificando dependências Python...
+REM deep-translator: alternativa opcional quando a página do Google muda
 pip show deep-translator >nul 2>&1
 if %errorlevel% neq 0 (
     echo 📥 Instalando deep-translator...
@@ -12,24 +12,43 @@
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox, scrolledtext
 from pathlib import Path
-import json
-import yaml
 import time
-from deep_translator import GoogleTranslator
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from typing import Dict, List, Tuple, Optional
+from typing import Any, Dict, Iterable, List, Tuple, Optional
 import threading
-import configparser
-import xml.etree.ElementTree as ET
-import csv
 import re
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field, replace
+
+from translation_backends import TranslationBackend, backend_from_env
+from text_packing import TextPacker
+from batch_planner import BatchPlanner
+from async_engine import AsyncTranslationEngine
+from cache_store import SQLiteCacheStore, KIND_FAILED, KIND_SKIPPED, policy_from_env
+from remote_cache import RemoteCache, remote_from_env
+from shared_cache import lookup_cached, open_shared_cache
+from skip_rules import SkipRules, load_profiles, load_rules, rules_from_env
+from format_adapters import TOML_AVAILABLE, FormatAdapter, Slot, get_adapter, parse_column_spec
+
 
-# Try to import toml (optional)
-try:
-    import toml
-    TOML_AVAILABLE = True
-except ImportError:
-    TOML_AVAILABLE = False
+@dataclass
+class FileStats:
+    """Resultado de um arquivo dentro do modpack"""
+    path: Path
+    total: int = 0
+    translated: int = 0
+    unique: int = 0
+    error: Optional[str] = None
+
+
+@dataclass
+class PackStats:
+    """Resultado do modpack inteiro"""
+    files: List[FileStats] = field(default_factory=list)
+    total: int = 0
+    translated: int = 0
+    unique: int = 0
+    # Textos que aparecem em mais de um arquivo (traduzidos uma vez só)
+    shared: int = 0
 
 
 class UniversalModTranslator:
@@ -42,6 +61,7 @@ class UniversalModTranslator:
         '.xml': 'XML',
         '.txt': 'TXT',
         '.csv': 'CSV',
+        '.tsv': 'TSV',
         '.ini': 'INI',
         '.cfg': 'INI',
         '.toml': 'TOML' if TOML_AVAILABLE else None,
@@ -61,438 +81,350 @@ class UniversalModTranslator:
         'zh-TW': '中文 (繁體)',
     }
     
-    def __init__(self):
-        # Usa pasta Cache na raiz do projeto (pasta pai de Scripts)
-        base_dir = Path(__file__).parent.parent
-        self.cache_file = base_dir / "Cache" / "universal_translations_cache.json"
-        self.cache_file.parent.mkdir(exist_ok=True)
-        self.cache: Dict[str, str] = self.load_cache()
-        
-    def load_cache(self) -> Dict[str, str]:
-        """Carrega o cache de traduções"""
-        if self.cache_file.exists():
-            with open(self.cache_file, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        return {}
+    def __init__(self, backend: Optional[TranslationBackend] = None,
+                 skip_rules: Optional[SkipRules] = None, remote: Optional[RemoteCache] = None):
+        # Backend de tradução (Google por padrão, ou o definido em UMT_BACKEND)
+        self.backend = backend or backend_from_env()
+        # Regras de "não traduzir" (perfil 'default' ou o definido em UMT_SKIP_PROFILE)
+        self.skip_rules = skip_rules or rules_from_env()
+        # Cache remoto compartilhado entre máquinas (opcional, UMT_REMOTE_CACHE)
+        self.remote = remote or remote_from_env()
+        self.packer = TextPacker.for_limits(self.backend.limits)
+        self.planner = BatchPlanner.for_limits(self.backend.limits)
+        # Usa pasta Cache na raiz do projeto (pasta pai de Scripts), a mesma do modo CLI
+        self.cache_dir = Path(__file__).parent.parent / "Cache"
+        self.cache: SQLiteCacheStore = self.load_cache()
+        # Opções por formato repassadas ao adaptador (ex.: colunas do CSV)
+        self.adapter_options: Dict[str, Dict[str, Any]] = {}
+        
+    def load_cache(self) -> SQLiteCacheStore:
+        """Abre o cache único (compartilhado com o modo CLI), importando os caches antigos"""
+        # Limites opcionais (UMT_CACHE_LIMITS) aplicados ao fechar o cache
+        return open_shared_cache(self.cache_dir, eviction=policy_from_env())
     
     def save_cache(self):
-        """Salva o cache de traduções"""
-        with open(self.cache_file, 'w', encoding='utf-8') as f:
-            json.dump(self.cache, f, ensure_ascii=False, indent=2)
+        """Grava as traduções pendentes no cache (e envia as novas ao cache remoto)"""
+        self.cache.flush()
+        if self.remote is not None:
+            self.remote.flush()
     
     def should_skip(self, text: str) -> bool:
-        """Verifica se o texto deve ser ignorado"""
-        if not text or not isinstance(text, str):
-            return True
-        
-        text = text.strip()
-        
-        # Muito curto ou só números
-        if len(text) < 2 or text.isdigit() or text.replace('.', '').isdigit():
-            return True
-        
-        # URLs, emails, paths
-        if any(x in text for x in ['http://', 'https://', 'www.', '@', 'C:\\', '/']):
-            return True
-        
-        # IDs técnicos (muitos underscores ou padrões técnicos)
-        if text.count('_') >= 2 and re.match(r'^[\w\-\[\]]+$', text):
-            return True
-        
-        # Prefixos/sufixos técnicos comuns
-        tech_patterns = [
-            'piece_', 'rae_', 'sapling_', 'Pickable_', 'IG_', 
-            '_TW', '_id', '_ID', 'config_', 'mod_'
-        ]
-        if any(text.startswith(p) or text.endswith(p) for p in tech_patterns):
-            return True
-        
-        return False
-    
-    def translate_text(self, text: str, src_lang: str, dest_lang: str) -> str:
-        """Traduz um texto com cache e retry"""
-        if self.should_skip(text):
-            return text
-        
-        # Chave do cache inclui idiomas
-        cache_key = f"{src_lang}:{dest_lang}:{text}"
-        
-        if cache_key in self.cache:
-            return self.cache[cache_key]
-        
-        # Traduzir com retry
-        translator = GoogleTranslator(source=src_lang, target=dest_lang)
-        for attempt in range(3):
-            try:
-                translated = translator.translate(text)
-                
-                if translated and translated != text:
-                    self.cache[cache_key] = translated
-                    return translated
-                return text
-                
-            except Exception as e:
-                if attempt < 2:
-                    time.sleep(0.3 * (attempt + 1))
-                else:
-                    # Falhou, retorna original
-                    return text
-        
-        return text
-    
-    def translate_batch(self, texts: List[str], src_lang: str, dest_lang: str) -> Dict[str, str]:
-        """Traduz um lote de textos (para paralelização)"""
-        translator = GoogleTranslator(source=src_lang, target=dest_lang)
-        results = {}
-        
-        for text in texts:
-            if self.should_skip(text):
-                results[text] = text
-                continue
-            
-            cache_key = f"{src_lang}:{dest_lang}:{text}"
-            
-            if cache_key in self.cache:
-                results[text] = self.cache[cache_key]
-                continue
-            
-            # Traduzir com retry
-            for attempt in range(3):
-                try:
-                    translated = translator.translate(text)
-                    if translated and translated != text:
-                        self.cache[cache_key] = translated
-                        results[text] = translated
-                    else:
-                        results[text] = text
-                    break
-                except Exception:
-                    if attempt < 2:
-                        time.sleep(0.3 * (attempt + 1))
-                    else:
-                        results[text] = text
-        
-        return results
-    
-    # ============= LEITORES DE FORMATOS =============
-    
-    def read_yaml(self, filepath: Path) -> List[Tuple[str, str]]:
-        """Lê arquivo YAML e extrai pares chave-valor"""
-        items = []
-        with open(filepath, 'r', encoding='utf-8') as f:
-            lines = f.readlines()
-            
-        for line in lines:
-            line = line.rstrip('\n')
-            
-            # Preservar comentários e linhas especiais
-            if not line.strip() or line.strip().startswith('#') or line.startswith(('? >-', ': >-', '  ')):
-                items.append((None, line))
-                continue
-            
-            # Parse linha YAML simples
-            if ': ' in line:
-                key, value = line.split(': ', 1)
-                key = key.strip().strip("'\"")
-                value = value.strip().strip("'\"")
-                items.append((key, value))
-            else:
-                items.append((None, line))
-        
-        return items
+        """Verifica se o texto deve ser ignorado (regras do perfil atual)"""
+        return self.skip_rules.should_skip(text)
     
-    def read_json(self, filepath: Path) -> Dict:
-        """Lê arquivo JSON"""
-        with open(filepath, 'r', encoding='utf-8') as f:
-            return json.load(f)
-    
-    def read_xml(self, filepath: Path) -> ET.ElementTree:
-        """Lê arquivo XML"""
-        return ET.parse(filepath)
-    
-    def read_txt(self, filepath: Path) -> List[str]:
-        """Lê arquivo TXT linha por linha"""
-        with open(filepath, 'r', encoding='utf-8') as f:
-            return f.readlines()
-    
-    def read_csv(self, filepath: Path) -> List[List[str]]:
-        """Lê arquivo CSV"""
-        with open(filepath, 'r', encoding='utf-8', newline='') as f:
-            return list(csv.reader(f))
-    
-    def read_ini(self, filepath: Path) -> configparser.ConfigParser:
-        """Lê arquivo INI/CFG"""
-        config = configparser.ConfigParser()
-        config.read(filepath, encoding='utf-8')
-        return config
-    
-    def read_toml(self, filepath: Path) -> Dict:
-        """Lê arquivo TOML"""
-        if not TOML_AVAILABLE:
-            raise ImportError("Instale o módulo 'toml': pip install toml")
-        with open(filepath, 'r', encoding='utf-8') as f:
-            return toml.load(f)
-    
-    # ============= ESCRITORES DE FORMATOS =============
-    
-    def write_yaml(self, filepath: Path, items: List[Tuple[str, str]]):
-        """Escreve arquivo YAML"""
-        with open(filepath, 'w', encoding='utf-8') as f:
-            for key, value in items:
-                if key is None:
-                    f.write(value + '\n')
-                else:
-                    # Escapar com aspas se tiver ':'
-                    if ':' in value:
-                        value = f'"{value}"'
-                    f.write(f"{key}: {value}\n")
-    
-    def write_json(self, filepath: Path, data: Dict):
-        """Escreve arquivo JSON"""
-        with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
-    
-    def write_xml(self, filepath: Path, tree: ET.ElementTree):
-        """Escreve arquivo XML"""
-        tree.write(filepath, encoding='utf-8', xml_declaration=True)
-    
-    def write_txt(self, filepath: Path, lines: List[str]):
-        """Escreve arquivo TXT"""
-        with open(filepath, 'w', encoding='utf-8') as f:
-            f.writelines(lines)
-    
-    def write_csv(self, filepath: Path, rows: List[List[str]]):
-        """Escreve arquivo CSV"""
-        with open(filepath, 'w', encoding='utf-8', newline='') as f:
-            writer = csv.writer(f)
-            writer.writerows(rows)
-    
-    def write_ini(self, filepath: Path, config: configparser.ConfigParser):
-        """Escreve arquivo INI/CFG"""
-        with open(filepath, 'w', encoding='utf-8') as f:
-            config.write(f)
-    
-    def write_toml(self, filepath: Path, data: Dict):
-        """Escreve arquivo TOML"""
-        if not TOML_AVAILABLE:
-            raise ImportError("Instale o módulo 'toml': pip install toml")
-        with open(filepath, 'w', encoding='utf-8') as f:
-            toml.dump(data, f)
+    def set_skip_profile(self, name: str) -> None:
+        """Troca o perfil de regras de "não traduzir" (relido do arquivo de configuração)"""
+        # Os "ignorados" do cache não são apagados: lookup_cached já os filtra pelas regras novas
+        self.skip_rules = load_rules(name)
     
     # ============= TRADUÇÃO UNIVERSAL =============
     
-    def translate_dict(self, data: Dict, src_lang: str, dest_lang: str, 
-                      callback=None) -> Dict:
-        """Traduz valores de um dicionário recursivamente"""
-        if isinstance(data, dict):
-            return {k: self.translate_dict(v, src_lang, dest_lang, callback) 
-                   for k, v in data.items()}
-        elif isinstance(data, list):
-            return [self.translate_dict(item, src_lang, dest_lang, callback) 
-                   for item in data]
-        elif isinstance(data, str):
-            translated = self.translate_text(data, src_lang, dest_lang)
-            if callback:
-                callback()
-            return translated
-        else:
-            return data
-    
-    def translate_file(self, input_path: Path, output_path: Path, 
-                      src_lang: str, dest_lang: str, 
-                      progress_callback=None, log_callback=None) -> Tuple[int, int]:
-        """Traduz um arquivo automaticamente baseado na extensão"""
-        
-        file_ext = input_path.suffix.lower()
-        format_type = self.SUPPORTED_FORMATS.get(file_ext)
-        
-        if not format_type:
-            raise ValueError(f"Formato não suportado: {file_ext}")
-        
-        total_items = 0
-        translated_items = 0
-        
-        # YAML (com tradução em lote paralela)
-        if format_type == 'YAML':
-            items = self.read_yaml(input_path)
-            total_items = sum(1 for k, v in items if k is not None)
-            
-            # FASE 1: Identificar textos para traduzir
+    def resolve_texts(self, texts: List[str], src_lang: str, dest_lang: str,
+                      progress_callback=None, log_callback=None) -> Dict[str, str]:
+        """Resolve cada texto único para o texto final num idioma (ver resolve_texts_multi)"""
+        return self.resolve_texts_multi(texts, src_lang, [dest_lang],
+                                        progress_callback, log_callback)[dest_lang]
+    
+    def resolve_texts_multi(self, texts: List[str], src_lang: str, dest_langs: List[str],
+                            progress_callback=None, log_callback=None) -> Dict[str, Dict[str, str]]:
+        """
+        Resolve cada texto único para o texto final em cada idioma (fases 1 e 2):
+        cache → regras de "ignorar" → tradução paralela do que falta.
+        Os dicionários retornados bastam para gerar as saídas sem nenhuma I/O.
+        """
+        # FASE 1: Identificar textos para traduzir
+        if log_callback:
+            log_callback("🔍 Fase 1: Identificando textos para traduzir...")
+            if self.cache.replayed:
+                log_callback(f"   ✓ Recuperadas {self.cache.replayed} traduções da execução interrompida")
+                self.cache.replayed = 0
+        
+        values = list(dict.fromkeys(texts))
+        # Uma única consulta ao cache para todos os idiomas
+        entries = lookup_cached(self.cache, src_lang, dest_langs, values, self.skip_rules)
+        # Texto final de cada valor original por idioma; a fase 3 só consulta estes dicionários
+        resolved: Dict[str, Dict[str, str]] = {
+            dest: {value: entry.value for value, entry in entries[dest].items()}
+            for dest in dest_langs
+        }
+        
+        # Regras de "ignorar" avaliadas numa passada só, não uma vez por idioma
+        skip = self.skip_rules.skipped(values)
+        pending: Dict[str, List[str]] = {}
+        for dest in dest_langs:
+            skipped = [v for v in values if v in skip and v not in resolved[dest]]
+            self.cache.put_outcomes(src_lang, dest, skipped, KIND_SKIPPED)
+            resolved[dest].update((v, v) for v in skipped)
+            pending[dest] = [v for v in values if v not in resolved[dest]]
+        
+        # Cache remoto: consultado depois do local e antes do serviço; o que vier fica no local
+        remote_found: Dict[str, int] = {}
+        if self.remote is not None:
+            for dest in dest_langs:
+                if not pending[dest]:
+                    continue
+                found = self.remote.get_many(src_lang, dest, pending[dest])
+                remote_found[dest] = len(found)
+                if found:
+                    self.cache.put_many(src_lang, dest, found)
+                    resolved[dest].update(found)
+                    pending[dest] = [v for v in pending[dest] if v not in found]
+        total_pending = sum(len(texts_) for texts_ in pending.values())
+        
+        if log_callback:
+            for dest in dest_langs:
+                prefix = f"[{dest}] " if len(dest_langs) > 1 else ""
+                log_callback(f"   ✓ {prefix}Encontrados {len(pending[dest])} textos únicos para traduzir")
+                log_callback(f"   ✓ {prefix}Já em cache: {len(entries[dest])} | "
+                             f"A traduzir agora: {len(pending[dest])}")
+                if dest in remote_found:
+                    log_callback(f"   ✓ {prefix}Do cache remoto: {remote_found[dest]}")
+                recent_failures = sum(1 for e in entries[dest].values() if e.kind == KIND_FAILED)
+                if recent_failures:
+                    log_callback(f"   ⏸️ {prefix}{recent_failures} textos falharam há pouco "
+                                 f"e aguardam nova tentativa")
+        
+        # Força update inicial
+        if progress_callback:
+            progress_callback()
+        
+        # FASE 2: Traduzir em paralelo se houver textos novos
+        if total_pending:
             if log_callback:
-                log_callback("🔍 Fase 1: Identificando textos para traduzir...")
+                log_callback("\n⚡ Fase 2: Traduzindo em paralelo...")
+            # Lotes por orçamento de caracteres, os mais caros primeiro (em cada idioma)
+            jobs = {dest: [unit.texts for unit in self.planner.plan(texts_)]
+                    for dest, texts_ in pending.items() if texts_}
             
-            texts_to_translate = []
-            cached_count = 0
-            for key, value in items:
-                if key is not None and not self.should_skip(value):
-                    cache_key = f"{src_lang}:{dest_lang}:{value}"
-                    if cache_key not in self.cache:
-                        texts_to_translate.append(value)
-                    else:
-                        cached_count += 1
-            
-            # Remove duplicatas
-            unique_texts = list(dict.fromkeys(texts_to_translate))
-            
-            if log_callback:
-                log_callback(f"   ✓ Encontrados {len(unique_texts)} textos únicos para traduzir")
-                log_callback(f"   ✓ Já em cache: {cached_count} | A traduzir agora: {len(unique_texts)}")
-            
-            # Força update inicial
+            # Avisar sobre fase de tradução paralela
             if progress_callback:
-                progress_callback()
+                # Chama callback para mostrar que está trabalhando
+                for _ in range(min(10, total_pending)):
+                    progress_callback()
             
-            # FASE 2: Traduzir em paralelo se houver textos novos
-            if unique_texts:
-                if log_callback:
-                    log_callback("\n⚡ Fase 2: Traduzindo em paralelo...")
-                batch_size = 50
-                batches = [unique_texts[i:i+batch_size] for i in range(0, len(unique_texts), batch_size)]
-                
-                # Avisar sobre fase de tradução paralela
+            def on_batch_done(dest: str, result: Dict[str, str], failed: List[str],
+                              rejected: List[str]):
+                # Falhas ficam registradas só até o prazo do cache negativo
+                deferred.extend(failed)
+                self.cache.put_outcomes(src_lang, dest, failed, KIND_FAILED)
+                resolved[dest].update((text, text) for text in failed)
+                # Recusados pelo disjuntor nem foram enviados: nada vai para o cache
+                not_sent.extend(rejected)
+                resolved[dest].update((text, text) for text in rejected)
+                # Grava no cache conforme os lotes terminam (e envia ao remoto em segundo plano)
+                self.cache.put_many(src_lang, dest, result)
+                if self.remote is not None:
+                    self.remote.put_many(src_lang, dest, result)
+                resolved[dest].update((text, tr or text) for text, tr in result.items())
+                # Atualizar progresso a cada lote concluído
                 if progress_callback:
-                    # Chama callback para mostrar que está trabalhando
-                    for _ in range(min(10, len(unique_texts))):
-                        progress_callback()
-                
-                with ThreadPoolExecutor(max_workers=min(6, len(batches))) as ex:
-                    futures = [ex.submit(self.translate_batch, batch, src_lang, dest_lang) for batch in batches]
-                    completed = 0
-                    for future in as_completed(futures):
-                        result = future.result()
-                        completed += 1
-                        # Atualiza cache com novos resultados
-                        for text, translation in result.items():
-                            cache_key = f"{src_lang}:{dest_lang}:{text}"
-                            self.cache[cache_key] = translation
-                        # Atualizar progresso a cada lote concluído
-                        if progress_callback:
-                            for _ in range(len(result)):
-                                progress_callback()
-            
-            # FASE 3: Gerar arquivo traduzido
-            if log_callback:
-                log_callback("\n📝 Fase 3: Gerando arquivo traduzido...")
-            
-            translated_items_list = []
-            for key, value in items:
-                if key is None:
-                    translated_items_list.append((None, value))
-                else:
-                    translated = self.translate_text(value, src_lang, dest_lang)
-                    if translated != value:
-                        translated_items += 1
-                    translated_items_list.append((key, translated))
-                    if progress_callback:
+                    for _ in range(len(result) + len(failed) + len(rejected)):
                         progress_callback()
             
-            self.write_yaml(output_path, translated_items_list)
-        
-        # JSON
-        elif format_type == 'JSON':
-            data = self.read_json(input_path)
+            deferred: List[str] = []
+            not_sent: List[str] = []
+            # Concorrência adaptativa (AIMD) num único event loop, compartilhada pelos idiomas
+            engine = AsyncTranslationEngine(self.backend, packer=self.packer)
+            engine.translate_targets(jobs, src_lang, on_batch_done)
+            self.cache.flush()
             
-            def count_strings(obj):
-                if isinstance(obj, str):
-                    return 1
-                elif isinstance(obj, dict):
-                    return sum(count_strings(v) for v in obj.values())
-                elif isinstance(obj, list):
-                    return sum(count_strings(item) for item in obj)
-                return 0
-            
-            total_items = count_strings(data)
-            
-            translated_data = self.translate_dict(data, src_lang, dest_lang, progress_callback)
-            translated_items = total_items  # Simplificado
-            
-            self.write_json(output_path, translated_data)
+            if log_callback:
+                log_callback(f"   ✓ {engine.requests} requisições | "
+                             f"pico de {engine.peak_in_flight} simultâneas")
+                conns = self.backend.connection_stats()
+                if conns is not None and conns.requests:
+                    log_callback(f"   ✓ Conexões HTTP: {conns.opened} abertas, "
+                                 f"{conns.reuse_ratio:.0%} das requisições reaproveitaram uma conexão")
+                if deferred:
+                    retry_min = (self.cache.ttls[KIND_FAILED] or 0) / 60
+                    log_callback(f"   ⏸️ {len(deferred)} textos adiados (serviço indisponível) — "
+                                 f"nova tentativa nas execuções após {retry_min:.0f} min")
+                if not_sent:
+                    log_callback(f"   ⏸️ {len(not_sent)} textos não enviados (disjuntor aberto) — "
+                                 f"nova tentativa na próxima execução")
+        
+        return resolved
+    
+    def _collect(self, input_path: Path) -> Tuple[FormatAdapter, Any, List[Slot]]:
+        """Lê o arquivo com o adaptador do formato e lista os slots traduzíveis"""
+        file_ext = input_path.suffix.lower()
+        format_type = self.SUPPORTED_FORMATS.get(file_ext)
         
-        # XML
-        elif format_type == 'XML':
-            tree = self.read_xml(input_path)
-            root = tree.getroot()
-            
-            def translate_element(elem):
-                nonlocal total_items, translated_items
-                if elem.text and elem.text.strip():
-                    total_items += 1
-                    original = elem.text
-                    elem.text = self.translate_text(elem.text, src_lang, dest_lang)
-                    if elem.text != original:
-                        translated_items += 1
-                    if progress_callback:
-                        progress_callback()
-                
-                for child in elem:
-                    translate_element(child)
-            
-            translate_element(root)
-            self.write_xml(output_path, tree)
+        if not format_type:
+            raise ValueError(f"Formato não suportado: {file_ext}")
         
-        # TXT
-        elif format_type == 'TXT':
-            lines = self.read_txt(input_path)
-            total_items = len(lines)
-            
-            translated_lines = []
-            for line in lines:
-                translated = self.translate_text(line.strip(), src_lang, dest_lang)
-                if translated != line.strip():
-                    translated_items += 1
-                translated_lines.append(translated + '\n')
+        adapter = get_adapter(format_type, **self.adapter_options.get(format_type, {}))
+        doc = adapter.read(input_path)
+        return adapter, doc, list(adapter.slots(doc))
+    
+    @staticmethod
+    def _write_outputs(adapter: FormatAdapter, doc: Any, slots: List[Slot],
+                       resolved: Dict[str, Dict[str, str]],
+                       outputs: Dict[str, Path]) -> Dict[str, int]:
+        """
+        Aplica as traduções de cada idioma e grava; retorna quantos slots mudaram
+        por idioma. O documento é fechado no fim (arquivos mapeados são liberados).
+        """
+        changed: Dict[str, int] = {}
+        try:
+            for i, (dest, output_path) in enumerate(outputs.items()):
+                translations = {}
+                for slot in slots:
+                    # Só consulta: nenhum texto volta ao serviço nesta fase
+                    translated = resolved[dest].get(slot.text, slot.text)
+                    if translated != slot.text:
+                        translations[slot.address] = translated
+                adapter.apply(doc, translations)
+                output_path.parent.mkdir(parents=True, exist_ok=True)
+                adapter.write(output_path, doc)
+                changed[dest] = len(translations)
+                # O documento foi lido uma vez só: volta ao original antes do próximo idioma
+                if i < len(outputs) - 1:
+                    adapter.apply(doc, {slot.address: slot.text for slot in slots
+                                        if slot.address in translations})
+        finally:
+            adapter.close(doc)
+        return changed
+    
+    def translate_file(self, input_path: Path, output_path: Path, 
+                      src_lang: str, dest_lang: str, 
+                      progress_callback=None, log_callback=None) -> Tuple[int, int]:
+        """Traduz um arquivo automaticamente baseado na extensão"""
+        return self.translate_file_multi(input_path, {dest_lang: output_path}, src_lang,
+                                         progress_callback, log_callback)[dest_lang]
+    
+    def translate_file_multi(self, input_path: Path, outputs: Dict[str, Path], src_lang: str,
+                             progress_callback=None, log_callback=None) -> Dict[str, Tuple[int, int]]:
+        """
+        Traduz um arquivo para vários idiomas de uma vez (outputs: idioma → arquivo
+        de saída). Leitura, regras de "ignorar" e deduplicação acontecem uma vez só.
+        """
+        # Mesmo pipeline para todos os formatos: coletar → deduplicar → traduzir → aplicar
+        adapter, doc, slots = self._collect(input_path)
+        resolved = self.resolve_texts_multi([slot.text for slot in slots], src_lang, list(outputs),
+                                            progress_callback, log_callback)
+        
+        # FASE 3: Gerar arquivo traduzido
+        if log_callback:
+            log_callback("\n📝 Fase 3: Gerando arquivo traduzido...")
+        
+        changed = self._write_outputs(adapter, doc, slots, resolved, outputs)
+        if progress_callback:
+            for _ in range(len(slots) * len(outputs)):
+                progress_callback()
+        return {dest: (len(slots), changed[dest]) for dest in outputs}
+    
+    def find_translatable_files(self, input_dir: Path,
+                                exclude: Iterable[Path] = ()) -> List[Path]:
+        """Arquivos de formato suportado na árvore (ignorando as pastas em 'exclude')"""
+        exclude = [Path(p) for p in exclude]
+        found = []
+        for path in sorted(input_dir.rglob('*')):
+            if not path.is_file() or not self.SUPPORTED_FORMATS.get(path.suffix.lower()):
+                continue
+            if any(ex in path.parents for ex in exclude):
+                continue
+            found.append(path)
+        return found
+    
+    def translate_directory(self, input_dir: Path, output_dir: Path,
+                            src_lang: str, dest_lang: str,
+                            progress_callback=None, log_callback=None,
+                            max_workers: int = 8) -> PackStats:
+        """
+        Traduz um modpack inteiro: lê todos os arquivos, deduplica os textos
+        entre eles, traduz a união uma única vez e grava as saídas em paralelo
+        (mesma estrutura de pastas em output_dir).
+        """
+        return self.translate_directory_multi(input_dir, {dest_lang: output_dir}, src_lang,
+                                              progress_callback, log_callback,
+                                              max_workers)[dest_lang]
+    
+    def translate_directory_multi(self, input_dir: Path, output_dirs: Dict[str, Path],
+                                  src_lang: str, progress_callback=None, log_callback=None,
+                                  max_workers: int = 8) -> Dict[str, PackStats]:
+        """Como translate_directory, para vários idiomas (output_dirs: idioma → pasta)"""
+        files = self.find_translatable_files(input_dir, exclude=output_dirs.values())
+        if log_callback:
+            log_callback(f"📦 {len(files)} arquivos suportados em {input_dir}")
+        
+        # Leitura em paralelo; um arquivo com erro não derruba o modpack
+        collected: Dict[Path, Tuple[FormatAdapter, Any, List[Slot]]] = {}
+        read_errors: Dict[Path, str] = {}
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {executor.submit(self._collect, path): path for path in files}
+            for future in as_completed(futures):
+                path = futures[future]
+                try:
+                    collected[path] = future.result()
+                except Exception as e:
+                    read_errors[path] = str(e)
+        
+        # Deduplicação global: cada texto vai ao serviço uma vez para o pack inteiro
+        files_per_text: Dict[str, int] = {}
+        unique_per_file: Dict[Path, int] = {}
+        for path, (_, _, slots) in collected.items():
+            texts = set(slot.text for slot in slots)
+            unique_per_file[path] = len(texts)
+            for text in texts:
+                files_per_text[text] = files_per_text.get(text, 0) + 1
+        total = sum(len(slots) for _, _, slots in collected.values())
+        shared = sum(1 for n in files_per_text.values() if n > 1)
+        if log_callback:
+            log_callback(f"   ✓ {total} textos | {len(files_per_text)} únicos no pack | "
+                         f"{shared} repetidos entre arquivos\n")
+        
+        resolved = self.resolve_texts_multi(list(files_per_text), src_lang, list(output_dirs),
+                                            progress_callback, log_callback)
+        
+        # FASE 3: Gerar todos os arquivos em paralelo
+        if log_callback:
+            log_callback(f"\n📝 Fase 3: Gerando {len(collected) * len(output_dirs)} arquivos traduzidos...")
+        changed: Dict[Path, Dict[str, int]] = {}
+        write_errors: Dict[Path, str] = {}
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {
+                executor.submit(self._write_outputs, adapter, doc, slots, resolved,
+                                {dest: out / path.relative_to(input_dir)
+                                 for dest, out in output_dirs.items()}): path
+                for path, (adapter, doc, slots) in collected.items()
+            }
+            for future in as_completed(futures):
+                path = futures[future]
+                try:
+                    changed[path] = future.result()
+                except Exception as e:
+                    write_errors[path] = str(e)
+                # Progresso sempre na thread que chamou (a GUI não é thread-safe)
                 if progress_callback:
-                    progress_callback()
-            
-            self.write_txt(output_path, translated_lines)
-        
-        # CSV
-        elif format_type == 'CSV':
-            rows = self.read_csv(input_path)
-            total_items = sum(len(row) for row in rows)
-            
-            translated_rows = []
-            for row in rows:
-                translated_row = []
-                for cell in row:
-                    translated = self.translate_text(cell, src_lang, dest_lang)
-                    if translated != cell:
-                        translated_items += 1
-                    translated_row.append(translated)
-                    if progress_callback:
+                    for _ in range(len(collected[path][2]) * len(output_dirs)):
                         progress_callback()
-                translated_rows.append(translated_row)
-            
-            self.write_csv(output_path, translated_rows)
         
-        # INI
-        elif format_type == 'INI':
-            config = self.read_ini(input_path)
-            
-            for section in config.sections():
-                for key in config[section]:
-                    total_items += 1
-                    value = config[section][key]
-                    translated = self.translate_text(value, src_lang, dest_lang)
-                    if translated != value:
-                        translated_items += 1
-                    config[section][key] = translated
-                    if progress_callback:
-                        progress_callback()
-            
-            self.write_ini(output_path, config)
-        
-        # TOML
-        elif format_type == 'TOML':
-            data = self.read_toml(input_path)
-            total_items = sum(1 for _ in str(data))  # Simplificado
-            
-            translated_data = self.translate_dict(data, src_lang, dest_lang, progress_callback)
-            translated_items = total_items  # Simplificado
-            
-            self.write_toml(output_path, translated_data)
-        
-        return total_items, translated_items
+        all_stats: Dict[str, PackStats] = {}
+        for dest in output_dirs:
+            stats = PackStats(total=total, unique=len(files_per_text), shared=shared)
+            for path in files:
+                fs = FileStats(path.relative_to(input_dir),
+                               error=read_errors.get(path) or write_errors.get(path))
+                if path in collected:
+                    fs.total = len(collected[path][2])
+                    fs.unique = unique_per_file[path]
+                    fs.translated = changed.get(path, {}).get(dest, 0)
+                stats.files.append(fs)
+            stats.translated = sum(fs.translated for fs in stats.files)
+            all_stats[dest] = stats
+        
+        if log_callback:
+            for path in files:
+                rel = path.relative_to(input_dir)
+                error = read_errors.get(path) or write_errors.get(path)
+                if error:
+                    log_callback(f"   ❌ {rel}: {error}")
+                    continue
+                done = " | ".join(f"{dest}: {changed[path][dest]}" for dest in output_dirs)
+                log_callback(f"   ✓ {rel}: {len(collected[path][2])} textos "
+                             f"({unique_per_file[path]} únicos) → {done}")
+        return all_stats
 
 
 class TranslatorGUI:
@@ -501,12 +433,14 @@ class TranslatorGUI:
     def __init__(self):
         self.window = tk.Tk()
         self.window.title("🌍 Universal Mod Translator")
-        self.window.geometry("800x600")
+        self.window.geometry("800x660")
         self.window.resizable(True, True)
         
         self.translator = UniversalModTranslator()
         self.input_file: Optional[Path] = None
         self.output_file: Optional[Path] = None
+        # Entrada é uma pasta de modpack em vez de um arquivo
+        self.pack_mode = False
         
         self.setup_ui()
         
@@ -531,8 +465,12 @@ class TranslatorGUI:
         self.input_label = ttk.Label(main_frame, text="Nenhum arquivo selecionado", 
                                      foreground="gray")
         self.input_label.grid(row=2, column=0, columnspan=2, sticky=tk.W)
-        ttk.Button(main_frame, text="Selecionar Arquivo", 
-                  command=self.select_input_file).grid(row=2, column=2, padx=5)
+        input_buttons = ttk.Frame(main_frame)
+        input_buttons.grid(row=2, column=2, padx=5)
+        ttk.Button(input_buttons, text="Selecionar Arquivo", 
+                  command=self.select_input_file).pack(side=tk.LEFT)
+        ttk.Button(input_buttons, text="Pasta (Modpack)", 
+                  command=self.select_input_dir).pack(side=tk.LEFT, padx=(5, 0))
         
         # Seleção de idiomas
         ttk.Label(main_frame, text="🌐 Idioma de Origem:").grid(row=3, column=0, sticky=tk.W, pady=5)
@@ -549,35 +487,54 @@ class TranslatorGUI:
                                        state='readonly', width=15)
         dest_lang_combo.grid(row=4, column=1, sticky=tk.W, padx=5)
         
+        # Idiomas extras traduzidos na mesma execução (uma saída por idioma)
+        ttk.Label(main_frame, text="➕ Outros Destinos (ex.: es, fr):").grid(row=3, column=2, sticky=tk.W, pady=5)
+        self.extra_langs_var = tk.StringVar(value='')
+        ttk.Entry(main_frame, textvariable=self.extra_langs_var, width=18).grid(row=4, column=2, sticky=tk.W)
+        
+        # Colunas de planilhas (CSV/TSV); vazio = todas as células
+        ttk.Label(main_frame, text="📊 Colunas CSV/TSV (ex.: text, description ou pt=en):").grid(
+            row=5, column=0, columnspan=2, sticky=tk.W, pady=5)
+        self.csv_columns_var = tk.StringVar(value='')
+        ttk.Entry(main_frame, textvariable=self.csv_columns_var, width=40).grid(
+            row=6, column=0, columnspan=2, sticky=tk.W)
+        
+        # Perfil de regras de "não traduzir" (embutidos + Config/skip_rules.json)
+        ttk.Label(main_frame, text="🚫 Regras de Ignorar:").grid(row=5, column=2, sticky=tk.W, pady=5)
+        self.skip_profile_var = tk.StringVar(value=self.translator.skip_rules.name)
+        ttk.Combobox(main_frame, textvariable=self.skip_profile_var,
+                     values=list(load_profiles()), state='readonly', width=15).grid(
+            row=6, column=2, sticky=tk.W)
+        
         # Seleção de arquivo de saída
-        ttk.Label(main_frame, text="💾 Arquivo de Saída:").grid(row=5, column=0, sticky=tk.W, pady=5)
+        ttk.Label(main_frame, text="💾 Arquivo de Saída:").grid(row=7, column=0, sticky=tk.W, pady=5)
         self.output_label = ttk.Label(main_frame, text="Será gerado automaticamente", 
                                       foreground="gray")
-        self.output_label.grid(row=6, column=0, columnspan=2, sticky=tk.W)
+        self.output_label.grid(row=8, column=0, columnspan=2, sticky=tk.W)
         ttk.Button(main_frame, text="Escolher Local", 
-                  command=self.select_output_file).grid(row=6, column=2, padx=5)
+                  command=self.select_output_file).grid(row=8, column=2, padx=5)
         
         # Botão traduzir
         self.translate_btn = ttk.Button(main_frame, text="🚀 INICIAR TRADUÇÃO", 
                                        command=self.start_translation, 
                                        state='disabled')
-        self.translate_btn.grid(row=7, column=0, columnspan=3, pady=20)
+        self.translate_btn.grid(row=9, column=0, columnspan=3, pady=20)
         
         # Barra de progresso
         self.progress_var = tk.DoubleVar()
         self.progress_bar = ttk.Progressbar(main_frame, variable=self.progress_var, 
                                            maximum=100, length=700)
-        self.progress_bar.grid(row=8, column=0, columnspan=3, pady=5)
+        self.progress_bar.grid(row=10, column=0, columnspan=3, pady=5)
         
         # Label de status
         self.status_label = ttk.Label(main_frame, text="Aguardando seleção de arquivo...", 
                                      foreground="blue")
-        self.status_label.grid(row=9, column=0, columnspan=3)
+        self.status_label.grid(row=11, column=0, columnspan=3)
         
         # Log de tradução
-        ttk.Label(main_frame, text="📝 Log de Tradução:").grid(row=10, column=0, sticky=tk.W, pady=5)
+        ttk.Label(main_frame, text="📝 Log de Tradução:").grid(row=12, column=0, sticky=tk.W, pady=5)
         self.log_text = scrolledtext.ScrolledText(main_frame, height=10, width=90)
-        self.log_text.grid(row=11, column=0, columnspan=3, pady=5)
+        self.log_text.grid(row=13, column=0, columnspan=3, pady=5)
         
         # Configurar grid
         self.window.columnconfigure(0, weight=1)
@@ -593,12 +550,12 @@ class TranslatorGUI:
     def select_input_file(self):
         """Seleciona arquivo de entrada"""
         filetypes = [
-            ("Todos suportados", "*.yaml *.yml *.json *.xml *.txt *.csv *.ini *.cfg *.toml"),
+            ("Todos suportados", "*.yaml *.yml *.json *.xml *.txt *.csv *.tsv *.ini *.cfg *.toml"),
             ("YAML", "*.yaml *.yml"),
             ("JSON", "*.json"),
             ("XML", "*.xml"),
             ("TXT", "*.txt"),
-            ("CSV", "*.csv"),
+            ("CSV/TSV", "*.csv *.tsv"),
             ("INI/CFG", "*.ini *.cfg"),
             ("TOML", "*.toml"),
             ("Todos", "*.*")
@@ -614,7 +571,8 @@ class TranslatorGUI:
             self.input_label.config(text=f"{self.input_file.name}", foreground="black")
             
             # Auto-gerar caminho de saída
-            if not self.output_file:
+            if not self.output_file or self.pack_mode:
+                self.pack_mode = False
                 output_name = f"{self.input_file.stem}_translated{self.input_file.suffix}"
                 self.output_file = self.input_file.parent / output_name
                 self.output_label.config(text=f"{self.output_file.name}", foreground="black")
@@ -622,12 +580,36 @@ class TranslatorGUI:
             self.translate_btn.config(state='normal')
             self.log(f"✅ Arquivo selecionado: {self.input_file.name}")
     
+    def select_input_dir(self):
+        """Seleciona a pasta de um modpack (todos os arquivos suportados dentro dela)"""
+        dirpath = filedialog.askdirectory(title="Selecione a pasta do modpack para traduzir")
+        
+        if dirpath:
+            self.input_file = Path(dirpath)
+            self.pack_mode = True
+            self.input_label.config(text=f"📦 {self.input_file.name}", foreground="black")
+            
+            # Saída numa pasta irmã com a mesma estrutura
+            self.output_file = self.input_file.parent / f"{self.input_file.name}_translated"
+            self.output_label.config(text=f"{self.output_file.name}", foreground="black")
+            
+            self.translate_btn.config(state='normal')
+            self.log(f"✅ Pasta selecionada: {self.input_file.name}")
+    
     def select_output_file(self):
         """Seleciona arquivo de saída"""
         if not self.input_file:
             messagebox.showwarning("Aviso", "Selecione o arquivo de entrada primeiro!")
             return
         
+        if self.pack_mode:
+            dirpath = filedialog.askdirectory(title="Escolha a pasta para os arquivos traduzidos")
+            if dirpath:
+                self.output_file = Path(dirpath)
+                self.output_label.config(text=f"{self.output_file.name}", foreground="black")
+                self.log(f"💾 Saída: {self.output_file}")
+            return
+        
         filepath = filedialog.asksaveasfilename(
             title="Escolha onde salvar o arquivo traduzido",
             defaultextension=self.input_file.suffix,
@@ -654,22 +636,48 @@ class TranslatorGUI:
         thread = threading.Thread(target=self.translate_worker, daemon=True)
         thread.start()
     
+    def _output_targets(self, dest_lang: str) -> Dict[str, Path]:
+        """Saída de cada idioma: a escolhida para o principal e uma com sufixo por idioma extra"""
+        outputs = {dest_lang: self.output_file}
+        for lang in re.split(r'[\s,;]+', self.extra_langs_var.get()):
+            if not lang or lang in outputs:
+                continue
+            if lang not in self.translator.AVAILABLE_LANGUAGES:
+                raise ValueError(f"Idioma desconhecido: {lang}")
+            if self.pack_mode:
+                outputs[lang] = self.output_file.with_name(f"{self.output_file.name}_{lang}")
+            else:
+                outputs[lang] = self.output_file.with_name(
+                    f"{self.output_file.stem}_{lang}{self.output_file.suffix}")
+        return outputs
+    
     def translate_worker(self):
         """Worker thread para tradução"""
         try:
             src_lang = self.src_lang_var.get()
             dest_lang = self.dest_lang_var.get()
+            outputs = self._output_targets(dest_lang)
+            csv_options = parse_column_spec(self.csv_columns_var.get())
+            self.translator.adapter_options['CSV'] = csv_options
+            self.translator.adapter_options['TSV'] = csv_options
+            self.translator.set_skip_profile(self.skip_profile_var.get())
             
             self.log(f"\n{'='*60}")
             self.log(f"🚀 INICIANDO TRADUÇÃO")
             self.log(f"{'='*60}")
-            self.log(f"📄 Arquivo: {self.input_file.name}")
-            self.log(f"🌍 {src_lang} → {dest_lang}")
-            self.log(f"📁 Formato: {self.input_file.suffix.upper()}")
+            if self.pack_mode:
+                self.log(f"📦 Modpack: {self.input_file}")
+            else:
+                self.log(f"📄 Arquivo: {self.input_file.name}")
+            self.log(f"🌍 {src_lang} → {', '.join(outputs)}")
+            if not self.pack_mode:
+                self.log(f"📁 Formato: {self.input_file.suffix.upper()}")
             self.log(f"{'='*60}")
             self.log(f"🔍 Analisando arquivo...")
             
             start_time = time.time()
+            # O cache fica aberto entre execuções: os contadores do resumo são só desta
+            cache_start = replace(self.translator.cache.stats)
             
             # Callback de progresso
             progress_counter = [0]
@@ -692,15 +700,22 @@ class TranslatorGUI:
             
             self.log("🚀 Iniciando tradução...\n")
             
-            # Traduzir
-            total, translated = self.translator.translate_file(
-                self.input_file,
-                self.output_file,
-                src_lang,
-                dest_lang,
-                update_progress,
-                self.log  # Passar função de log
-            )
+            # Traduzir (todos os idiomas numa única passada)
+            pack_stats = None
+            if self.pack_mode:
+                all_pack_stats = self.translator.translate_directory_multi(
+                    self.input_file, outputs, src_lang, update_progress, self.log)
+                pack_stats = all_pack_stats[dest_lang]
+                per_lang = {lang: (st.total, st.translated) for lang, st in all_pack_stats.items()}
+            else:
+                per_lang = self.translator.translate_file_multi(
+                    self.input_file,
+                    outputs,
+                    src_lang,
+                    update_progress,
+                    self.log  # Passar função de log
+                )
+            total, translated = per_lang[dest_lang]
             
             total_items[0] = total
             
@@ -717,15 +732,22 @@ class TranslatorGUI:
             self.log(f"✅ TRADUÇÃO CONCLUÍDA COM SUCESSO!")
             self.log(f"{'='*60}")
             self.log(f"📊 Estatísticas:")
+            if pack_stats is not None:
+                failed_files = sum(1 for fs in pack_stats.files if fs.error)
+                self.log(f"   • Arquivos: {len(pack_stats.files)} ({failed_files} com erro)")
+                self.log(f"   • Textos únicos no pack: {pack_stats.unique} "
+                         f"({pack_stats.shared} repetidos entre arquivos)")
             self.log(f"   • Total de itens: {total}")
             self.log(f"   • Traduzidos agora: {translated}")
             self.log(f"   • Do cache: {total - translated}")
+            for lang, (_, lang_translated) in per_lang.items():
+                if lang != dest_lang:
+                    self.log(f"   • [{lang}] Traduzidos: {lang_translated} → {outputs[lang].name}")
             if translated > 0 and elapsed > 0:
                 taxa = translated / elapsed
                 self.log(f"   • Taxa média: {taxa:.1f} traduções/s")
             self.log(f"   • Tempo: {elapsed:.1f}s")
-            cache_size = len(self.translator.cache)
-            self.log(f"   • Tamanho do cache: {cache_size} entradas")
+            self.log(f"   • Cache: {self.translator.cache.stats.since(cache_start)}")
             self.log(f"\n💾 Arquivo salvo: {self.output_file}")
             self.log(f"{'='*60}\n")
             
@@ -746,6 +768,10 @@ class TranslatorGUI:
     def run(self):
         """Executa a aplicação"""
         self.window.mainloop()
+        # Janela fechada: grava o que falta e aplica os limites do cache
+        self.translator.cache.close()
+        if self.translator.remote is not None:
+            self.translator.remote.close()
 
 
 if __name__ == "__main__":
@@ -16,12 +16,16 @@
 """
 
 import os
-import re
 import time
-import json
-from typing import Dict, List, Tuple, Optional
-from deep_translator import GoogleTranslator
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, List
+from translation_backends import backend_from_env
+from cache_store import SQLiteCacheStore, KIND_FAILED, policy_from_env
+from remote_cache import remote_from_env
+from shared_cache import import_yaml_translations, lookup_cached, mark_imported, open_shared_cache
+from batch_planner import BatchPlanner
+from async_engine import AsyncTranslationEngine
+from collected_yaml import scan, write_translated
+from skip_rules import rules_from_env
 
 # Estrutura de pastas organizada
 PASTA_ORIGINAL = "Original"
@@ -30,119 +34,29 @@ PASTA_CACHE = "Cache"
 
 ARQ_ENTRADA = os.path.join(PASTA_ORIGINAL, "collected_items.yaml")
 ARQ_SAIDA = os.path.join(PASTA_TRADUZIDO, "translations.yaml")
-ARQ_CACHE = os.path.join(PASTA_CACHE, "translations_cache.json")
+# Índice em disco das linhas traduzíveis (posições no arquivo de entrada)
+ARQ_INDICE = os.path.join(PASTA_CACHE, "collected_items.index")
 
-# ------------------------- Utilidades YAML -------------------------
+IDIOMA_ORIGEM = 'en'
+IDIOMA_DESTINO = 'pt'
 
-def _strip_quotes(s: str) -> Tuple[str, Optional[str]]:
-    s = s.strip()
-    if (len(s) >= 2) and ((s[0] == s[-1]) and s[0] in "'\""):
-        return s[1:-1], s[0]
-    return s, None
-
-def _quote_yaml(s: str) -> str:
-    # Usa sempre aspas duplas e escapa internas
-    return '"' + s.replace('"', '\\"') + '"'
-
-def _is_block_start(line: str) -> bool:
-    ls = line.strip()
-    # Inícios comuns de blocos multilinha no arquivo coletado
-    return (
-        ls.startswith('? >-') or
-        ls.startswith(': >-') or
-        ls.endswith(': >-') or  # key: >-
-        ls == '|-' or ls == '>' or ls == '|'
-    )
-
-# ------------------- Heurísticas para pular traduções -------------------
-
-def _should_skip_key(norm_key: str) -> bool:
-    # Evita traduzir ids/nomes técnicos
-    if len(norm_key) < 3:
-        return True
-    if norm_key.startswith('$'):
-        return True
-    if norm_key.startswith(('piece_', 'rae_', 'Ymir', 'RuneSphere_', 'IG_', 'sapling_', 'Pickable_', 'PineTree_', 'Ashwood_', 'Yagluth')):
-        return True
-    if norm_key.endswith('_TW'):
-        return True
-    # Muitos underlines normalmente indicam id técnico
-    if norm_key.count('_') >= 2 and re.fullmatch(r"[\w\-\[\]]+", norm_key):
-        return True
-    return False
+# Perfil de regras de "não traduzir" (ver skip_rules; UMT_SKIP_PROFILE sobrescreve)
+PERFIL_REGRAS = 'valheim'
 
 # ---------------------- Tradução e cache ----------------------
 
-def _load_cache() -> Dict[str, str]:
-    cache = {}
-    if os.path.exists(ARQ_CACHE):
-        try:
-            with open(ARQ_CACHE, 'r', encoding='utf-8') as f:
-                cache = json.load(f)
-        except Exception:
-            cache = {}
-    return cache
-
-def _save_cache(cache: Dict[str, str]) -> None:
-    try:
-        with open(ARQ_CACHE, 'w', encoding='utf-8') as f:
-            json.dump(cache, f, ensure_ascii=False, indent=2)
-    except Exception:
-        pass
-
-def _merge_existing_translations(cache: Dict[str, str]) -> Dict[str, str]:
-    # Lê translations.yaml atual (se existir) e incorpora no cache
-    if not os.path.exists(ARQ_SAIDA):
-        return cache
-    try:
-        with open(ARQ_SAIDA, 'r', encoding='utf-8') as f:
-            lines = f.readlines()
-    except Exception:
-        return cache
-
-    in_block = False
-    block_indent_level = None
-    for line in lines:
-        raw = line.rstrip('\n')
-        if in_block:
-            # Termina bloco quando a indentação cai
-            if raw.strip() == '' or (raw and not raw.startswith(' ') and not raw.startswith('\t')):
-                in_block = False
-            continue
-        if _is_block_start(raw):
-            in_block = True
-            continue
-        if ':' not in raw:
-            continue
-        key_part, val_part = raw.split(':', 1)
-        k_norm, _ = _strip_quotes(key_part.strip())
-        v_norm, _ = _strip_quotes(val_part.strip())
-        if k_norm and v_norm and k_norm != v_norm:
-            cache.setdefault(k_norm, v_norm)
+def _open_cache() -> SQLiteCacheStore:
+    # Cache único, o mesmo do tradutor universal (os caches antigos entram uma vez)
+    # Limites opcionais (UMT_CACHE_LIMITS) aplicados ao fechar o cache
+    cache = open_shared_cache(PASTA_CACHE, eviction=policy_from_env(), log=print)
+    if cache.replayed:
+        print(f"   ✓ Recuperadas {cache.replayed} traduções da execução interrompida")
+    # translations.yaml existente (editado à mão ou de outra máquina) entra sem sobrescrever
+    incorporadas = import_yaml_translations(cache, ARQ_SAIDA, IDIOMA_ORIGEM, IDIOMA_DESTINO)
+    if incorporadas:
+        print(f"   ✓ Incorporadas {incorporadas} traduções de {ARQ_SAIDA}")
     return cache
 
-
-def _translate_with_retry(text: str, translator: GoogleTranslator, retries: int = 3) -> str:
-    """Traduz texto com retry exponencial otimizado"""
-    delay = 0.3  # Delay inicial reduzido de 0.4 para 0.3
-    for attempt in range(retries):
-        try:
-            return translator.translate(text)
-        except Exception:
-            if attempt == retries - 1:
-                return text
-            time.sleep(delay)
-            delay *= 1.8  # Multiplicador reduzido de 2 para 1.8
-
-
-def _translate_batch(texts: List[str]) -> Dict[str, str]:
-    # Cada thread usa seu próprio tradutor para reduzir contenção
-    translator = GoogleTranslator(source='en', target='pt')
-    out = {}
-    for t in texts:
-        out[t] = _translate_with_retry(t, translator)
-    return out
-
 # ---------------------- Pipeline principal ----------------------
 
 def main() -> None:
@@ -161,114 +75,121 @@ def main() -> None:
         print(f"   Coloque o arquivo 'collected_items.yaml' na pasta '{PASTA_ORIGINAL}/")
         return
 
-    # Carrega arquivo coletado
-    with open(ARQ_ENTRADA, 'r', encoding='utf-8-sig') as f:
-        linhas = f.readlines()
-    print(f"Total de linhas: {len(linhas)}")
-
     # Carrega cache e incorpora translations.yaml existente
-    cache = _load_cache()
-    cache = _merge_existing_translations(cache)
+    cache = _open_cache()
+    regras = rules_from_env(PERFIL_REGRAS)
 
-    # 1) Identificar candidatos a traduzir
+    # 1) Uma passada pelo arquivo coletado: índice em disco das linhas
+    #    traduzíveis + textos únicos (as linhas não ficam na memória)
     print("\n🔍 Fase 1: Identificando textos para traduzir…")
-    textos_para_traduzir: List[str] = []
-    mapa_linhas: Dict[int, Tuple[str, str]] = {}  # linha -> (key_raw, key_norm)
+    varredura = scan(ARQ_ENTRADA, ARQ_INDICE, regras.should_skip)
+    print(f"   ✓ Total de linhas: {varredura.lines}")
 
-    in_block = False
-    for i, line in enumerate(linhas):
-        raw = line.rstrip('\n')
-        if in_block:
-            # Fim do bloco quando linha não-indentada ou vazia após pelo menos 1 linha
-            if raw.strip() == '' or (raw and not raw.startswith(' ') and not raw.startswith('\t')):
-                in_block = False
-            continue
-        if _is_block_start(raw):
-            in_block = True
-            continue
-        if not raw or raw.lstrip().startswith('#'):
-            continue
-        if ':' not in raw:
-            continue
-        key_part, val_part = raw.split(':', 1)
-        key_raw = key_part.strip()
-        val_raw = val_part.strip()
-        k_norm, k_q = _strip_quotes(key_raw)
-        v_norm, v_q = _strip_quotes(val_raw)
-        # Só traduz quando key == value (após normalização)
-        if k_norm == v_norm and not _should_skip_key(k_norm):
-            textos_para_traduzir.append(k_norm)
-            mapa_linhas[i] = (key_raw, k_norm)
-
-    if not textos_para_traduzir:
+    if not varredura.texts:
         print("   ✓ Nada para traduzir. Gerando arquivo final apenas com o que já existe…")
         # Apenas reescreve o arquivo de saída preservando
-        with open(ARQ_SAIDA, 'w', encoding='utf-8') as f:
-            f.writelines(linhas)
+        write_translated(ARQ_ENTRADA, ARQ_INDICE, ARQ_SAIDA, {})
+        os.remove(ARQ_INDICE)
+        mark_imported(cache, ARQ_SAIDA)
+        cache.close()
         return
 
-    # 2) Remover duplicatas mantendo ordem
-    textos_unicos = list(dict.fromkeys(textos_para_traduzir))
+    # 2) Textos únicos em ordem de aparição
+    textos_unicos = varredura.texts
     print(f"   ✓ Encontrados {len(textos_unicos)} textos únicos para traduzir")
 
     # 3) Determinar o que falta traduzir (usa cache)
-    faltando = [t for t in textos_unicos if t not in cache]
-    print(f"   ✓ Já em cache: {len(textos_unicos) - len(faltando)} | A traduzir agora: {len(faltando)}")
+    # Mesma leitura do tradutor universal ("ignorados" de outro perfil não valem aqui)
+    encontrados = lookup_cached(cache, IDIOMA_ORIGEM, [IDIOMA_DESTINO], textos_unicos, regras)[IDIOMA_DESTINO]
+    # Falhas recentes (cache negativo) não são traduções: ficam com o original até o prazo vencer
+    recentes = {t for t, e in encontrados.items() if e.kind == KIND_FAILED}
+    traducoes = {t: e.value for t, e in encontrados.items() if e.kind != KIND_FAILED}
+    faltando = [t for t in textos_unicos if t not in encontrados]
+    # Cache remoto (opcional): consultado depois do local e antes do serviço
+    remoto = remote_from_env()
+    if remoto is not None and (faltando or recentes):
+        do_remoto = remoto.get_many(IDIOMA_ORIGEM, IDIOMA_DESTINO,
+                                    [t for t in textos_unicos if t not in traducoes])
+        if do_remoto:
+            cache.put_many(IDIOMA_ORIGEM, IDIOMA_DESTINO, do_remoto)
+            traducoes.update(do_remoto)
+            faltando = [t for t in faltando if t not in do_remoto]
+            recentes.difference_update(do_remoto)
+        print(f"   ✓ Do cache remoto: {len(do_remoto)}")
+    do_cache = len(textos_unicos) - len(faltando) - len(recentes)
+    print(f"   ✓ Já em cache: {do_cache} | A traduzir agora: {len(faltando)}")
+    if recentes:
+        print(f"   ⏸️  {len(recentes)} textos falharam há pouco e aguardam nova tentativa")
 
     # 4) Traduz em paralelo (em lotes)
     if faltando:
         print("\n⚡ Fase 2: Traduzindo em paralelo…")
-        tamanho_lote = 80  # Otimizado: lotes maiores para melhor throughput
-        lotes = [faltando[i:i + tamanho_lote] for i in range(0, len(faltando), tamanho_lote)]
-        max_threads = min(10, len(lotes))  # Aumentado de 8 para 10 threads
-
-        traduzidas_tmp: Dict[str, str] = {}
+        backend = backend_from_env()
+        # Concorrência adaptativa (AIMD) num único event loop
+        engine = AsyncTranslationEngine(backend)
+        # Lotes por orçamento de caracteres, os mais caros primeiro
+        lotes = BatchPlanner.for_limits(backend.limits).plan(faltando)
+
+        adiados: List[str] = []
+        recusados: List[str] = []
         inicio_traducao = time.time()
-        with ThreadPoolExecutor(max_workers=max_threads) as ex:
-            futures = [ex.submit(_translate_batch, lote) for lote in lotes]
-            concluidas = 0
-            total = len(lotes)
-            for fut in as_completed(futures):
-                res = fut.result()
-                traduzidas_tmp.update(res)
-                concluidas += 1
-                percent = (concluidas * 100) // total
-                elapsed = time.time() - inicio_traducao
-                items_traduzidos = sum(len(lote) for lote in lotes[:concluidas])
-                taxa = items_traduzidos / elapsed if elapsed > 0 else 0
-                print(f"   Progresso: {concluidas}/{total} lotes ({percent}%) | {items_traduzidos}/{len(faltando)} itens | {taxa:.1f} itens/s")
-
-        # Atualiza cache
-        cache.update(traduzidas_tmp)
-        _save_cache(cache)
+        total = len(lotes)
+        progresso = {'lotes': 0, 'itens': 0}
+
+        def _lote_concluido(res: Dict[str, str], falhas: List[str], nao_enviados: List[str]) -> None:
+            traducoes.update(res)
+            # Grava no cache conforme os lotes terminam (e envia ao remoto em segundo plano)
+            cache.put_many(IDIOMA_ORIGEM, IDIOMA_DESTINO, res)
+            if remoto is not None:
+                remoto.put_many(IDIOMA_ORIGEM, IDIOMA_DESTINO, res)
+            # Falhas ficam no cache negativo só até o prazo vencer (não insiste antes disso)
+            cache.put_outcomes(IDIOMA_ORIGEM, IDIOMA_DESTINO, falhas, KIND_FAILED)
+            adiados.extend(falhas)
+            # Recusados pelo disjuntor nem foram enviados: a próxima execução já os tenta
+            recusados.extend(nao_enviados)
+            progresso['lotes'] += 1
+            progresso['itens'] += len(res) + len(falhas) + len(nao_enviados)
+            percent = (progresso['lotes'] * 100) // total
+            elapsed = time.time() - inicio_traducao
+            taxa = progresso['itens'] / elapsed if elapsed > 0 else 0
+            print(f"   Progresso: {progresso['lotes']}/{total} lotes ({percent}%) | "
+                  f"{progresso['itens']}/{len(faltando)} itens | {taxa:.1f} itens/s | "
+                  f"concorrência {engine.controller.limit}")
+
+        engine.translate_units([lote.texts for lote in lotes], IDIOMA_ORIGEM, IDIOMA_DESTINO,
+                               _lote_concluido)
+        cache.flush()
+
+        print(f"   ✓ Requisições ao serviço: {engine.requests} "
+              f"({engine.packed_requests} agrupadas, {engine.misaligned_packs} desalinhadas, "
+              f"{engine.throttled} limitadas) | pico de {engine.peak_in_flight} simultâneas")
+        conexoes = backend.connection_stats()
+        if conexoes is not None and conexoes.requests:
+            print(f"   ✓ Conexões HTTP: {conexoes.opened} abertas, "
+                  f"{conexoes.reuse_ratio:.0%} das requisições reaproveitaram uma conexão "
+                  f"({conexoes.waited} esperaram uma conexão livre)")
+        if adiados:
+            espera_min = (cache.ttls[KIND_FAILED] or 0) / 60
+            print(f"   ⏸️  Adiados: {len(adiados)} textos não traduzidos (serviço indisponível) — "
+                  f"serão tentados nas execuções após {espera_min:.0f} min")
+        if recusados:
+            print(f"   ⏸️  Não enviados: {len(recusados)} textos (disjuntor aberto) — "
+                  f"serão tentados na próxima execução")
+        adiados.extend(recusados)
     else:
+        adiados = []
         print("   ✓ Nada novo para traduzir — utilizando traduções do cache/arquivo existente")
 
-    # 5) Gerar arquivo final substituindo apenas valores elegíveis
+    # 5) Gerar arquivo final substituindo apenas as linhas do índice
+    #    (o resto é copiado byte a byte; troca atômica no fim)
     print("\n📝 Fase 3: Gerando arquivo traduzido…")
-    saida: List[str] = []
-    in_block = False
-    for i, line in enumerate(linhas):
-        raw = line.rstrip('\n')
-        if in_block:
-            saida.append(raw + '\n')
-            if raw.strip() == '' or (raw and not raw.startswith(' ') and not raw.startswith('\t')):
-                in_block = False
-            continue
-        if _is_block_start(raw):
-            saida.append(raw + '\n')
-            in_block = True
-            continue
-        if i in mapa_linhas:
-            key_raw, k_norm = mapa_linhas[i]
-            traduzida = cache.get(k_norm, k_norm)
-            saida.append(f"{key_raw}: {_quote_yaml(traduzida)}\n")
-        else:
-            saida.append(raw + '\n')
-
-    # 6) Salvar resultado
-    with open(ARQ_SAIDA, 'w', encoding='utf-8') as f:
-        f.writelines(saida)
+    write_translated(ARQ_ENTRADA, ARQ_INDICE, ARQ_SAIDA, traducoes)
+    os.remove(ARQ_INDICE)
+    # A saída veio do cache: não precisa ser relida na próxima execução
+    mark_imported(cache, ARQ_SAIDA)
+    cache.close()
+    if remoto is not None:
+        remoto.close()
 
     # Sumário final detalhado
     tempo_total = time.time() - t0
@@ -277,11 +198,16 @@ def main() -> None:
     print("=" * 60)
     print(f"📊 Estatísticas:")
     print(f"   • Total de textos únicos: {len(textos_unicos)}")
-    print(f"   • Do cache: {len(textos_unicos) - len(faltando)}")
-    print(f"   • Traduzidos agora: {len(faltando)}")
-    if len(faltando) > 0 and tempo_total > 0:
-        taxa_media = len(faltando) / tempo_total
+    print(f"   • Do cache: {do_cache}")
+    print(f"   • Traduzidos agora: {len(faltando) - len(adiados)}")
+    if adiados or recentes:
+        print(f"   • Adiados para a próxima execução: {len(adiados) + len(recentes)}")
+    if len(faltando) > len(adiados) and tempo_total > 0:
+        taxa_media = (len(faltando) - len(adiados)) / tempo_total
         print(f"   • Taxa média: {taxa_media:.1f} traduções/segundo")
+    print(f"   • Cache: {cache.stats}")
+    if remoto is not None:
+        print(f"   • Cache remoto: {remoto.stats}")
     print(f"\n💾 Arquivo salvo: {ARQ_SAIDA}")
     print(f"⏱️  Tempo total: {tempo_total:.1f} segundos")
     print("=" * 60)
@@ -0,0 +1,273 @@
+"""
+Motor de tradução assíncrono com controle adaptativo de concorrência.
+
+Todas as requisições rodam num único event loop. O número de requisições
+simultâneas não é fixo: ele cresce de forma aditiva enquanto o serviço
+responde bem e cai de forma multiplicativa (AIMD) quando aparecem erros,
+respostas 429 ou a latência dispara.
+
+Uso síncrono (CLI ou thread da GUI):
+
+    engine = AsyncTranslationEngine(backend)
+    traducoes, falhas, recusados = engine.translate_units(unidades, 'en', 'pt')
+
+Falhas foram enviadas ao serviço e não voltaram; recusados nem chegaram a ser
+enviados (disjuntor aberto) e ficam para a próxima execução.
+
+Vários idiomas de destino dividem o mesmo motor (e o mesmo limite):
+
+    por_idioma = engine.translate_targets({'pt': unidades_pt, 'es': unidades_es}, 'en')
+"""
+
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from itertools import zip_longest
+from typing import Callable, Dict, List, Optional, Tuple
+
+from translation_backends import TranslationBackend, BackendError, CircuitOpenError, ThrottledError
+from text_packing import TextPacker
+from resilience import BackoffPolicy, DEFAULT_BACKOFF
+
+# (traduções, falhas, recusados) de uma unidade ou de um idioma
+UnitResult = Tuple[Dict[str, str], List[str], List[str]]
+
+
+class AIMDController:
+    """Limite de concorrência ajustado por aumento aditivo / redução multiplicativa"""
+
+    def __init__(self, initial: int = 8, min_limit: int = 1, max_limit: int = 256,
+                 decrease_factor: float = 0.5, latency_tolerance: float = 2.0,
+                 smoothing: float = 0.05):
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.decrease_factor = decrease_factor
+        # Latência média acima de tolerance × latência base indica congestionamento
+        self.latency_tolerance = latency_tolerance
+        self.smoothing = smoothing
+        self._limit = float(max(min_limit, min(initial, max_limit)))
+        self.base_latency: Optional[float] = None
+        self.avg_latency: Optional[float] = None
+        self._last_decrease = 0.0
+        self.slow_start = True
+
+    @property
+    def limit(self) -> int:
+        return int(self._limit)
+
+    def on_success(self, latency: float) -> None:
+        """Resposta válida: +1 no limite a cada 'limit' sucessos (ou a cada sucesso no início)"""
+        if self.avg_latency is None:
+            self.avg_latency = latency
+        else:
+            self.avg_latency += self.smoothing * (latency - self.avg_latency)
+        # A base é o menor valor da média móvel (não de amostras isoladas),
+        # assim a variância natural do serviço não parece congestionamento
+        if self.base_latency is None or self.avg_latency < self.base_latency:
+            self.base_latency = self.avg_latency
+
+        if self.avg_latency > self.base_latency * self.latency_tolerance:
+            self._decrease(0.9)
+        elif self.slow_start:
+            # Até o primeiro sinal de sobrecarga o limite dobra a cada ida e volta
+            self._limit = min(self.max_limit, self._limit + 1.0)
+        else:
+            self._limit = min(self.max_limit, self._limit + 1.0 / self._limit)
+
+    def on_throttle(self) -> None:
+        """O serviço pediu para desacelerar (429)"""
+        self._decrease(self.decrease_factor)
+
+    def on_error(self) -> None:
+        """Falha genérica também é tratada como sinal de sobrecarga"""
+        self._decrease(self.decrease_factor)
+
+    def _decrease(self, factor: float) -> None:
+        # No máximo uma redução por "ida e volta", para não desabar o limite
+        # por causa de várias respostas da mesma rajada
+        now = time.monotonic()
+        if now - self._last_decrease < (self.avg_latency or 0.0):
+            return
+        self._last_decrease = now
+        self.slow_start = False
+        self._limit = max(float(self.min_limit), self._limit * factor)
+
+
+class AsyncTranslationEngine:
+    """Traduz unidades de trabalho com concorrência adaptativa num único event loop"""
+
+    def __init__(self, backend: TranslationBackend, max_concurrency: int = 256,
+                 initial_concurrency: int = 8, backoff: BackoffPolicy = DEFAULT_BACKOFF,
+                 packer: Optional[TextPacker] = None):
+        self.backend = backend
+        # Mais requisições em voo do que conexões HTTP só esperariam na fila do pool
+        if backend.max_connections:
+            max_concurrency = min(max_concurrency, backend.max_connections)
+            initial_concurrency = min(initial_concurrency, max_concurrency)
+        self.max_concurrency = max_concurrency
+        self.initial_concurrency = initial_concurrency
+        self.backoff = backoff
+        self.packer = packer or TextPacker.for_limits(backend.limits)
+        self.controller = AIMDController(initial_concurrency, max_limit=max_concurrency)
+        self.requests = 0
+        self.packed_requests = 0
+        self.misaligned_packs = 0
+        self.throttled = 0
+        self.errors = 0
+        self.rejected = 0
+        self.peak_in_flight = 0
+        self._in_flight = 0
+        self._cond: Optional[asyncio.Condition] = None
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    # ---------------------- Controle de concorrência ----------------------
+
+    async def _acquire(self) -> None:
+        async with self._cond:
+            await self._cond.wait_for(lambda: self._in_flight < self.controller.limit)
+            self._in_flight += 1
+            self.peak_in_flight = max(self.peak_in_flight, self._in_flight)
+
+    async def _release(self) -> None:
+        async with self._cond:
+            self._in_flight -= 1
+            free = self.controller.limit - self._in_flight
+            if free > 0:
+                self._cond.notify(free)
+
+    # ---------------------- Requisições ----------------------
+
+    async def _request(self, payload: str, src_lang: str, dest_lang: str) -> str:
+        """Uma requisição com retry; levanta BackendError se todas falharem"""
+        for attempt in range(self.backoff.retries):
+            await self._acquire()
+            start = time.monotonic()
+            retry_after = None
+            try:
+                self.requests += 1
+                result = await self.backend.atranslate(payload, src_lang, dest_lang, self._executor)
+            except CircuitOpenError:
+                # Serviço fora do ar: nada foi enviado, não adianta tentar de novo
+                self.requests -= 1
+                self.rejected += 1
+                raise
+            except ThrottledError as e:
+                self.throttled += 1
+                self.controller.on_throttle()
+                error, retry_after = e, e.retry_after
+            except BackendError as e:
+                self.errors += 1
+                self.controller.on_error()
+                error = e
+            else:
+                self.controller.on_success(time.monotonic() - start)
+                return result
+            finally:
+                await self._release()
+            # O espaço é liberado antes de esperar, para não travar os demais
+            if attempt == self.backoff.retries - 1:
+                raise error
+            await asyncio.sleep(self.backoff.delay(attempt, retry_after))
+
+    async def _translate_unit(self, texts: List[str], src_lang: str,
+                              dest_lang: str) -> UnitResult:
+        """
+        (traduções, falhas, recusados): falhas foram enviadas e não voltaram;
+        recusados nem saíram (disjuntor aberto) e não entram no cache negativo.
+        """
+        results: Dict[str, str] = {}
+        failed: List[str] = []
+        rejected: List[str] = []
+
+        async def translate_one(text: str) -> None:
+            try:
+                results[text] = await self._request(text, src_lang, dest_lang)
+            except CircuitOpenError:
+                rejected.append(text)
+            except BackendError:
+                failed.append(text)
+
+        for pack in self.packer.pack(texts):
+            if len(pack) == 1:
+                await translate_one(pack[0])
+                continue
+            try:
+                self.packed_requests += 1
+                translated = await self._request(self.packer.SEPARATOR.join(pack), src_lang, dest_lang)
+            except CircuitOpenError:
+                rejected.extend(pack)
+                continue
+            except BackendError:
+                failed.extend(pack)
+                continue
+            parts = self.packer.split(pack, translated)
+            if parts is None:
+                # Resposta desalinhada: volta para um texto por vez
+                self.misaligned_packs += 1
+                await asyncio.gather(*(translate_one(text) for text in pack))
+                continue
+            results.update(zip(pack, parts))
+
+        return results, failed, rejected
+
+    async def translate_targets_async(
+            self, jobs: Dict[str, List[List[str]]], src_lang: str,
+            on_unit_done: Optional[Callable[[str, Dict[str, str], List[str], List[str]], None]] = None
+    ) -> Dict[str, UnitResult]:
+        """
+        Traduz as unidades de cada idioma de destino; on_unit_done recebe
+        (idioma, traduções, falhas, recusados) de cada unidade concluída.
+        """
+        self._cond = asyncio.Condition()
+        if not self.backend.native_async:
+            # Backend síncrono: cada requisição em voo ocupa uma thread
+            self._executor = ThreadPoolExecutor(max_workers=self.max_concurrency)
+        outcome: Dict[str, UnitResult] = {dest: ({}, [], []) for dest in jobs}
+        # Intercala os idiomas (rodízio): as vagas são liberadas por ordem de
+        # chegada, então nenhum idioma fica esperando os outros terminarem
+        queues = [[(dest, unit) for unit in units] for dest, units in jobs.items()]
+        order: List[Tuple[str, List[str]]] = []
+        for round_ in zip_longest(*queues):
+            order.extend(pair for pair in round_ if pair is not None)
+        try:
+            async def run(dest: str, unit: List[str]):
+                return dest, await self._translate_unit(unit, src_lang, dest)
+
+            tasks = [asyncio.ensure_future(run(dest, unit)) for dest, unit in order]
+            for next_done in asyncio.as_completed(tasks):
+                dest, (unit_results, unit_failed, unit_rejected) = await next_done
+                outcome[dest][0].update(unit_results)
+                outcome[dest][1].extend(unit_failed)
+                outcome[dest][2].extend(unit_rejected)
+                if on_unit_done:
+                    on_unit_done(dest, unit_results, unit_failed, unit_rejected)
+        finally:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False)
+                self._executor = None
+        return outcome
+
+    def translate_targets(
+            self, jobs: Dict[str, List[List[str]]], src_lang: str,
+            on_unit_done: Optional[Callable[[str, Dict[str, str], List[str], List[str]], None]] = None
+    ) -> Dict[str, UnitResult]:
+        """Versão síncrona de translate_targets_async"""
+        return asyncio.run(self.translate_targets_async(jobs, src_lang, on_unit_done))
+
+    async def translate_units_async(self, units: List[List[str]], src_lang: str, dest_lang: str,
+                                    on_unit_done: Optional[Callable[[Dict[str, str], List[str], List[str]], None]] = None
+                                    ) -> UnitResult:
+        """Traduz todas as unidades; on_unit_done recebe o resultado de cada uma"""
+        callback = None
+        if on_unit_done:
+            def callback(dest: str, unit_results: Dict[str, str], unit_failed: List[str],
+                         unit_rejected: List[str]) -> None:
+                on_unit_done(unit_results, unit_failed, unit_rejected)
+        outcome = await self.translate_targets_async({dest_lang: units}, src_lang, callback)
+        return outcome[dest_lang]
+
+    def translate_units(self, units: List[List[str]], src_lang: str, dest_lang: str,
+                        on_unit_done: Optional[Callable[[Dict[str, str], List[str], List[str]], None]] = None
+                        ) -> UnitResult:
+        """Versão síncrona: roda o event loop até todas as unidades terminarem"""
+        return asyncio.run(self.translate_units_async(units, src_lang, dest_lang, on_unit_done))
@@ -0,0 +1,67 @@
+"""
+Planejamento de lotes por orçamento de caracteres.
+
+Em vez de fatiar a lista em lotes de N itens, os textos são agrupados em
+unidades de trabalho de custo parecido (cada uma cabe numa requisição do
+backend). Os textos mais longos vão para as primeiras unidades e as unidades
+mais caras são despachadas primeiro, de modo que as threads livres pegam as
+unidades restantes da fila e nenhum lote longo fica sozinho no fim da fase 2.
+"""
+
+from dataclasses import dataclass, field
+from typing import List
+
+from translation_backends import BackendLimits
+
+
+@dataclass
+class WorkUnit:
+    """Grupo de textos traduzido por uma thread de uma só vez"""
+    texts: List[str] = field(default_factory=list)
+    chars: int = 0
+    cost: float = 0.0
+
+    def __len__(self) -> int:
+        return len(self.texts)
+
+
+class BatchPlanner:
+    """Divide os textos em unidades de trabalho limitadas por caracteres"""
+
+    def __init__(self, max_chars: int = 5000, max_items: int = 100,
+                 request_overhead: float = 200.0):
+        self.max_chars = max_chars
+        self.max_items = max_items
+        # Custo fixo de uma requisição, em "caracteres equivalentes"
+        self.request_overhead = request_overhead
+
+    @classmethod
+    def for_limits(cls, limits: BackendLimits) -> "BatchPlanner":
+        """Cria um planejador alinhado aos limites do backend"""
+        return cls(limits.max_chars_per_request, limits.max_items_per_request)
+
+    def estimate_cost(self, unit: WorkUnit) -> float:
+        """Custo estimado: uma requisição por texto não agrupável + caracteres"""
+        singles = sum(1 for t in unit.texts if '\n' in t)
+        requests = singles + (1 if len(unit.texts) > singles else 0)
+        return requests * self.request_overhead + unit.chars
+
+    def plan(self, texts: List[str]) -> List[WorkUnit]:
+        """Agrupa os textos (longos primeiro) e ordena as unidades por custo"""
+        units: List[WorkUnit] = []
+        current = WorkUnit()
+        for text in sorted(texts, key=len, reverse=True):
+            size = len(text) + 1  # +1 pelo separador do agrupamento
+            if current.texts and (current.chars + size > self.max_chars
+                                  or len(current) >= self.max_items):
+                units.append(current)
+                current = WorkUnit()
+            current.texts.append(text)
+            current.chars += size
+        if current.texts:
+            units.append(current)
+
+        for unit in units:
+            unit.cost = self.estimate_cost(unit)
+        units.sort(key=lambda u: u.cost, reverse=True)
+        return units
@@ -0,0 +1,911 @@
+"""
+Cache de traduções persistente em SQLite.
+
+Substitui os caches JSON (carregados inteiros na memória e regravados
+inteiros a cada execução) por um banco indexado em modo WAL:
+
+- consultas pontuais e em lote, sem carregar o cache todo;
+- inserções acumuladas e gravadas em lote por uma única thread de gravação,
+  protegidas por um diário (TranslationJournal) contra interrupções;
+- leituras sem trava global (índice particionado + conexões de leitura)
+  e iteração sobre um retrato consistente do cache;
+- pares de idiomas muito consultados carregados na memória sob demanda,
+  dentro de um orçamento de memória;
+- migração única dos arquivos JSON antigos na primeira abertura;
+- cache negativo: além das traduções, guarda "traduzido para si mesmo",
+  "falhou no instante T" e "ignorado pelas regras", cada um com validade
+  própria, para que nenhum texto volte ao serviço sem necessidade;
+- limpeza por política (último uso, tempo sem uso, número de entradas,
+  tamanho), compactação offline e contadores de acertos/faltas por execução:
+
+      python Scripts/cache_store.py --max-mb 200 --max-idle-days 180
+"""
+
+import argparse
+import json
+import os
+import queue
+import sqlite3
+import threading
+import time
+from concurrent.futures import Future
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional, Set, Tuple
+
+from translation_journal import TranslationJournal
+
+# Limite seguro de parâmetros por consulta em qualquer versão do SQLite
+_CHUNK = 500
+
+# Variável de ambiente com os limites do cache (ex.: "max_entries=500000,max_mb=200")
+LIMITS_ENV_VAR = "UMT_CACHE_LIMITS"
+
+# Tipos de resultado gravados no cache
+KIND_TRANSLATED = 'translated'  # tradução de verdade
+KIND_IDENTITY = 'identity'      # o serviço devolveu o próprio texto (nomes, siglas...)
+KIND_FAILED = 'failed'          # todas as tentativas falharam (cache negativo)
+KIND_SKIPPED = 'skipped'        # ignorado pelas regras (IDs, URLs, números...)
+
+# Validade de cada tipo em segundos (None = não expira)
+DEFAULT_TTLS: Dict[str, Optional[float]] = {
+    KIND_TRANSLATED: None,
+    KIND_IDENTITY: 30 * 24 * 3600.0,
+    KIND_SKIPPED: 7 * 24 * 3600.0,
+    KIND_FAILED: 5 * 60.0,
+}
+
+# Resultados que nunca sobrescrevem uma resposta válida do serviço
+_WEAK_KINDS = (KIND_FAILED, KIND_SKIPPED)
+# Uma cópia só de cada nome de tipo nas partições carregadas
+_KINDS = {kind: kind for kind in DEFAULT_TTLS}
+
+# Memória para as partições (pares de idiomas) carregadas; as frias saem primeiro
+DEFAULT_MEMORY_BUDGET = 256 << 20
+# Um par é carregado quando as consultas acumuladas chegam a 1/N das suas linhas
+_LOAD_FRACTION = 4
+# Custo aproximado de uma linha carregada além dos próprios textos (dict, tupla, float)
+_ROW_OVERHEAD = 200
+
+
+@dataclass
+class EvictionPolicy:
+    """Limites do cache; o que passar sai pelo último uso (o mais antigo primeiro)"""
+    max_entries: Optional[int] = None
+    max_bytes: Optional[int] = None      # espaço ocupado no banco
+    max_idle: Optional[float] = None     # segundos sem nenhum acerto
+
+    @property
+    def active(self) -> bool:
+        return any(limit is not None for limit in (self.max_entries, self.max_bytes, self.max_idle))
+
+    @classmethod
+    def parse(cls, spec: str) -> 'EvictionPolicy':
+        """Lê "max_entries=N,max_mb=N,max_idle_days=N" (campos opcionais)"""
+        policy = cls()
+        for part in filter(None, (p.strip() for p in spec.split(','))):
+            key, _, value = part.partition('=')
+            key = key.strip()
+            if key == 'max_entries':
+                policy.max_entries = int(value)
+            elif key == 'max_mb':
+                policy.max_bytes = int(float(value) * (1 << 20))
+            elif key == 'max_idle_days':
+                policy.max_idle = float(value) * 24 * 3600
+            else:
+                raise ValueError(f"Limite de cache desconhecido: {key}")
+        return policy
+
+
+def policy_from_env() -> EvictionPolicy:
+    """Limites definidos em UMT_CACHE_LIMITS (sem limites se não houver)"""
+    return EvictionPolicy.parse(os.environ.get(LIMITS_ENV_VAR, ''))
+
+
+@dataclass
+class CacheStats:
+    """Contadores desde a abertura do cache (since dá os de uma execução)"""
+    hits: int = 0
+    misses: int = 0
+    inserts: int = 0
+    evicted: int = 0
+
+    @property
+    def hit_ratio(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def since(self, start: 'CacheStats') -> 'CacheStats':
+        """Contadores acumulados depois de 'start' (cópia tirada no início da execução)"""
+        return CacheStats(**{name: getattr(self, name) - getattr(start, name)
+                             for name in self.__dataclass_fields__})
+
+    def __str__(self) -> str:
+        return (f"{self.hits} acertos, {self.misses} faltas ({self.hit_ratio:.0%}), "
+                f"{self.inserts} gravados, {self.evicted} removidos")
+
+
+class CacheEntry(NamedTuple):
+    """Resultado encontrado no cache"""
+    kind: str
+    value: str  # texto a usar na saída (a tradução ou o próprio original)
+    updated_at: float
+
+
+def _kind_for(text: str, translation: str) -> str:
+    return KIND_TRANSLATED if translation and translation != text else KIND_IDENTITY
+
+
+def _meta_get(conn: sqlite3.Connection, key: str) -> Optional[str]:
+    row = conn.execute("SELECT value FROM meta WHERE key=?", (key,)).fetchone()
+    return row[0] if row else None
+
+
+def _used_bytes(conn: sqlite3.Connection) -> int:
+    """Bytes das páginas em uso (sem as livres, que só saem com VACUUM)"""
+    page_size = conn.execute("PRAGMA page_size").fetchone()[0]
+    pages = conn.execute("PRAGMA page_count").fetchone()[0]
+    free = conn.execute("PRAGMA freelist_count").fetchone()[0]
+    return (pages - free) * page_size
+
+
+# (origem, destino, texto) e (valor, tipo, instante)
+_Key = Tuple[str, str, str]
+_Row = Tuple[str, str, float]
+
+# Partições do índice de resultados ainda não gravados (potência de 2), escolhidas
+# pelo hash do texto: o hash de uma str fica guardado nela e não é recalculado
+_SHARDS = 16
+
+
+class _Shard:
+    """Parte do índice de pendentes com trava própria"""
+    __slots__ = ('lock', 'rows')
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.rows: Dict[_Key, _Row] = {}
+
+
+class _Partition:
+    """
+    Resultados gravados de um par de idiomas, na memória. A chave é o próprio
+    texto (o par fica uma vez só, na partição) e o valor igual ao texto não é
+    guardado de novo.
+    """
+    __slots__ = ('rows', 'size', 'last_used')
+
+    def __init__(self):
+        self.rows: Dict[str, Tuple[Optional[str], str, float]] = {}
+        self.size = 0
+        self.last_used = time.monotonic()
+
+    def set(self, text: str, value: str, kind: str, updated_at: float) -> None:
+        old = self.rows.get(text)
+        if old is not None:
+            self.size -= _ROW_OVERHEAD + len(text) + len(old[0] or '')
+        compact = None if value == text else value
+        self.rows[text] = (compact, _KINDS.get(kind, kind), updated_at)
+        self.size += _ROW_OVERHEAD + len(text) + len(compact or '')
+
+    def get(self, text: str) -> Optional[_Row]:
+        row = self.rows.get(text)
+        if row is None:
+            return None
+        return (row[0] if row[0] is not None else text, row[1], row[2])
+
+
+def _newest(pending: Optional[_Row], committed: Optional[_Row]) -> Optional[_Row]:
+    """Pendente vale mais que o gravado, salvo falha/ignorado diante de uma tradução"""
+    if pending is None:
+        return committed
+    if committed is not None and pending[1] in _WEAK_KINDS and committed[1] not in _WEAK_KINDS:
+        return committed
+    return pending
+
+
+class _Task(NamedTuple):
+    """Operação executada pela thread de gravação (fn None = só esperar a fila andar)"""
+    fn: Optional[Callable[[sqlite3.Connection], Any]]
+    future: Optional[Future]
+
+
+# Prazo do lote vencido: grava sem ninguém esperando
+_TICK = _Task(None, None)
+
+
+class _Hits(NamedTuple):
+    """Textos encontrados numa consulta, para o último uso gravado no banco"""
+    src: str
+    found: List[Tuple[str, List[str]]]  # (destino, textos)
+    at: float
+
+
+class SQLiteCacheStore:
+    """
+    Cache (origem, destino, texto) -> tradução gravado em SQLite.
+
+    Uma única thread de gravação é dona da conexão de escrita: os resultados
+    entram numa fila e são gravados em lote, e as demais escritas (importação,
+    limpeza) também passam por ela. Enquanto não são gravados, os resultados
+    ficam num índice particionado, consultado sem trava. As leituras usam
+    conexões próprias e, com o WAL, não esperam a gravação.
+
+    Os pares de idiomas muito consultados são carregados na memória sob
+    demanda (um par por vez, só o que é usado) e mantidos em dia pela thread
+    de gravação; passando de memory_budget, os menos usados são descartados.
+
+    O último acerto de cada entrada é gravado (uma vez por execução) e
+    alimenta a limpeza: evict() aplica a política (também ao fechar, se
+    houver limites) e compact() ainda reescreve o arquivo sem o espaço livre.
+    """
+
+    def __init__(self, path: Path, flush_every: int = 500, flush_interval: float = 30.0,
+                 journal: bool = True, ttls: Optional[Dict[str, Optional[float]]] = None,
+                 memory_budget: int = DEFAULT_MEMORY_BUDGET,
+                 eviction: Optional[EvictionPolicy] = None):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.flush_every = flush_every
+        self.flush_interval = flush_interval
+        self.ttls = dict(DEFAULT_TTLS)
+        if ttls:
+            self.ttls.update(ttls)
+        self._shards = [_Shard() for _ in range(_SHARDS)]
+        self.eviction = eviction or EvictionPolicy()
+        self.stats = CacheStats()
+        self._stats_lock = threading.Lock()
+        # Acertos a gravar e entradas já marcadas nesta execução (só a thread de gravação usa)
+        self._hits: Dict[Tuple[str, str], Dict[str, float]] = {}
+        self._touched: Dict[Tuple[str, str], Set[str]] = {}
+        self.memory_budget = memory_budget
+        # Partições carregadas (só a thread de gravação as altera) e contadores por par
+        self._partitions: Dict[Tuple[str, str], _Partition] = {}
+        self._pair_rows: Dict[Tuple[str, str], int] = {}
+        self._pair_probes: Dict[Tuple[str, str], int] = {}
+        self._oversized: Set[Tuple[str, str]] = set()
+        # Ordem única diário → índice → fila (ver _enqueue)
+        self._enqueue_lock = threading.Lock()
+        self._queue: "queue.SimpleQueue" = queue.SimpleQueue()
+        # Conexões de leitura livres (reaproveitadas entre threads)
+        self._readers: List[sqlite3.Connection] = []
+        self._readers_lock = threading.Lock()
+        # Diário deste processo (criado depois de reaplicar os que ficaram sem dono)
+        self.journal: Optional[TranslationJournal] = None
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS translations (
+                src TEXT NOT NULL,
+                dest TEXT NOT NULL,
+                text TEXT NOT NULL,
+                translation TEXT NOT NULL,
+                kind TEXT NOT NULL DEFAULT 'translated',
+                updated_at REAL NOT NULL DEFAULT 0,
+                last_hit REAL NOT NULL DEFAULT 0,
+                PRIMARY KEY (src, dest, text)
+            ) WITHOUT ROWID;
+            CREATE TABLE IF NOT EXISTS meta (
+                key TEXT PRIMARY KEY,
+                value TEXT
+            );
+        """)
+        # Bancos criados antes do cache negativo ganham as colunas novas
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(translations)")}
+        if 'kind' not in columns:
+            self._conn.execute(
+                "ALTER TABLE translations ADD COLUMN kind TEXT NOT NULL DEFAULT 'translated'")
+            self._conn.execute(
+                "ALTER TABLE translations ADD COLUMN updated_at REAL NOT NULL DEFAULT 0")
+        if 'last_hit' not in columns:
+            self._conn.execute("ALTER TABLE translations ADD COLUMN last_hit REAL NOT NULL DEFAULT 0")
+            self._conn.execute("UPDATE translations SET last_hit=updated_at")
+        self._conn.commit()
+        self._writer = threading.Thread(target=self._run, name=f"cache-writer:{self.path.name}",
+                                        daemon=True)
+        self._writer.start()
+        # Traduções de execuções interrompidas voltam dos diários
+        self.replayed = self._replay_journals() if journal else 0
+        if journal:
+            self.journal = TranslationJournal.create(self.path)
+
+    def _replay_journals(self) -> int:
+        """Reaplica os diários de processos encerrados e os apaga depois de gravados"""
+        orphans = TranslationJournal.orphans(self.path)
+        count = 0
+        now = time.time()
+        for journal in orphans:
+            for src, dest, items in journal.entries():
+                self._enqueue([((src, dest, text), (translation or text, _kind_for(text, translation), now))
+                               for text, translation in items.items()])
+                count += len(items)
+        self.flush()
+        for journal in orphans:
+            journal.remove()
+        return count
+
+    # ---------------------- Índice de pendentes ----------------------
+
+    def _enqueue(self, rows: List[Tuple[_Key, _Row]], journal: Optional[Tuple[str, str, Dict[str, str]]] = None,
+                 weak: bool = False) -> None:
+        """
+        Diário, índice e fila na mesma ordem para todos os escritores: a
+        gravação vê as linhas na ordem em que entraram no índice (um item da
+        fila por chamada), e o diário
+        só é esvaziado quando tudo o que foi anotado nele já saiu da fila.
+        """
+        shards = self._shards
+        with self._enqueue_lock:
+            if journal is not None and self.journal is not None:
+                self.journal.append(*journal)
+            accepted = []
+            for key, row in rows:
+                shard = shards[hash(key[2]) & (_SHARDS - 1)]
+                with shard.lock:
+                    current = shard.rows.get(key)
+                    # Falha/ignorado nunca sobrescreve uma resposta válida ainda não gravada
+                    if weak and current is not None and current[1] not in _WEAK_KINDS:
+                        continue
+                    shard.rows[key] = row
+                accepted.append((key, row))
+            if accepted:
+                self._queue.put(accepted)
+        with self._stats_lock:
+            self.stats.inserts += len(accepted)
+
+    # ---------------------- Thread de gravação ----------------------
+
+    def _run(self) -> None:
+        """Laço da thread de gravação: junta os resultados e grava em lote"""
+        batch: Dict[_Key, _Row] = {}
+        deadline = 0.0
+        while True:
+            try:
+                item = self._queue.get(timeout=max(0.0, deadline - time.monotonic())
+                                       if batch or self._hits else None)
+            except queue.Empty:
+                item = _TICK
+            if item is None:
+                return
+            if isinstance(item, _Task):
+                try:
+                    self._commit(batch)
+                    result = item.fn(self._conn) if item.fn is not None else None
+                    self._conn.commit()
+                except BaseException as e:
+                    self._conn.rollback()
+                    # Lote com erro fica para a próxima gravação; quem espera recebe o erro
+                    deadline = time.monotonic() + self.flush_interval
+                    if item.future is not None:
+                        item.future.set_exception(e)
+                else:
+                    if item.future is not None:
+                        item.future.set_result(result)
+                continue
+            if not batch and not self._hits:
+                deadline = time.monotonic() + self.flush_interval
+            if isinstance(item, _Hits):
+                self._note_hits(item)
+                continue
+            batch.update(item)
+            if len(batch) >= self.flush_every:
+                try:
+                    self._commit(batch)
+                except sqlite3.Error:
+                    self._conn.rollback()  # tenta de novo no próximo flush, que recebe o erro
+
+    def _note_hits(self, hits: _Hits) -> None:
+        for dest, texts in hits.found:
+            pair = (hits.src, dest)
+            touched = self._touched.setdefault(pair, set())
+            new = [text for text in texts if text not in touched]
+            if new:
+                touched.update(new)
+                self._hits.setdefault(pair, {}).update(dict.fromkeys(new, hits.at))
+
+    def _commit(self, batch: Dict[_Key, _Row]) -> None:
+        """Grava um lote numa única transação, tira do índice o que já está no banco e esvazia o lote"""
+        if self._hits:
+            self._conn.executemany(
+                "UPDATE translations SET last_hit=? WHERE src=? AND dest=? AND text=?",
+                ((at, src, dest, text) for (src, dest), texts in self._hits.items()
+                 for text, at in texts.items()))
+            self._hits.clear()
+        if batch:
+            self._write_batch(batch)
+        else:
+            self._conn.commit()
+        # Diário esvaziado só com a fila vazia: o que foi anotado nele já está no banco
+        if self.journal is not None:
+            with self._enqueue_lock:
+                if self._queue.empty():
+                    self.journal.truncate()
+
+    def _write_batch(self, batch: Dict[_Key, _Row]) -> None:
+        strong = []
+        weak = []
+        for (s, d, t), (value, kind, updated_at) in batch.items():
+            (weak if kind in _WEAK_KINDS else strong).append((s, d, t, value, kind, updated_at))
+        self._conn.executemany(
+            "INSERT OR REPLACE INTO translations (src, dest, text, translation, kind, updated_at, last_hit) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?6)",
+            strong)
+        # Falhas e textos ignorados só atualizam entradas do mesmo tipo fraco
+        self._conn.executemany(
+            "INSERT OR IGNORE INTO translations (src, dest, text, translation, kind, updated_at, last_hit) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?6)",
+            weak)
+        self._conn.executemany(
+            "UPDATE translations SET translation=?, kind=?, updated_at=? "
+            "WHERE src=? AND dest=? AND text=? AND kind IN (?, ?)",
+            ((value, kind, ts, s, d, t) + _WEAK_KINDS for s, d, t, value, kind, ts in weak))
+        self._conn.commit()
+        # Partições carregadas recebem o lote antes de ele sair do índice de pendentes
+        partitions = self._partitions
+        if partitions:
+            for (s, d, t), (value, kind, updated_at) in batch.items():
+                part = partitions.get((s, d))
+                if part is None:
+                    continue
+                if kind in _WEAK_KINDS:
+                    current = part.rows.get(t)
+                    if current is not None and current[1] not in _WEAK_KINDS:
+                        continue
+                part.set(t, value, kind, updated_at)
+            self._evict()
+        shards = self._shards
+        for key, row in batch.items():
+            shard = shards[hash(key[2]) & (_SHARDS - 1)]
+            with shard.lock:
+                # Só sai do índice se ninguém escreveu um resultado mais novo nesse meio tempo
+                if shard.rows.get(key) is row:
+                    del shard.rows[key]
+        batch.clear()
+
+    def _call(self, fn: Optional[Callable[[sqlite3.Connection], Any]]) -> Any:
+        """Executa fn(conexão de escrita) na thread de gravação, depois do que já está na fila"""
+        future: Future = Future()
+        self._queue.put(_Task(fn, future))
+        return future.result()
+
+    # ---------------------- Partições por par ----------------------
+
+    def _partition(self, src: str, dest: str, probes: int) -> Optional[_Partition]:
+        """
+        Partição do par, carregada quando as consultas acumuladas compensam
+        ler o par inteiro; None enquanto as consultas devem ir ao banco.
+        """
+        pair = (src, dest)
+        part = self._partitions.get(pair)
+        if part is not None:
+            part.last_used = time.monotonic()
+            return part
+        if self.memory_budget <= 0 or pair in self._oversized or not self._writer.is_alive():
+            return None
+        total = self._pair_probes[pair] = self._pair_probes.get(pair, 0) + probes
+        rows = self._pair_rows.get(pair)
+        if rows is None:
+            with self._reading() as conn:
+                rows = self._pair_rows[pair] = conn.execute(
+                    "SELECT COUNT(*) FROM translations WHERE src=? AND dest=?", pair).fetchone()[0]
+        if total * _LOAD_FRACTION < rows:
+            return None
+        if rows * _ROW_OVERHEAD > self.memory_budget:
+            self._oversized.add(pair)
+            return None
+        # Carregada pela thread de gravação: nenhum lote fica entre a leitura e a instalação
+        return self._call(lambda conn: self._load(conn, pair))
+
+    def _load(self, conn: sqlite3.Connection, pair: Tuple[str, str]) -> Optional[_Partition]:
+        part = self._partitions.get(pair)
+        if part is not None:
+            return part
+        part = _Partition()
+        for text, value, kind, updated_at in conn.execute(
+                "SELECT text, translation, kind, updated_at FROM translations "
+                "WHERE src=? AND dest=?", pair):
+            part.set(text, value, kind, updated_at)
+        if part.size > self.memory_budget:
+            self._oversized.add(pair)
+            return None
+        self._partitions[pair] = part
+        self._evict(keep=pair)
+        return part
+
+    def _evict(self, keep: Optional[Tuple[str, str]] = None) -> None:
+        """Descarta as partições usadas há mais tempo até caber no orçamento"""
+        total = sum(part.size for part in self._partitions.values())
+        for pair, part in sorted(self._partitions.items(), key=lambda item: item[1].last_used):
+            if total <= self.memory_budget:
+                break
+            if pair == keep:
+                continue
+            del self._partitions[pair]
+            total -= part.size
+
+    def _drop_partitions(self) -> None:
+        """Esquece as partições e as contagens (depois de escritas fora do fluxo normal)"""
+        self._partitions.clear()
+        self._pair_rows.clear()
+        self._oversized.clear()
+
+    @property
+    def memory_used(self) -> int:
+        """Estimativa da memória ocupada pelas partições carregadas (bytes)"""
+        return sum(part.size for part in list(self._partitions.values()))
+
+    @property
+    def loaded_pairs(self) -> List[Tuple[str, str]]:
+        return list(self._partitions)
+
+    # ---------------------- Leitura ----------------------
+
+    @contextmanager
+    def _reading(self) -> Iterator[sqlite3.Connection]:
+        """Conexão de leitura emprestada (criada se todas estiverem em uso)"""
+        with self._readers_lock:
+            conn = self._readers.pop() if self._readers else None
+        if conn is None:
+            conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        try:
+            yield conn
+        finally:
+            with self._readers_lock:
+                self._readers.append(conn)
+
+    def _is_fresh(self, kind: str, updated_at: float, now: float) -> bool:
+        ttl = self.ttls.get(kind)
+        return ttl is None or now - updated_at < ttl
+
+    def lookup(self, src: str, dest: str, text: str) -> Optional[CacheEntry]:
+        """Busca o resultado válido de um texto (None se ausente ou vencido)"""
+        return self.lookup_many(src, dest, [text]).get(text)
+
+    def lookup_many(self, src: str, dest: str, texts: Iterable[str]) -> Dict[str, CacheEntry]:
+        """Busca vários resultados de uma vez; retorna só os encontrados e ainda válidos"""
+        return self.lookup_targets(src, [dest], texts)[dest]
+
+    def lookup_targets(self, src: str, dests: List[str],
+                       texts: Iterable[str]) -> Dict[str, Dict[str, CacheEntry]]:
+        """Como lookup_many para vários idiomas de destino numa única passada pelo banco"""
+        texts = list(dict.fromkeys(texts))
+        now = time.time()
+        found: Dict[str, Dict[str, CacheEntry]] = {dest: {} for dest in dests}
+        parts = {dest: self._partition(src, dest, len(texts)) for dest in dests}
+        db_dests = [dest for dest in dests if parts[dest] is None]
+        missing = []
+        # Um get isolado no dict é atômico: a leitura do índice não precisa de trava.
+        # O índice é consultado antes da partição e do banco: um resultado só sai
+        # dele depois de gravado e aplicado às partições carregadas.
+        shards = self._shards
+        for text in texts:
+            pending_rows = shards[hash(text) & (_SHARDS - 1)].rows
+            need_db = False
+            for dest in dests:
+                pending = pending_rows.get((src, dest, text))
+                part = parts[dest]
+                if part is not None:
+                    row = _newest(pending, part.get(text))
+                else:
+                    row = pending
+                    # Falha/ignorado pendente não esconde uma tradução já gravada
+                    need_db = need_db or pending is None or pending[1] in _WEAK_KINDS
+                if row is not None and self._is_fresh(row[1], row[2], now):
+                    found[dest][text] = CacheEntry(row[1], row[0], row[2])
+            if need_db:
+                missing.append(text)
+        if missing:
+            self._lookup_db(src, db_dests, missing, found, now)
+        # Falha recente não é acerto: o texto continua sem tradução
+        hits = sum(1 for entries in found.values() for entry in entries.values()
+                   if entry.kind != KIND_FAILED)
+        with self._stats_lock:
+            self.stats.hits += hits
+            self.stats.misses += len(texts) * len(dests) - hits
+        if hits:
+            self._queue.put(_Hits(src, [(dest, list(entries)) for dest, entries in found.items()], now))
+        return found
+
+    def _lookup_db(self, src: str, db_dests: List[str], missing: List[str],
+                   found: Dict[str, Dict[str, CacheEntry]], now: float) -> None:
+        """Completa found com o que está gravado no banco (destinos sem partição carregada)"""
+        shards = self._shards
+        dest_marks = ",".join("?" * len(db_dests))
+        step = max(1, _CHUNK - len(db_dests))
+        with self._reading() as conn:
+            for i in range(0, len(missing), step):
+                chunk = missing[i:i + step]
+                marks = ",".join("?" * len(chunk))
+                rows = conn.execute(
+                    f"SELECT dest, text, translation, kind, updated_at FROM translations "
+                    f"WHERE src=? AND dest IN ({dest_marks}) AND text IN ({marks})",
+                    [src] + db_dests + chunk)
+                for dest, text, value, kind, updated_at in rows:
+                    pending = shards[hash(text) & (_SHARDS - 1)].rows.get((src, dest, text))
+                    if _newest(pending, (value, kind, updated_at)) is pending:
+                        continue  # o pendente já está em found (se válido)
+                    if self._is_fresh(kind, updated_at, now):
+                        found[dest][text] = CacheEntry(kind, value, updated_at)
+
+    def get(self, src: str, dest: str, text: str) -> Optional[str]:
+        """Texto a usar na saída (None se não houver resultado válido no cache)"""
+        entry = self.lookup(src, dest, text)
+        return entry.value if entry else None
+
+    def get_many(self, src: str, dest: str, texts: Iterable[str]) -> Dict[str, str]:
+        """Como get, para vários textos; retorna só os encontrados"""
+        return {text: entry.value for text, entry in self.lookup_many(src, dest, texts).items()}
+
+    def entries(self, src: Optional[str] = None,
+                dest: Optional[str] = None) -> Iterator[Tuple[str, str, str, CacheEntry]]:
+        """
+        Percorre o cache (opcionalmente um par de idiomas) como estava no início
+        da leitura: grava os pendentes e lê tudo numa única transação de leitura,
+        então gravações concorrentes não alteram nem interrompem a iteração.
+        """
+        self.flush()
+        where, params = [], []
+        for column, value in (('src', src), ('dest', dest)):
+            if value is not None:
+                where.append(f"{column}=?")
+                params.append(value)
+        sql = "SELECT src, dest, text, translation, kind, updated_at FROM translations"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        conn = sqlite3.connect(str(self.path))
+        try:
+            for s, d, text, value, kind, updated_at in conn.execute(sql, params):
+                yield s, d, text, CacheEntry(kind, value, updated_at)
+        finally:
+            conn.close()
+
+    def __len__(self) -> int:
+        self.flush()
+        with self._reading() as conn:
+            return conn.execute("SELECT COUNT(*) FROM translations").fetchone()[0]
+
+    # ---------------------- Escrita ----------------------
+
+    def put(self, src: str, dest: str, text: str, translation: str) -> None:
+        """Agenda uma tradução para gravação (gravada em lote)"""
+        self.put_many(src, dest, {text: translation})
+
+    def put_many(self, src: str, dest: str, translations: Dict[str, str]) -> None:
+        """
+        Anota no diário e agenda as respostas do serviço para a thread de
+        gravação. Resposta igual ao original vira KIND_IDENTITY.
+        """
+        if not translations:
+            return
+        now = time.time()
+        self._enqueue([((src, dest, text), (translation or text, _kind_for(text, translation), now))
+                       for text, translation in translations.items()],
+                      journal=(src, dest, translations))
+
+    def put_outcomes(self, src: str, dest: str, texts: Iterable[str], kind: str) -> None:
+        """
+        Registra textos que falharam (KIND_FAILED) ou foram ignorados pelas
+        regras (KIND_SKIPPED). Não passam pelo diário (perdê-los só custa uma
+        nova tentativa) e nunca sobrescrevem uma resposta válida do serviço.
+        """
+        if kind not in _WEAK_KINDS:
+            raise ValueError(f"Tipo de resultado inválido para put_outcomes: {kind}")
+        now = time.time()
+        self._enqueue([((src, dest, text), (text, kind, now)) for text in texts], weak=True)
+
+    def put_missing(self, src: str, dest: str, translations: Dict[str, str]) -> int:
+        """Grava apenas as traduções que ainda não existem; retorna quantas entraram"""
+        now = time.time()
+
+        def insert(conn: sqlite3.Connection) -> int:
+            before = conn.total_changes
+            conn.executemany(
+                "INSERT OR IGNORE INTO translations (src, dest, text, translation, kind, updated_at, last_hit) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?6)",
+                ((src, dest, t, tr or t, _kind_for(t, tr), now) for t, tr in translations.items()))
+            part = self._partitions.get((src, dest))
+            if part is not None:
+                for t, tr in translations.items():
+                    if t not in part.rows:
+                        part.set(t, tr or t, _kind_for(t, tr), now)
+            return conn.total_changes - before
+        inserted = self._call(insert)
+        with self._stats_lock:
+            self.stats.inserts += inserted
+        return inserted
+
+    def flush(self) -> None:
+        """Espera a thread de gravação gravar tudo o que foi agendado até agora"""
+        self._call(None)
+
+    # ---------------------- Limpeza ----------------------
+
+    def evict(self, policy: Optional[EvictionPolicy] = None) -> int:
+        """
+        Remove os resultados vencidos (validade do tipo) e o que passar dos
+        limites da política (a do cache, se nenhuma for dada), os de acerto
+        mais antigo primeiro. Retorna quantas entradas saíram.
+        """
+        policy = policy or self.eviction
+        now = time.time()
+
+        def evict(conn: sqlite3.Connection) -> int:
+            removed = 0
+            for kind, ttl in self.ttls.items():
+                if ttl is not None:
+                    removed += conn.execute("DELETE FROM translations WHERE kind=? AND updated_at<?",
+                                            (kind, now - ttl)).rowcount
+            if policy.max_idle is not None:
+                removed += conn.execute("DELETE FROM translations WHERE last_hit<?",
+                                        (now - policy.max_idle,)).rowcount
+            keep = policy.max_entries
+            count = conn.execute("SELECT COUNT(*) FROM translations").fetchone()[0]
+            if policy.max_bytes is not None and count:
+                # O tamanho vira um número de entradas pela média por linha das páginas em uso
+                used = _used_bytes(conn)
+                if used > policy.max_bytes:
+                    fit = int(count * policy.max_bytes / used)
+                    keep = fit if keep is None else min(keep, fit)
+            if keep is not None and count > keep:
+                removed += conn.execute(
+                    "DELETE FROM translations WHERE (src, dest, text) IN "
+                    "(SELECT src, dest, text FROM translations ORDER BY last_hit LIMIT ?)",
+                    (count - keep,)).rowcount
+            if removed:
+                self._drop_partitions()
+            return removed
+        removed = self._call(evict)
+        with self._stats_lock:
+            self.stats.evicted += removed
+        return removed
+
+    def disk_size(self) -> int:
+        """Bytes do banco no disco (com o WAL)"""
+        return sum(p.stat().st_size for p in (self.path, self.path.with_name(self.path.name + '-wal'))
+                   if p.exists())
+
+    def compact(self, policy: Optional[EvictionPolicy] = None) -> Tuple[int, int]:
+        """Limpa (ver evict) e reescreve o arquivo sem o espaço livre; retorna (bytes antes, depois)"""
+        before = self.disk_size()
+        self.evict(policy)
+
+        def vacuum(conn: sqlite3.Connection) -> None:
+            conn.commit()
+            conn.execute("VACUUM")
+            conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        self._call(vacuum)
+        return before, self.disk_size()
+
+    def close(self) -> None:
+        if not self._writer.is_alive():
+            return
+        if self.eviction.active:
+            self.evict()
+        self.flush()
+        self._queue.put(None)
+        self._writer.join()
+        self._conn.close()
+        with self._readers_lock:
+            readers, self._readers = self._readers, []
+        for conn in readers:
+            conn.close()
+        if self.journal is not None:
+            # Tudo gravado: o diário vazio não precisa ficar na pasta
+            self.journal.remove()
+
+    # ---------------------- Migração ----------------------
+
+    def migrate_json(self, json_path: Path, src: Optional[str] = None,
+                     dest: Optional[str] = None) -> int:
+        """
+        Importa um cache JSON antigo uma única vez.
+        Com src/dest, as chaves são o texto original (cache do Valheim);
+        sem eles, as chaves seguem o formato "origem:destino:texto".
+        """
+        json_path = Path(json_path)
+        marker = f"migrated:{json_path.name}"
+        if not json_path.exists():
+            return 0
+        if self.meta(marker):
+            return 0
+        try:
+            with open(json_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            data = {}
+
+        now = time.time()
+        rows: List[Tuple[str, str, str, str, str, float]] = []
+        for key, translation in data.items():
+            if src is not None and dest is not None:
+                text_src, text_dest, text = src, dest, key
+            else:
+                parts = key.split(':', 2)
+                if len(parts) != 3:
+                    continue
+                text_src, text_dest, text = parts
+            rows.append((text_src, text_dest, text, translation or text,
+                         _kind_for(text, translation), now))
+
+        return self._import_rows(marker, rows)
+
+    def import_store(self, path: Path) -> int:
+        """
+        Importa uma única vez as traduções de outro cache SQLite (os de cada
+        ferramenta, antes do cache único). As entradas já existentes ficam;
+        falhas e textos ignorados não são trazidos.
+        """
+        path = Path(path)
+        marker = f"imported:{path.name}"
+        if not path.exists() or path.resolve() == self.path.resolve():
+            return 0
+        if self.meta(marker):
+            return 0
+        # Abrir como cache também recupera o diário de uma execução interrompida
+        source = SQLiteCacheStore(path, memory_budget=0)
+        try:
+            rows = [(s, d, text, entry.value, entry.kind, entry.updated_at)
+                    for s, d, text, entry in source.entries() if entry.kind not in _WEAK_KINDS]
+        finally:
+            source.close()
+        return self._import_rows(marker, rows)
+
+    def _import_rows(self, marker: str, rows: List[Tuple[str, str, str, str, str, float]]) -> int:
+        def insert(conn: sqlite3.Connection) -> int:
+            if _meta_get(conn, marker):
+                return 0
+            conn.executemany(
+                "INSERT OR IGNORE INTO translations (src, dest, text, translation, kind, updated_at, last_hit) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?6)",
+                rows)
+            conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)",
+                         (marker, str(len(rows))))
+            self._drop_partitions()
+            return len(rows)
+        return self._call(insert)
+
+    # ---------------------- Metadados ----------------------
+
+    def meta(self, key: str) -> Optional[str]:
+        """Valor gravado em meta (marcas de importação, versões de regras...)"""
+        with self._reading() as conn:
+            return _meta_get(conn, key)
+
+    def set_meta(self, key: str, value: str) -> None:
+        def store(conn: sqlite3.Connection) -> None:
+            conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, value))
+        self._call(store)
+
+
+# ---------------------- Linha de comando ----------------------
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Compactação offline: limpa e reescreve os caches (por padrão, os da pasta Cache)"""
+    parser = argparse.ArgumentParser(description="Limpa e compacta o cache de traduções")
+    parser.add_argument('paths', nargs='*', type=Path, help="arquivos .sqlite3 (padrão: Cache/*.sqlite3)")
+    parser.add_argument('--max-entries', type=int, help="máximo de entradas")
+    parser.add_argument('--max-mb', type=float, help="tamanho máximo em MB")
+    parser.add_argument('--max-idle-days', type=float, help="remove o que não é usado há N dias")
+    args = parser.parse_args(argv)
+    policy = policy_from_env()
+    if args.max_entries is not None:
+        policy.max_entries = args.max_entries
+    if args.max_mb is not None:
+        policy.max_bytes = int(args.max_mb * (1 << 20))
+    if args.max_idle_days is not None:
+        policy.max_idle = args.max_idle_days * 24 * 3600
+    paths = args.paths or sorted((Path(__file__).parent.parent / "Cache").glob("*.sqlite3"))
+    for path in paths:
+        store = SQLiteCacheStore(path)
+        try:
+            before, after = store.compact(policy)
+            print(f"{path.name}: {store.stats.evicted} entradas removidas, {len(store)} restantes, "
+                  f"{before / (1 << 20):.1f} MB → {after / (1 << 20):.1f} MB")
+        finally:
+            store.close()
+
+
+if __name__ == '__main__':
+    main()
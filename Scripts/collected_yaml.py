@@ -0,0 +1,145 @@
+"""
+Leitura e escrita em streaming do YAML gerado pelo coletor do Valheim.
+
+O arquivo é percorrido uma única vez para descobrir as linhas traduzíveis
+("chave: chave"). Em vez de guardar as linhas na memória, a varredura grava
+um índice em disco com a posição (offset, tamanho) de cada linha traduzível.
+Na escrita, os trechos entre essas linhas são copiados byte a byte, só as
+linhas indexadas são reescritas, e o resultado vai para um arquivo temporário
+que substitui o destino de forma atômica. A memória não cresce com o número
+de linhas, só com o número de textos únicos.
+"""
+
+import os
+import struct
+from dataclasses import dataclass, field
+from typing import BinaryIO, Callable, Dict, Iterator, List, Tuple
+
+from line_index import MappedFile
+
+# Registro do índice: offset (8 bytes) + tamanho da linha (4 bytes)
+_RECORD = struct.Struct('<QI')
+
+# ------------------------- Utilidades YAML -------------------------
+# A análise é feita sobre bytes: só as chaves candidatas são decodificadas
+
+def _strip_quotes(s: bytes) -> bytes:
+    s = s.strip()
+    if len(s) >= 2 and s[:1] == s[-1:] and s[:1] in (b"'", b'"'):
+        return s[1:-1]
+    return s
+
+def quote_yaml(s: str) -> str:
+    # Usa sempre aspas duplas e escapa internas
+    return '"' + s.replace('"', '\\"') + '"'
+
+def _is_block_start(line: bytes) -> bool:
+    ls = line.strip()
+    # Inícios comuns de blocos multilinha no arquivo coletado
+    return (
+        ls.startswith(b'? >-') or
+        ls.startswith(b': >-') or
+        ls.endswith(b': >-') or  # key: >-
+        ls == b'|-' or ls == b'>' or ls == b'|'
+    )
+
+# ------------------------- Varredura -------------------------
+
+def _entries(lines: Iterator[Tuple[int, bytes]]) -> Iterator[Tuple[int, int, bytes, bytes]]:
+    """Linhas "chave: valor" fora de blocos multilinha: (offset, tamanho, chave, valor) em bytes"""
+    in_block = False
+    for start, line in lines:
+        raw = line.rstrip(b'\r\n')
+        if in_block:
+            # Fim do bloco quando linha não-indentada ou vazia após pelo menos 1 linha
+            if raw.strip() == b'' or not raw.startswith((b' ', b'\t')):
+                in_block = False
+            continue
+        if _is_block_start(raw):
+            in_block = True
+            continue
+        if not raw or raw.lstrip().startswith(b'#'):
+            continue
+        if b':' not in raw:
+            continue
+        key_part, val_part = raw.split(b':', 1)
+        yield start, len(line), _strip_quotes(key_part), _strip_quotes(val_part)
+
+def iter_entries(path: str) -> Iterator[Tuple[str, str]]:
+    """(chave, valor) de cada linha "chave: valor" fora de blocos multilinha, sem aspas"""
+    with MappedFile(path) as mapped:
+        for _, _, key, value in _entries(mapped.lines()):
+            yield key.decode('utf-8'), value.decode('utf-8')
+
+
+@dataclass
+class ScanResult:
+    """Resultado da varredura: textos únicos (em ordem) e contagens"""
+    texts: List[str] = field(default_factory=list)
+    lines: int = 0
+    slots: int = 0
+
+
+def scan(path: str, index_path: str, should_skip: Callable[[str], bool]) -> ScanResult:
+    """
+    Uma passada pelo arquivo: grava no índice cada linha traduzível
+    (chave == valor e não ignorada) e retorna os textos únicos a traduzir.
+    """
+    result = ScanResult()
+    seen: Dict[str, None] = {}
+    with MappedFile(path) as mapped, open(index_path, 'wb') as index:
+
+        def counted() -> Iterator[Tuple[int, bytes]]:
+            for item in mapped.lines():
+                result.lines += 1
+                yield item
+
+        for offset, length, key, value in _entries(counted()):
+            # Só traduz quando key == value (após normalização)
+            if key != value:
+                continue
+            text = key.decode('utf-8')
+            if should_skip(text):
+                continue
+            index.write(_RECORD.pack(offset, length))
+            result.slots += 1
+            seen.setdefault(text)
+    result.texts = list(seen)
+    return result
+
+def _iter_index(index: BinaryIO) -> Iterator[Tuple[int, int]]:
+    while True:
+        chunk = index.read(_RECORD.size * 4096)
+        if not chunk:
+            return
+        yield from _RECORD.iter_unpack(chunk)
+
+# ------------------------- Escrita -------------------------
+
+def write_translated(path: str, index_path: str, out_path: str,
+                     translations: Dict[str, str]) -> None:
+    """
+    Copia o arquivo original trocando só as linhas do índice por
+    'chave: "tradução"' (com o recuo e a quebra de linha originais);
+    grava num temporário e troca atomicamente.
+    """
+    tmp_path = out_path + '.tmp'
+    with MappedFile(path) as src, open(index_path, 'rb') as index, open(tmp_path, 'wb') as dst:
+        pos = src.start
+        for offset, length in _iter_index(index):
+            # Trechos não traduzidos vão direto do mmap para o arquivo
+            src.copy_to(dst, pos, offset)
+            line = src.slice(offset, offset + length)
+            # Recuo e quebra de linha (LF ou CRLF) ficam como no original
+            body = line.rstrip(b'\r\n')
+            ending = line[len(body):]
+            indent = body[:len(body) - len(body.lstrip(b' \t'))]
+            key_raw = body.split(b':', 1)[0].strip()
+            key = _strip_quotes(key_raw).decode('utf-8')
+            traduzida = translations.get(key, key)
+            dst.write(indent + key_raw + f": {quote_yaml(traduzida)}".encode('utf-8') + ending)
+            pos = offset + length
+        src.copy_to(dst, pos, src.size)
+        dst.flush()
+        os.fsync(dst.fileno())
+    os.replace(tmp_path, out_path)
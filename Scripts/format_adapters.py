@@ -0,0 +1,718 @@
+"""
+Adaptadores de formato para o pipeline de tradução.
+
+Cada adaptador sabe ler um formato, listar os textos traduzíveis como
+"slots" com endereço estável (caminho dentro do documento) e reaplicar as
+traduções nesses endereços antes de gravar. O resto do pipeline (cache,
+deduplicação, tradução paralela) é o mesmo para todos os formatos:
+
+    adapter = get_adapter('XML')
+    doc = adapter.read(entrada)
+    slots = list(adapter.slots(doc))
+    ...  # traduz os textos únicos dos slots
+    adapter.apply(doc, {slot.address: traducao})
+    adapter.write(saida, doc)
+    adapter.close(doc)
+
+O YAML é lido pelos eventos do parser (libyaml) e só os trechos dos escalares
+traduzidos são reescritos; JSON, XML e CSV/TSV são lidos e regravados em
+streaming. Os formatos linha a linha (TXT) não carregam o
+arquivo: usam um LineIndex sobre o arquivo mapeado e só reescrevem as linhas
+traduzidas.
+"""
+
+import configparser
+import csv
+import json
+import os
+import re
+from array import array
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple, Type, Union
+from xml.sax.saxutils import escape
+
+import yaml
+
+# Try to import toml (optional)
+try:
+    import toml
+    TOML_AVAILABLE = True
+except ImportError:
+    TOML_AVAILABLE = False
+
+from json_stream import encode_json_string, walk
+from line_index import LineIndex, MappedFile
+from xml_stream import DEFAULT_ATTRIBUTES as DEFAULT_XML_ATTRIBUTES, document_encoding
+from xml_stream import scan as scan_xml
+
+# Caminho até o texto dentro do documento (índices, chaves, seções...)
+Address = Tuple[Any, ...]
+
+
+@dataclass(frozen=True)
+class Slot:
+    """Texto traduzível e onde ele fica no documento"""
+    address: Address
+    text: str
+
+
+def _split_padding(raw: str) -> Tuple[str, str, str]:
+    """Separa espaços nas pontas: (esquerda, texto, direita)"""
+    text = raw.strip()
+    if not text:
+        return raw, '', ''
+    start = raw.index(text)
+    return raw[:start], text, raw[start + len(text):]
+
+
+# ------------------------- YAML -------------------------
+
+try:
+    from yaml import CLoader as _YamlLoader  # libyaml (C)
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader
+
+_YAML_STR_TAG = 'tag:yaml.org,2002:str'
+_YAML_RESOLVER = yaml.resolver.Resolver()
+# Texto que pode ficar sem aspas sem mudar de sentido (regra conservadora)
+_YAML_PLAIN = re.compile(r"[^\s\-?:,\[\]{}#&*!|>'\"%@`][^\r\n:#,\[\]{}]*")
+
+
+def _skip_properties(text: str, start: int, end: int) -> int:
+    """Início do escalar em si, depois de âncora (&a) e tag (!!str) se houver"""
+    while start < end and text[start] in '&!':
+        while start < end and not text[start].isspace():
+            start += 1
+        while start < end and text[start].isspace():
+            start += 1
+    return start
+
+
+def _block_header(text: str, start: int) -> str:
+    """Linha de cabeçalho de um bloco (|-, >+ ...), sem a quebra de linha"""
+    end = text.find('\n', start)
+    return text[start:end if end >= 0 else len(text)].rstrip('\r')
+
+
+def _render_flow(text: str, style: str) -> str:
+    """Escalar de uma linha, no estilo original quando possível"""
+    if not style and text == text.strip() and _YAML_PLAIN.fullmatch(text) and \
+            _YAML_RESOLVER.resolve(yaml.ScalarNode, text, (True, False)) == _YAML_STR_TAG:
+        return text
+    if style == "'" and '\n' not in text:
+        return "'" + text.replace("'", "''") + "'"
+    # JSON é um subconjunto válido das aspas duplas do YAML
+    return json.dumps(text, ensure_ascii=False)
+
+
+def _render_block(span: str, translated: str) -> str:
+    """
+    Reescreve o conteúdo de um bloco (| ou >) mantendo cabeçalho, indentação,
+    linhas em branco e quebras de linha finais do trecho original.
+    """
+    lines = span.splitlines(True)
+    header, body = lines[0], lines[1:]
+    filled = [i for i, line in enumerate(body) if line.strip()]
+    first, last = body[filled[0]], body[filled[-1]]
+    indent = len(first) - len(first.lstrip(' '))
+    eol = '\r\n' if header.endswith('\r\n') else '\n'
+    new_lines = translated.split('\n')
+    # Bloco dobrado (>) junta linhas: quebras ou recuos na tradução exigem bloco literal
+    if header.startswith('>') and (len(new_lines) > 1 or translated[:1].isspace()):
+        header = '|' + header[1:]
+    content = new_lines[0] + ''.join(eol + (' ' * indent + line if line else '')
+                                     for line in new_lines[1:])
+    return (header + ''.join(body[:filled[0]]) + first[:indent] + content +
+            last[len(last.rstrip('\r\n')):] + ''.join(body[filled[-1] + 1:]))
+
+
+class FormatAdapter:
+    """Interface comum: read → slots → apply → write"""
+
+    format_name = ''
+
+    def read(self, path: Path) -> Any:
+        raise NotImplementedError
+
+    def slots(self, doc: Any) -> Iterator[Slot]:
+        raise NotImplementedError
+
+    def apply(self, doc: Any, translations: Dict[Address, str]) -> None:
+        """Substitui no documento os textos dos endereços traduzidos"""
+        raise NotImplementedError
+
+    def write(self, path: Path, doc: Any) -> None:
+        raise NotImplementedError
+
+    def close(self, doc: Any) -> None:
+        """Libera recursos do documento (arquivos mapeados); chamado depois da última escrita"""
+
+
+class LineDoc:
+    """
+    Documento linha a linha sobre um LineIndex: guarda só os números das linhas
+    com slot e as linhas substituídas; o resto é copiado do original na escrita.
+    """
+
+    __slots__ = ('index', 'slot_lines', 'replacements')
+
+    def __init__(self, index: LineIndex):
+        self.index = index
+        self.slot_lines = array('I')
+        self.replacements: Dict[int, bytes] = {}
+
+    def ending(self, i: int) -> bytes:
+        """Quebra de linha original da linha i (b'' na última sem quebra)"""
+        raw = self.index.raw(i)
+        return raw[len(raw.rstrip(b'\r\n')):]
+
+
+class LineAdapter(FormatAdapter):
+    """Base dos formatos linha a linha: arquivo mapeado, só as linhas alteradas são reescritas"""
+
+    def read(self, path: Path) -> LineDoc:
+        doc = LineDoc(LineIndex(path))
+        try:
+            doc.slot_lines.extend(i for i in range(len(doc.index))
+                                  if self._slot_text(doc.index.text(i)) is not None)
+        except Exception:
+            doc.index.close()
+            raise
+        return doc
+
+    def _slot_text(self, line: str) -> Optional[str]:
+        """Texto traduzível da linha, ou None se a linha não tem slot"""
+        raise NotImplementedError
+
+    def _render(self, line: str, translated: str) -> str:
+        """Linha original com o texto trocado pela tradução"""
+        raise NotImplementedError
+
+    def slots(self, doc: LineDoc) -> Iterator[Slot]:
+        for i in doc.slot_lines:
+            yield Slot((i,), self._slot_text(doc.index.text(i)))
+
+    def apply(self, doc: LineDoc, translations: Dict[Address, str]) -> None:
+        for (i,), translated in translations.items():
+            line = doc.index.text(i)
+            if translated == self._slot_text(line):
+                # Voltou ao original: a linha é copiada como está
+                doc.replacements.pop(i, None)
+            else:
+                doc.replacements[i] = self._render(line, translated).encode('utf-8') + doc.ending(i)
+
+    def write(self, path: Path, doc: LineDoc) -> None:
+        doc.index.write(path, doc.replacements)
+
+    def close(self, doc: LineDoc) -> None:
+        doc.index.close()
+
+
+class YamlDoc:
+    """
+    Texto original do YAML + posição de cada escalar traduzível. Só os trechos
+    dos escalares trocados são reescritos; o resto (comentários, indentação,
+    estilo de aspas) sai idêntico.
+    """
+
+    __slots__ = ('text', 'bom', 'scalars', 'replacements')
+
+    def __init__(self, text: str, bom: bool):
+        self.text = text
+        self.bom = bom
+        # endereço → (início, fim, estilo, valor), em ordem de documento
+        self.scalars: Dict[Address, Tuple[int, int, str, str]] = {}
+        # endereço → novo trecho do texto
+        self.replacements: Dict[Address, str] = {}
+
+
+class YamlAdapter(FormatAdapter):
+    """
+    YAML estrutural: percorre os eventos do parser (libyaml, se disponível) e
+    endereça cada escalar de texto pelo caminho (documento, chaves, índices).
+    Valores aninhados, listas e blocos (|, >) são traduzidos; chaves, números,
+    booleanos e aliases não.
+    """
+
+    format_name = 'YAML'
+
+    def read(self, path: Path) -> YamlDoc:
+        with open(path, 'r', encoding='utf-8', newline='') as f:
+            text = f.read()
+        bom = text.startswith('\ufeff')
+        doc = YamlDoc(text[1:] if bom else text, bom)
+        self._index(doc)
+        return doc
+
+    def _index(self, doc: YamlDoc) -> None:
+        # Pilha de coleções abertas: [caminho, é_mapa, espera_chave, chave_atual, posição]
+        # Caminho None = dentro de uma chave complexa (nada ali é traduzido)
+        frames: List[list] = []
+        doc_index = -1
+        for event in yaml.parse(doc.text, Loader=_YamlLoader):
+            if isinstance(event, yaml.DocumentStartEvent):
+                doc_index += 1
+                continue
+            if isinstance(event, (yaml.MappingEndEvent, yaml.SequenceEndEvent)):
+                frames.pop()
+                self._advance(frames, None)
+                continue
+            if not isinstance(event, yaml.NodeEvent):
+                continue
+
+            # Caminho do nó atual a partir da coleção que o contém
+            if not frames:
+                path: Optional[Address] = (doc_index,)
+            else:
+                parent_path, is_map, expect_key, key, pos = frames[-1]
+                if parent_path is None or (is_map and expect_key):
+                    path = None
+                else:
+                    path = parent_path + ((key if is_map else pos),)
+
+            if isinstance(event, yaml.CollectionStartEvent):
+                is_map = isinstance(event, yaml.MappingStartEvent)
+                frames.append([path, is_map, True, None, 0])
+                continue
+
+            if isinstance(event, yaml.ScalarEvent) and path is not None:
+                self._add_scalar(doc, path, event)
+            self._advance(frames, event.value if isinstance(event, yaml.ScalarEvent) else None)
+
+    @staticmethod
+    def _advance(frames: List[list], scalar_key: Optional[str]) -> None:
+        """Marca o nó atual como concluído na coleção que o contém"""
+        if not frames:
+            return
+        frame = frames[-1]
+        if not frame[1]:
+            frame[4] += 1
+        elif frame[2]:
+            # Chave concluída: escalar vira o nome, chave complexa vira a posição do par
+            frame[3] = scalar_key if scalar_key is not None else frame[4]
+            frame[2] = False
+        else:
+            frame[2] = True
+            frame[4] += 1
+
+    @staticmethod
+    def _add_scalar(doc: YamlDoc, path: Address, event: 'yaml.ScalarEvent') -> None:
+        style = event.style or ''
+        if event.tag not in (None, '!', _YAML_STR_TAG):
+            return
+        if not style and _YAML_RESOLVER.resolve(yaml.ScalarNode, event.value, event.implicit) != _YAML_STR_TAG:
+            return  # número, booleano, null...
+        start, end = event.start_mark.index, event.end_mark.index
+        if event.anchor is not None or event.tag is not None:
+            start = _skip_properties(doc.text, start, end)
+        if style in ('|', '>') and any(c.isdigit() for c in _block_header(doc.text, start)):
+            return  # indicador de indentação explícito: raro, não vale reescrever
+        if not event.value.strip():
+            return
+        # Chaves repetidas (YAML inválido, mas comum em mods) ganham um sufixo
+        n = 1
+        address = path
+        while address in doc.scalars:
+            address = path + (n,)
+            n += 1
+        doc.scalars[address] = (start, end, style, event.value)
+
+    def slots(self, doc: YamlDoc) -> Iterator[Slot]:
+        for address, (_, _, _, value) in doc.scalars.items():
+            yield Slot(address, value.strip())
+
+    def apply(self, doc: YamlDoc, translations: Dict[Address, str]) -> None:
+        for address, translated in translations.items():
+            start, end, style, value = doc.scalars[address]
+            left, core, right = _split_padding(value)
+            if translated == core:
+                doc.replacements.pop(address, None)
+            elif style in ('|', '>'):
+                doc.replacements[address] = _render_block(doc.text[start:end], translated)
+            else:
+                doc.replacements[address] = _render_flow(left + translated + right, style)
+
+    def write(self, path: Path, doc: YamlDoc) -> None:
+        pieces = ['\ufeff'] if doc.bom else []
+        pos = 0
+        for start, end, replacement in sorted(
+                (doc.scalars[address][0], doc.scalars[address][1], replacement)
+                for address, replacement in doc.replacements.items()):
+            pieces.append(doc.text[pos:start])
+            pieces.append(replacement)
+            pos = end
+        pieces.append(doc.text[pos:])
+        with open(path, 'w', encoding='utf-8', newline='') as f:
+            f.writelines(pieces)
+
+
+class JsonAdapter(FormatAdapter):
+    """Árvore inteira na memória (base do TOML): strings (valores, não chaves) em qualquer profundidade"""
+
+    format_name = 'JSON'
+
+    def read(self, path: Path) -> Any:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    def slots(self, doc: Any) -> Iterator[Slot]:
+        stack: List[Tuple[Address, Any]] = [((), doc)]
+        while stack:
+            path, node = stack.pop()
+            if isinstance(node, str):
+                yield Slot(path, node)
+            elif isinstance(node, dict):
+                stack.extend((path + (k,), v) for k, v in reversed(list(node.items())))
+            elif isinstance(node, list):
+                stack.extend((path + (i,), v) for i, v in reversed(list(enumerate(node))))
+
+    def apply(self, doc: Any, translations: Dict[Address, str]) -> None:
+        for path, translated in translations.items():
+            if not path:
+                continue  # documento que é só uma string: nada a substituir no lugar
+            parent = doc
+            for step in path[:-1]:
+                parent = parent[step]
+            parent[path[-1]] = translated
+
+    def write(self, path: Path, doc: Any) -> None:
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(doc, f, ensure_ascii=False, indent=2)
+
+
+class JsonStreamDoc:
+    """JSON ainda não lido: só o caminho do arquivo e as strings substituídas"""
+
+    __slots__ = ('path', 'replacements')
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.replacements: Dict[Address, str] = {}
+
+
+class JsonStreamAdapter(FormatAdapter):
+    """
+    JSON lido token a token: as strings (valores, não chaves) viram slots com o
+    caminho até elas, e a gravação copia os tokens do original trocando só as
+    strings traduzidas. A memória depende da profundidade, não do tamanho.
+    """
+
+    format_name = 'JSON'
+
+    def read(self, path: Path) -> JsonStreamDoc:
+        return JsonStreamDoc(path)
+
+    def slots(self, doc: JsonStreamDoc) -> Iterator[Slot]:
+        with open(doc.path, 'r', encoding='utf-8', newline='') as f:
+            for address, _, _, value in walk(f):
+                if address is not None:
+                    yield Slot(address, value)
+
+    def apply(self, doc: JsonStreamDoc, translations: Dict[Address, str]) -> None:
+        doc.replacements.update(translations)
+
+    def write(self, path: Path, doc: JsonStreamDoc) -> None:
+        replacements = doc.replacements
+        tmp_path = Path(path).with_name(Path(path).name + '.tmp')
+        with open(doc.path, 'r', encoding='utf-8', newline='') as src, \
+                open(tmp_path, 'w', encoding='utf-8', newline='') as dst:
+            for address, gap, raw, value in walk(src):
+                dst.write(gap)
+                translated = replacements.get(address, value) if address is not None else value
+                dst.write(raw if translated == value else encode_json_string(translated))
+        os.replace(tmp_path, path)
+
+
+class TomlAdapter(JsonAdapter):
+    """Mesma estrutura de dicionários/listas do JSON, lida e gravada com 'toml'"""
+
+    format_name = 'TOML'
+
+    def read(self, path: Path) -> Any:
+        if not TOML_AVAILABLE:
+            raise ImportError("Instale o módulo 'toml': pip install toml")
+        with open(path, 'r', encoding='utf-8') as f:
+            return toml.load(f)
+
+    def write(self, path: Path, doc: Any) -> None:
+        if not TOML_AVAILABLE:
+            raise ImportError("Instale o módulo 'toml': pip install toml")
+        with open(path, 'w', encoding='utf-8') as f:
+            toml.dump(doc, f)
+
+
+# Escapes extras dentro de atributos, conforme a aspa usada no original
+_XML_ATTR_ENTITIES = {
+    quote: dict({'\n': '&#10;', '\r': '&#13;', '\t': '&#9;'}, **{quote.decode(): entity})
+    for quote, entity in ((b'"', '&quot;'), (b"'", '&apos;'))
+}
+
+
+class XmlStreamDoc:
+    """XML ainda não lido: caminho, atributos traduzíveis e textos substituídos"""
+
+    __slots__ = ('path', 'attributes', 'replacements')
+
+    def __init__(self, path: Path, attributes: Tuple[str, ...]):
+        self.path = Path(path)
+        self.attributes = attributes
+        self.replacements: Dict[Address, str] = {}
+
+
+class XmlAdapter(FormatAdapter):
+    """
+    XML lido em streaming pelo expat: texto dos elementos, texto depois deles
+    (tail) e atributos selecionados viram slots; o endereço é a sequência de
+    índices dos filhos a partir da raiz + 'text', 'tail' ou '@atributo'. A
+    gravação copia o original e troca só os trechos traduzidos.
+    """
+
+    format_name = 'XML'
+
+    def __init__(self, attributes: Iterable[str] = DEFAULT_XML_ATTRIBUTES):
+        self.attributes = tuple(attributes)
+
+    def read(self, path: Path) -> XmlStreamDoc:
+        return XmlStreamDoc(path, self.attributes)
+
+    def slots(self, doc: XmlStreamDoc) -> Iterator[Slot]:
+        with MappedFile(doc.path) as mapped:
+            for found in scan_xml(mapped, doc.attributes):
+                yield Slot(found.address, found.value.strip())
+
+    def apply(self, doc: XmlStreamDoc, translations: Dict[Address, str]) -> None:
+        doc.replacements.update(translations)
+
+    def write(self, path: Path, doc: XmlStreamDoc) -> None:
+        tmp_path = Path(path).with_name(Path(path).name + '.tmp')
+        with MappedFile(doc.path) as src, open(tmp_path, 'wb') as dst:
+            encoding = document_encoding(src.slice(0, 512))
+            pos = 0
+            for found in scan_xml(src, doc.attributes):
+                left, core, right = _split_padding(found.value)
+                translated = doc.replacements.get(found.address, core)
+                if translated == core:
+                    continue
+                if found.quote is None:
+                    rendered = left + escape(translated) + right
+                else:
+                    rendered = escape(left + translated + right, _XML_ATTR_ENTITIES[found.quote])
+                src.copy_to(dst, pos, found.start)
+                dst.write(rendered.encode(encoding, 'xmlcharrefreplace'))
+                pos = found.end
+            src.copy_to(dst, pos, src.size)
+        os.replace(tmp_path, path)
+
+
+class TxtAdapter(LineAdapter):
+    """Uma linha por slot (linhas em branco não contam); indentação e quebras de linha são mantidas"""
+
+    format_name = 'TXT'
+
+    def _slot_text(self, line: str) -> Optional[str]:
+        return line.strip() or None
+
+    def _render(self, line: str, translated: str) -> str:
+        left, _, right = _split_padding(line)
+        return left + translated + right
+
+
+# Coluna por nome (cabeçalho) ou índice (a partir de 0)
+Column = Union[str, int]
+
+
+class CsvStreamDoc:
+    """CSV ainda não lido: caminho, formato original e células substituídas"""
+
+    __slots__ = ('path', 'bom', 'lineterminator', 'replacements')
+
+    def __init__(self, path: Path, bom: bool, lineterminator: str):
+        self.path = Path(path)
+        self.bom = bom
+        self.lineterminator = lineterminator
+        self.replacements: Dict[Address, str] = {}
+
+
+class CsvAdapter(FormatAdapter):
+    """
+    Planilha lida e gravada linha a linha, endereçada por (linha, coluna).
+    Sem seleção, todas as células são slots. Com 'columns' e/ou 'fill', a
+    primeira linha é o cabeçalho (não traduzido) e só as colunas escolhidas
+    entram; 'fill' = {destino: origem} grava na coluna de destino a tradução
+    do texto da coluna de origem (ou o próprio texto, se não houver tradução).
+    Uma coluna de destino não pode ser também traduzida ou lida como origem.
+    """
+
+    format_name = 'CSV'
+    delimiter = ','
+
+    def __init__(self, columns: Iterable[Column] = (), fill: Optional[Dict[Column, Column]] = None):
+        self.columns = tuple(columns)
+        self.fill = dict(fill or {})
+        self._check_overlap(self.columns, list(self.fill.items()))
+
+    @staticmethod
+    def _check_overlap(columns: Iterable[Column], fill: List[Tuple[Column, Column]]) -> None:
+        """Destino de preenchimento que também é coluna de texto teria dois slots no mesmo endereço"""
+        sources = set(columns) | {src for _, src in fill}
+        overlap = [dest for dest, _ in fill if dest in sources]
+        if overlap:
+            raise ValueError("Colunas de destino também usadas como texto: "
+                             + ", ".join(str(c) for c in overlap))
+
+    @property
+    def selective(self) -> bool:
+        return bool(self.columns or self.fill)
+
+    def read(self, path: Path) -> CsvStreamDoc:
+        with open(path, 'rb') as f:
+            head = f.read(64 * 1024)
+        bom = head.startswith(b'\xef\xbb\xbf')
+        first_line = head.split(b'\n', 1)[0]
+        lineterminator = '\r\n' if first_line.endswith(b'\r') or b'\n' not in head else '\n'
+        return CsvStreamDoc(path, bom, lineterminator)
+
+    def _rows(self, doc: CsvStreamDoc) -> Iterator[List[str]]:
+        with open(doc.path, 'r', encoding='utf-8-sig', newline='') as f:
+            yield from csv.reader(f, delimiter=self.delimiter)
+
+    def _resolve(self, header: List[str], column: Column) -> int:
+        """Índice da coluna a partir do nome no cabeçalho (ou do próprio índice)"""
+        if isinstance(column, int):
+            return column
+        try:
+            return header.index(column)
+        except ValueError:
+            raise ValueError(f"Coluna não encontrada no cabeçalho: {column}") from None
+
+    def _plan(self, header: List[str]) -> Tuple[List[int], List[Tuple[int, int]]]:
+        """(colunas traduzidas no lugar, pares (destino, origem) de preenchimento)"""
+        columns = [self._resolve(header, c) for c in self.columns]
+        fill = [(self._resolve(header, dest), self._resolve(header, src))
+                for dest, src in self.fill.items()]
+        # Nome e índice da mesma coluna só se encontram depois de ler o cabeçalho
+        self._check_overlap(columns, fill)
+        return columns, fill
+
+    def slots(self, doc: CsvStreamDoc) -> Iterator[Slot]:
+        rows = self._rows(doc)
+        if not self.selective:
+            for r, row in enumerate(rows):
+                for c, cell in enumerate(row):
+                    yield Slot((r, c), cell)
+            return
+        columns, fill = self._plan(next(rows, []))
+        for r, row in enumerate(rows, start=1):
+            for c in columns:
+                if c < len(row):
+                    yield Slot((r, c), row[c])
+            for dest, src in fill:
+                if src < len(row) and row[src]:
+                    yield Slot((r, dest), row[src])
+
+    def apply(self, doc: CsvStreamDoc, translations: Dict[Address, str]) -> None:
+        doc.replacements.update(translations)
+
+    def write(self, path: Path, doc: CsvStreamDoc) -> None:
+        replacements = doc.replacements
+        tmp_path = Path(path).with_name(Path(path).name + '.tmp')
+        rows = self._rows(doc)
+        with open(tmp_path, 'w', encoding='utf-8-sig' if doc.bom else 'utf-8', newline='') as f:
+            writer = csv.writer(f, delimiter=self.delimiter, lineterminator=doc.lineterminator)
+            fill: List[Tuple[int, int]] = []
+            first = 0
+            if self.selective:
+                header = next(rows, None)
+                if header is not None:
+                    _, fill = self._plan(header)
+                    writer.writerow(header)
+                first = 1
+            for r, row in enumerate(rows, start=first):
+                for dest, src in fill:
+                    if src < len(row) and row[src]:
+                        if dest >= len(row):
+                            row.extend([''] * (dest + 1 - len(row)))
+                        row[dest] = row[src]
+                for c in range(len(row)):
+                    translated = replacements.get((r, c))
+                    if translated is not None:
+                        row[c] = translated
+                writer.writerow(row)
+        os.replace(tmp_path, path)
+
+
+class TsvAdapter(CsvAdapter):
+    """Igual ao CSV, separado por tabulação"""
+
+    format_name = 'TSV'
+    delimiter = '\t'
+
+
+def parse_column_spec(spec: str) -> Dict[str, Any]:
+    """
+    Seleção de colunas digitada pelo usuário, para CsvAdapter(**opções):
+    "text, description" traduz essas colunas; "pt=en" preenche a coluna pt com
+    a tradução da coluna en. Números são índices de coluna (a partir de 0).
+    """
+    columns: List[Column] = []
+    fill: Dict[Column, Column] = {}
+
+    def column(name: str) -> Column:
+        name = name.strip()
+        return int(name) if name.isdigit() else name
+
+    for item in re.split(r'[,;]', spec):
+        if not item.strip():
+            continue
+        if '=' in item:
+            dest, src = item.split('=', 1)
+            fill[column(dest)] = column(src)
+        else:
+            columns.append(column(item))
+    return {'columns': columns, 'fill': fill}
+
+
+class IniAdapter(FormatAdapter):
+    """Valores das seções, endereçados por (seção, chave)"""
+
+    format_name = 'INI'
+
+    def read(self, path: Path) -> configparser.ConfigParser:
+        config = configparser.ConfigParser()
+        config.read(path, encoding='utf-8')
+        return config
+
+    def slots(self, doc: configparser.ConfigParser) -> Iterator[Slot]:
+        for section in doc.sections():
+            for key in doc[section]:
+                yield Slot((section, key), doc[section][key])
+
+    def apply(self, doc: configparser.ConfigParser, translations: Dict[Address, str]) -> None:
+        for (section, key), translated in translations.items():
+            doc[section][key] = translated
+
+    def write(self, path: Path, doc: configparser.ConfigParser) -> None:
+        with open(path, 'w', encoding='utf-8') as f:
+            doc.write(f)
+
+
+FORMAT_ADAPTERS: Dict[str, Type[FormatAdapter]] = {
+    'YAML': YamlAdapter,
+    'JSON': JsonStreamAdapter,
+    'TOML': TomlAdapter,
+    'XML': XmlAdapter,
+    'TXT': TxtAdapter,
+    'CSV': CsvAdapter,
+    'TSV': TsvAdapter,
+    'INI': IniAdapter,
+}
+
+
+def get_adapter(format_type: str, **options: Any) -> FormatAdapter:
+    """Adaptador para o formato (nome usado em SUPPORTED_FORMATS), com opções do formato"""
+    try:
+        adapter_class = FORMAT_ADAPTERS[format_type]
+    except KeyError:
+        raise ValueError(f"Formato não suportado: {format_type}") from None
+    return adapter_class(**options)
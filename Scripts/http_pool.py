@@ -0,0 +1,228 @@
+"""
+Transporte HTTP com conexões persistentes (keep-alive) reaproveitadas.
+
+Cada origem (esquema + host + porta) tem um pool limitado de conexões
+http.client: uma requisição pega uma conexão livre (ou abre uma nova, até o
+limite), e a devolve ao pool quando a resposta foi lida por inteiro. Assim o
+TCP/TLS é negociado uma vez por conexão, não uma vez por texto. Com mais
+chamadas simultâneas do que conexões, as excedentes esperam uma conexão livre.
+HTTP/2 é opcional e depende do httpx (com h2) instalado.
+"""
+
+import http.client
+import socket
+import threading
+import time
+from dataclasses import dataclass, replace
+from typing import Dict, List, Mapping, NamedTuple, Optional, Tuple
+from urllib.parse import urlencode, urlsplit
+
+# httpx só é necessário para HTTP/2
+try:
+    import httpx
+    HTTPX_AVAILABLE = True
+except ImportError:
+    HTTPX_AVAILABLE = False
+
+DEFAULT_POOL_SIZE = 16
+DEFAULT_TIMEOUT = 15.0
+
+# Métodos que podem ser reenviados numa conexão nova se a reaproveitada tiver caído
+_IDEMPOTENT = frozenset(('GET', 'HEAD', 'PUT', 'DELETE', 'OPTIONS'))
+# Sinais de que o servidor fechou a conexão ociosa antes do nosso envio
+_STALE_ERRORS = (http.client.RemoteDisconnected, http.client.BadStatusLine,
+                 ConnectionResetError, BrokenPipeError, ConnectionAbortedError)
+
+
+class HttpResponse(NamedTuple):
+    """Resposta lida por inteiro"""
+    status: int
+    headers: Mapping[str, str]
+    body: bytes
+
+    def text(self, default_encoding: str = 'utf-8') -> str:
+        content_type = self.headers.get('Content-Type', '')
+        _, _, charset = content_type.partition('charset=')
+        return self.body.decode(charset.split(';')[0].strip() or default_encoding, errors='replace')
+
+
+@dataclass
+class PoolStats:
+    """Contadores de uso das conexões"""
+    requests: int = 0
+    opened: int = 0       # conexões novas (cada uma paga o handshake)
+    reused: int = 0       # requisições feitas numa conexão já aberta
+    stale: int = 0        # conexões reaproveitadas que o servidor já tinha fechado
+    waited: int = 0       # requisições que esperaram uma conexão livre
+    wait_seconds: float = 0.0
+
+    @property
+    def reuse_ratio(self) -> float:
+        return self.reused / self.requests if self.requests else 0.0
+
+    def add(self, other: 'PoolStats') -> None:
+        for name in self.__dataclass_fields__:
+            setattr(self, name, getattr(self, name) + getattr(other, name))
+
+
+class ConnectionPool:
+    """Conexões keep-alive para uma origem; seguro para várias threads"""
+
+    def __init__(self, scheme: str, host: str, port: Optional[int] = None,
+                 size: int = DEFAULT_POOL_SIZE, timeout: float = DEFAULT_TIMEOUT):
+        if scheme not in ('http', 'https'):
+            raise ValueError(f"Esquema não suportado: {scheme}")
+        self.scheme = scheme
+        self.host = host
+        self.port = port
+        self.size = size
+        self.timeout = timeout
+        self.stats = PoolStats()
+        self._slots = threading.BoundedSemaphore(size)
+        self._lock = threading.Lock()
+        # Pilha (LIFO): a conexão usada por último é a que menos risco tem de ter expirado
+        self._idle: List[http.client.HTTPConnection] = []
+
+    def _connect(self) -> http.client.HTTPConnection:
+        cls = http.client.HTTPSConnection if self.scheme == 'https' else http.client.HTTPConnection
+        conn = cls(self.host, self.port, timeout=self.timeout)
+        conn.connect()
+        # Sem Nagle: requisições pequenas saem na hora, sem esperar o ACK da anterior
+        conn.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        with self._lock:
+            self.stats.opened += 1
+        return conn
+
+    def _take(self) -> Tuple[http.client.HTTPConnection, bool]:
+        """Conexão livre (reaproveitada, True) ou nova (False); exige uma vaga já reservada"""
+        with self._lock:
+            if self._idle:
+                return self._idle.pop(), True
+        return self._connect(), False
+
+    def _give_back(self, conn: http.client.HTTPConnection) -> None:
+        with self._lock:
+            self._idle.append(conn)
+
+    def request(self, method: str, path: str, body: Optional[bytes] = None,
+                headers: Optional[Mapping[str, str]] = None,
+                idempotent: Optional[bool] = None) -> HttpResponse:
+        """
+        Envia a requisição numa conexão do pool e lê a resposta inteira.
+        idempotent=True permite reenviar um POST que só consulta (padrão: pelo método).
+        """
+        if idempotent is None:
+            idempotent = method in _IDEMPOTENT
+        if not self._slots.acquire(blocking=False):
+            start = time.monotonic()
+            self._slots.acquire()
+            with self._lock:
+                self.stats.waited += 1
+                self.stats.wait_seconds += time.monotonic() - start
+        try:
+            conn, reused = self._take()
+            while True:
+                try:
+                    conn.request(method, path, body=body, headers=dict(headers or {}))
+                    response = conn.getresponse()
+                    data = response.read()
+                except _STALE_ERRORS:
+                    conn.close()
+                    if not reused or not idempotent:
+                        raise
+                    # Conexão ociosa fechada pelo servidor: tenta uma vez numa nova
+                    with self._lock:
+                        self.stats.stale += 1
+                    conn, reused = self._connect(), False
+                    continue
+                except BaseException:
+                    conn.close()
+                    raise
+                break
+            with self._lock:
+                self.stats.requests += 1
+                self.stats.reused += reused
+            if response.will_close:
+                conn.close()
+            else:
+                self._give_back(conn)
+            return HttpResponse(response.status, response.headers, data)
+        finally:
+            self._slots.release()
+
+    def close(self) -> None:
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for conn in idle:
+            conn.close()
+
+
+class HttpTransport:
+    """Um pool por origem; todas as chamadas HTTP dos backends passam por aqui"""
+
+    def __init__(self, pool_size: int = DEFAULT_POOL_SIZE, timeout: float = DEFAULT_TIMEOUT,
+                 http2: bool = False):
+        self.pool_size = pool_size
+        self.timeout = timeout
+        self.http2 = http2
+        self._pools: Dict[Tuple[str, str, Optional[int]], ConnectionPool] = {}
+        self._lock = threading.Lock()
+        self._client = None
+        self._h2_stats = PoolStats()
+        if http2:
+            if not HTTPX_AVAILABLE:
+                raise ImportError("HTTP/2 requer o módulo 'httpx': pip install 'httpx[http2]'")
+            limits = httpx.Limits(max_connections=pool_size, max_keepalive_connections=pool_size)
+            self._client = httpx.Client(http2=True, limits=limits, timeout=timeout)
+
+    def _pool(self, scheme: str, host: str, port: Optional[int]) -> ConnectionPool:
+        key = (scheme, host, port)
+        pool = self._pools.get(key)
+        if pool is None:
+            with self._lock:
+                pool = self._pools.get(key)
+                if pool is None:
+                    pool = self._pools[key] = ConnectionPool(scheme, host, port,
+                                                             self.pool_size, self.timeout)
+        return pool
+
+    def request(self, method: str, url: str, params: Optional[Mapping[str, str]] = None,
+                body: Optional[bytes] = None,
+                headers: Optional[Mapping[str, str]] = None,
+                idempotent: Optional[bool] = None) -> HttpResponse:
+        if params:
+            url += ('&' if '?' in url else '?') + urlencode(params)
+        if self._client is not None:
+            # HTTP/2: uma conexão por origem, requisições multiplexadas pelo httpx
+            response = self._client.request(method, url, content=body, headers=headers)
+            with self._lock:
+                self._h2_stats.requests += 1
+            return HttpResponse(response.status_code, response.headers, response.content)
+        parts = urlsplit(url)
+        path = parts.path or '/'
+        if parts.query:
+            path += '?' + parts.query
+        return self._pool(parts.scheme, parts.hostname, parts.port).request(method, path, body, headers,
+                                                                           idempotent)
+
+    def get(self, url: str, params: Optional[Mapping[str, str]] = None,
+            headers: Optional[Mapping[str, str]] = None) -> HttpResponse:
+        return self.request('GET', url, params=params, headers=headers)
+
+    @property
+    def stats(self) -> PoolStats:
+        """Soma dos contadores de todos os pools (cópia)"""
+        total = replace(self._h2_stats)
+        with self._lock:
+            pools = list(self._pools.values())
+        for pool in pools:
+            total.add(pool.stats)
+        return total
+
+    def close(self) -> None:
+        with self._lock:
+            pools = list(self._pools.values())
+        for pool in pools:
+            pool.close()
+        if self._client is not None:
+            self._client.close()
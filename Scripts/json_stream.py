@@ -0,0 +1,146 @@
+"""
+Leitura incremental de JSON, token a token.
+
+O arquivo é lido em blocos e percorrido token a token, entregando só as
+strings que são valores, junto com o texto original desde a anterior. Assim
+a saída pode ser regravada idêntica ao original exceto pelas strings
+substituídas. A memória usada depende da profundidade de aninhamento, não
+do tamanho do arquivo. As strings são decodificadas pelo scanstring do
+módulo json (em C).
+"""
+
+import re
+from json.decoder import JSONDecodeError, scanstring
+from json.encoder import encode_basestring as encode_json_string  # C, sem escapar não-ASCII
+from typing import Any, Iterator, List, Optional, TextIO, Tuple
+
+CHUNK_SIZE = 1 << 20
+
+# Caminho até uma string (chaves e índices desde a raiz)
+Address = Tuple[Any, ...]
+
+_WS = re.compile(r'[ \t\n\r]*')
+_WS_CHARS = frozenset(' \t\n\r')
+# Atalho para o caso comum: chave sem escapes seguida de ':' numa única busca
+_SIMPLE_KEY = re.compile(r'"([^"\\\x00-\x1f]*)"[ \t\n\r]*:')
+_LITERAL = re.compile(r'-?(?:0|[1-9][0-9]*)(?:\.[0-9]+)?(?:[eE][-+]?[0-9]+)?'
+                      r'|true|false|null|NaN|-?Infinity')
+
+# Estados de um nível aberto: objeto esperando chave, objeto esperando valor, lista
+_KEY, _VALUE, _ITEM = range(3)
+
+
+def walk(f: TextIO, chunk_size: int = CHUNK_SIZE) -> Iterator[Tuple[Optional[Address], str, str, str]]:
+    """
+    Strings que são valores (não chaves), em ordem: (caminho, texto original
+    desde a string anterior, texto original da string, valor decodificado).
+    O último item é (None, resto do arquivo, '', ''), então juntar os dois
+    textos de todos os itens reproduz o arquivo exatamente. Num objeto, cada
+    membro entra no caminho como (chave, posição): chaves repetidas (JSON
+    aceito pelo módulo json, comum em mods) não dão o mesmo caminho, e nada
+    além da posição precisa ser guardado por nível.
+    """
+    buf = ''
+    pos = 0
+    gap_start = 0  # início do trecho ainda não entregue
+    pending: List[str] = []  # partes do trecho que vieram de blocos anteriores
+    consumed = 0  # caracteres já descartados do buffer (para mensagens de erro)
+    eof = False
+    path: List[Any] = []
+    frames: List[int] = []  # estado de cada nível aberto
+    members: List[int] = []  # posição do membro atual em cada nível (listas usam o caminho)
+
+    def more() -> bool:
+        nonlocal buf, pos, gap_start, consumed, eof
+        chunk = f.read(chunk_size)
+        if not chunk:
+            eof = True
+            return False
+        pending.append(buf[gap_start:pos])
+        buf = buf[pos:] + chunk
+        consumed += pos
+        pos = gap_start = 0
+        return True
+
+    def set_key(key: str) -> None:
+        members[-1] += 1
+        path[-1] = (key, members[-1])
+        frames[-1] = _VALUE
+
+    def error(at: int, message: str) -> ValueError:
+        return ValueError(f"JSON inválido na posição {consumed + at}: {message}")
+
+    more()
+    # BOM no início: mantido na saída, ignorado na análise
+    if buf.startswith('\ufeff'):
+        pos = 1
+
+    ws_match = _WS.match
+    while True:
+        start = ws_match(buf, pos).end() if buf[pos:pos + 1] in _WS_CHARS else pos
+        if start == len(buf):
+            if not eof and more():
+                continue
+            break
+        c = buf[start]
+        state = frames[-1] if frames else None
+
+        if c == '"':
+            if state == _KEY:
+                match = _SIMPLE_KEY.match(buf, start)
+                if match is not None:
+                    set_key(match.group(1))
+                    pos = match.end()
+                    continue
+            try:
+                value, end = scanstring(buf, start + 1)
+            except JSONDecodeError as e:
+                # String cortada no fim do bloco: lê mais e tenta de novo
+                if not eof and ('Unterminated' in e.msg or e.pos >= len(buf) - 6) and more():
+                    continue
+                raise error(e.pos, e.msg) from None
+            if state == _KEY:
+                set_key(value)  # chave do próximo valor
+            else:
+                pending.append(buf[gap_start:start])
+                gap = ''.join(pending)
+                pending.clear()
+                yield tuple(path), gap, buf[start:end], value
+                gap_start = end
+            pos = end
+            continue
+
+        if c == ',':
+            if state == _ITEM:
+                path[-1] += 1
+            elif state == _VALUE:
+                frames[-1] = _KEY
+        elif c == '{':
+            frames.append(_KEY)
+            members.append(-1)
+            path.append(None)
+        elif c == '[':
+            frames.append(_ITEM)
+            members.append(0)
+            path.append(0)
+        elif c in '}]':
+            if state is None or (c == ']') != (state == _ITEM):
+                raise error(start, f"{c!r} sem abertura correspondente")
+            frames.pop()
+            members.pop()
+            path.pop()
+        elif c != ':':
+            match = _LITERAL.match(buf, start)
+            # Perto do fim do bloco o literal pode continuar no próximo ("1.5|e3", "tr|ue")
+            if (match is None or len(buf) - match.end() < 8) and not eof and more():
+                continue
+            if match is None:
+                raise error(start, f"{c!r} inesperado")
+            pos = match.end()
+            continue
+        pos = start + 1
+
+    if frames:
+        raise error(len(buf), "fim do arquivo com estrutura aberta")
+    pending.append(buf[gap_start:])
+    yield None, ''.join(pending), '', ''
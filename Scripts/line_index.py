@@ -0,0 +1,118 @@
+"""
+Acesso a arquivos grandes por mmap, linha a linha.
+
+Em vez de transformar o arquivo numa lista de strings, o arquivo é mapeado
+em memória e as linhas são tratadas como intervalos de bytes. O LineIndex
+guarda só um array compacto com o offset de início de cada linha (8 bytes
+por linha); as linhas são decodificadas apenas quando precisam ser
+traduzidas e, na escrita, os trechos não alterados são copiados direto do
+mmap para o arquivo de saída, sem passar por str.
+"""
+
+import mmap
+import os
+from array import array
+from pathlib import Path
+from typing import BinaryIO, Dict, Iterator, Tuple
+
+BOM = b'\xef\xbb\xbf'
+
+
+class MappedFile:
+    """Arquivo somente leitura mapeado em memória (o conteúdo fica no cache do SO)"""
+
+    __slots__ = ('path', 'size', 'start', '_file', '_mm')
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._file = open(self.path, 'rb')
+        self.size = os.fstat(self._file.fileno()).st_size
+        # mmap não aceita arquivo vazio
+        self._mm = (mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+                    if self.size else None)
+        # Início do conteúdo (depois do BOM, se houver)
+        self.start = len(BOM) if self.size and self._mm[:len(BOM)] == BOM else 0
+
+    def lines(self) -> Iterator[Tuple[int, bytes]]:
+        """(offset, bytes) de cada linha, com a quebra de linha incluída"""
+        if self._mm is None:
+            return
+        mm = self._mm
+        mm.seek(self.start)
+        pos = self.start
+        # readline do mmap roda em C: bem mais rápido que find + fatia por linha
+        for line in iter(mm.readline, b''):
+            yield pos, line
+            pos += len(line)
+
+    @property
+    def data(self):
+        """O conteúdo mapeado (aceita fatias, find e regex de bytes sem copiar o arquivo)"""
+        return self._mm if self._mm is not None else b''
+
+    def slice(self, start: int, end: int) -> bytes:
+        return self._mm[start:end] if self._mm is not None else b''
+
+    def copy_to(self, dst: BinaryIO, start: int, end: int) -> None:
+        """Copia o trecho [start, end) para dst sem cópias intermediárias"""
+        if end <= start or self._mm is None:
+            return
+        with memoryview(self._mm) as view:
+            dst.write(view[start:end])
+
+    def close(self) -> None:
+        if self._mm is not None:
+            self._mm.close()
+            self._mm = None
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+class LineIndex(MappedFile):
+    """Arquivo mapeado + array com o offset de cada linha, para acesso aleatório"""
+
+    __slots__ = ('starts',)
+
+    def __init__(self, path: Path):
+        super().__init__(path)
+        self.starts = array('Q', (start for start, _ in self.lines()))
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    def span(self, i: int) -> Tuple[int, int]:
+        """(início, fim) da linha i, incluindo a quebra de linha"""
+        end = self.starts[i + 1] if i + 1 < len(self.starts) else self.size
+        return self.starts[i], end
+
+    def raw(self, i: int) -> bytes:
+        """Bytes da linha i, incluindo a quebra de linha"""
+        return self.slice(*self.span(i))
+
+    def text(self, i: int) -> str:
+        """Linha i decodificada, sem a quebra de linha"""
+        return self.raw(i).decode('utf-8').rstrip('\r\n')
+
+    def write(self, out_path: Path, replacements: Dict[int, bytes]) -> None:
+        """
+        Grava o arquivo trocando as linhas em 'replacements' (linha → bytes
+        novos, com a quebra de linha); o resto é copiado do original.
+        O BOM, se houver, é mantido. Grava num temporário e troca atomicamente.
+        """
+        out_path = Path(out_path)
+        tmp_path = out_path.with_name(out_path.name + '.tmp')
+        with open(tmp_path, 'wb') as dst:
+            self.copy_to(dst, 0, self.start)
+            pos = self.start
+            for i in sorted(replacements):
+                start, end = self.span(i)
+                self.copy_to(dst, pos, start)
+                dst.write(replacements[i])
+                pos = end
+            self.copy_to(dst, pos, self.size)
+        os.replace(tmp_path, out_path)
@@ -0,0 +1,303 @@
+"""
+Cache remoto compartilhado por várias máquinas (agentes de build).
+
+Um servidor pequeno na rede local guarda as traduções num SQLiteCacheStore e
+responde a consultas e gravações em lote (JSON):
+
+    POST /lookup   {"src", "dest", "texts": [...]}          → {"found": {texto: tradução}}
+    PUT  /entries  {"src", "dest", "translations": {...}}   → {"stored": n}
+    GET  /stats
+
+O cliente (RemoteCache) usa conexões keep-alive do http_pool, é consultado
+depois do cache local e antes do serviço de tradução, e devolve as traduções
+novas ao servidor em segundo plano. Com o servidor fora do ar, o tradutor
+segue só com o cache local (e tenta o servidor de novo depois de um tempo).
+
+    python Scripts/remote_cache.py --host 0.0.0.0 --port 8765
+"""
+
+import argparse
+import http.client
+import json
+import os
+import queue
+import threading
+import time
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from cache_store import KIND_IDENTITY, KIND_TRANSLATED, SQLiteCacheStore
+from http_pool import HttpTransport
+
+# Variável de ambiente com o endereço do servidor (ex.: "http://cache-build:8765")
+REMOTE_ENV_VAR = "UMT_REMOTE_CACHE"
+
+DEFAULT_PORT = 8765
+DEFAULT_TIMEOUT = 5.0
+# Textos por requisição (consulta ou gravação)
+DEFAULT_BATCH = 2000
+# Tamanho máximo de uma requisição aceita pelo servidor
+MAX_BODY = 32 << 20
+# Espera máxima de flush() pela thread de envio (segundos)
+FLUSH_TIMEOUT = 60.0
+
+# Só respostas do serviço vão para o cache remoto (falhas e ignorados são locais)
+_SHARED_KINDS = (KIND_TRANSLATED, KIND_IDENTITY)
+
+
+# ---------------------- Cliente ----------------------
+
+@dataclass
+class RemoteStats:
+    """Contadores do cliente"""
+    lookups: int = 0     # textos consultados
+    hits: int = 0
+    sent: int = 0        # traduções enviadas ao servidor
+    errors: int = 0      # requisições que falharam
+    dropped: int = 0     # traduções não enviadas (servidor fora do ar)
+
+    def __str__(self) -> str:
+        text = f"{self.hits}/{self.lookups} encontrados, {self.sent} enviados"
+        if self.errors:
+            text += f", {self.errors} erros ({self.dropped} não enviados)"
+        return text
+
+
+class _Flush:
+    """Marca na fila de envio: sinaliza quando tudo antes dela foi enviado"""
+
+    def __init__(self):
+        self.done = threading.Event()
+
+
+class RemoteCache:
+    """
+    Cliente do servidor de cache. As consultas são síncronas (em lotes); as
+    gravações entram numa fila e uma thread as envia em lotes.
+    """
+
+    def __init__(self, url: str, timeout: float = DEFAULT_TIMEOUT, pool_size: int = 4,
+                 batch: int = DEFAULT_BATCH, flush_interval: float = 1.0, retry_after: float = 30.0):
+        self.url = url.rstrip('/')
+        self.batch = batch
+        self.flush_interval = flush_interval
+        self.retry_after = retry_after
+        self.stats = RemoteStats()
+        self._transport = HttpTransport(pool_size=pool_size, timeout=timeout)
+        self._lock = threading.Lock()
+        self._down_until = 0.0
+        self._queue: "queue.SimpleQueue" = queue.SimpleQueue()
+        self._sender = threading.Thread(target=self._run, name="remote-cache-sender", daemon=True)
+        self._sender.start()
+
+    @property
+    def available(self) -> bool:
+        return time.monotonic() >= self._down_until
+
+    def _request(self, method: str, path: str, payload: dict) -> Optional[dict]:
+        """Requisição JSON; None (e servidor marcado como fora do ar por um tempo) se falhar"""
+        if not self.available:
+            return None
+        try:
+            response = self._transport.request(
+                method, self.url + path, body=json.dumps(payload, ensure_ascii=False).encode('utf-8'),
+                headers={'Content-Type': 'application/json'}, idempotent=True)
+            if response.status != 200:
+                raise OSError(f"HTTP {response.status}")
+            return json.loads(response.body.decode('utf-8'))
+        except (OSError, ValueError, http.client.HTTPException):
+            with self._lock:
+                self.stats.errors += 1
+                self._down_until = time.monotonic() + self.retry_after
+            return None
+
+    def get_many(self, src: str, dest: str, texts: List[str]) -> Dict[str, str]:
+        """Traduções que o servidor conhece; {} se ele estiver fora do ar"""
+        found: Dict[str, str] = {}
+        for i in range(0, len(texts), self.batch):
+            chunk = texts[i:i + self.batch]
+            result = self._request('POST', '/lookup', {'src': src, 'dest': dest, 'texts': chunk})
+            if result is None:
+                break
+            found.update(result.get('found', {}))
+        with self._lock:
+            self.stats.lookups += len(texts)
+            self.stats.hits += len(found)
+        return found
+
+    def put_many(self, src: str, dest: str, translations: Dict[str, str]) -> None:
+        """Agenda o envio das traduções (não espera o servidor)"""
+        if translations:
+            self._queue.put((src, dest, dict(translations)))
+
+    def _run(self) -> None:
+        """Thread de envio: junta as traduções por par de idiomas e envia em lotes"""
+        pending: Dict[Tuple[str, str], Dict[str, str]] = {}
+        count = 0
+        deadline = 0.0
+        while True:
+            try:
+                item = self._queue.get(timeout=max(0.0, deadline - time.monotonic()) if pending else None)
+            except queue.Empty:
+                item = None
+            if isinstance(item, tuple):
+                src, dest, translations = item
+                if not pending:
+                    deadline = time.monotonic() + self.flush_interval
+                pending.setdefault((src, dest), {}).update(translations)
+                count += len(translations)
+                if count < self.batch:
+                    continue
+            try:
+                self._send(pending)
+            except Exception:
+                # Erro inesperado: o lote se perde, mas a thread continua de pé
+                with self._lock:
+                    self.stats.errors += 1
+                    self.stats.dropped += count
+            finally:
+                pending = {}
+                count = 0
+                # Quem espera em flush() é liberado mesmo se o envio falhar
+                if isinstance(item, _Flush):
+                    item.done.set()
+
+    def _send(self, pending: Dict[Tuple[str, str], Dict[str, str]]) -> None:
+        for (src, dest), translations in pending.items():
+            items = list(translations.items())
+            for i in range(0, len(items), self.batch):
+                chunk = dict(items[i:i + self.batch])
+                result = self._request('PUT', '/entries',
+                                       {'src': src, 'dest': dest, 'translations': chunk})
+                with self._lock:
+                    if result is None:
+                        self.stats.dropped += len(chunk)
+                    else:
+                        self.stats.sent += len(chunk)
+
+    def flush(self, timeout: float = FLUSH_TIMEOUT) -> bool:
+        """Espera o envio de tudo o que foi agendado até agora (False se o prazo venceu)"""
+        if not self._sender.is_alive():
+            return False
+        marker = _Flush()
+        self._queue.put(marker)
+        return marker.done.wait(timeout)
+
+    def close(self) -> None:
+        self.flush()
+        self._transport.close()
+
+
+def remote_from_env() -> Optional[RemoteCache]:
+    """Cliente do servidor definido em UMT_REMOTE_CACHE (None se não houver)"""
+    url = os.environ.get(REMOTE_ENV_VAR, '').strip()
+    return RemoteCache(url) if url else None
+
+
+# ---------------------- Servidor ----------------------
+
+class CacheRequestHandler(BaseHTTPRequestHandler):
+    """Consultas e gravações em lote sobre o cache do servidor"""
+    protocol_version = 'HTTP/1.1'  # keep-alive: o cliente reaproveita a conexão
+    server: 'CacheServer'
+
+    def log_message(self, format: str, *args) -> None:
+        pass
+
+    def _reply(self, status: int, payload: dict) -> None:
+        body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _payload(self) -> Optional[dict]:
+        length = int(self.headers.get('Content-Length') or 0)
+        if length > MAX_BODY:
+            self.close_connection = True
+            self._reply(413, {'error': 'requisição grande demais'})
+            return None
+        try:
+            payload = json.loads(self.rfile.read(length).decode('utf-8'))
+        except ValueError:
+            payload = None
+        if (not isinstance(payload, dict) or not isinstance(payload.get('src'), str)
+                or not isinstance(payload.get('dest'), str)):
+            self._reply(400, {'error': 'JSON inválido'})
+            return None
+        # Formato de cada rota: texts = [str], translations = {str: str}
+        texts = payload.setdefault('texts', [])
+        translations = payload.setdefault('translations', {})
+        if (not isinstance(texts, list) or not all(isinstance(t, str) for t in texts)
+                or not isinstance(translations, dict)
+                or not all(isinstance(v, str) for v in translations.values())):
+            self._reply(400, {'error': "'texts' deve ser uma lista de textos e "
+                                       "'translations' um objeto de textos"})
+            return None
+        return payload
+
+    def do_POST(self) -> None:
+        if self.path != '/lookup':
+            self._reply(404, {'error': 'não encontrado'})
+            return
+        payload = self._payload()
+        if payload is None:
+            return
+        entries = self.server.store.lookup_many(payload['src'], payload['dest'], payload['texts'])
+        self._reply(200, {'found': {text: entry.value for text, entry in entries.items()
+                                    if entry.kind in _SHARED_KINDS}})
+
+    def do_PUT(self) -> None:
+        if self.path != '/entries':
+            self._reply(404, {'error': 'não encontrado'})
+            return
+        payload = self._payload()
+        if payload is None:
+            return
+        translations = payload['translations']
+        self.server.store.put_many(payload['src'], payload['dest'], translations)
+        self._reply(200, {'stored': len(translations)})
+
+    def do_GET(self) -> None:
+        if self.path != '/stats':
+            self._reply(404, {'error': 'não encontrado'})
+            return
+        stats = self.server.store.stats
+        self._reply(200, {'hits': stats.hits, 'misses': stats.misses, 'inserts': stats.inserts})
+
+
+class CacheServer(ThreadingHTTPServer):
+    """Servidor HTTP do cache (uma thread por conexão)"""
+    daemon_threads = True
+
+    def __init__(self, address: Tuple[str, int], store: SQLiteCacheStore):
+        super().__init__(address, CacheRequestHandler)
+        self.store = store
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Servidor de cache de traduções compartilhado")
+    parser.add_argument('--host', default='127.0.0.1', help="endereço (0.0.0.0 para a rede local)")
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT)
+    parser.add_argument('--cache', type=Path,
+                        default=Path(__file__).parent.parent / "Cache" / "remote_translations_cache.sqlite3",
+                        help="arquivo SQLite do servidor")
+    args = parser.parse_args(argv)
+    store = SQLiteCacheStore(args.cache)
+    server = CacheServer((args.host, args.port), store)
+    print(f"🌐 Cache remoto em http://{args.host}:{args.port} ({args.cache})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        store.close()
+        print(f"   • {store.stats}")
+
+
+if __name__ == '__main__':
+    main()
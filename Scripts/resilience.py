@@ -0,0 +1,176 @@
+"""
+Controle de ritmo e retry compartilhados por todas as chamadas ao serviço.
+
+- TokenBucket / RateLimiter: orçamento de requisições/s e caracteres/s único
+  para o processo inteiro (threads e event loop usam o mesmo limitador).
+- BackoffPolicy: espera exponencial com "full jitter" e respeito ao
+  Retry-After, para que as threads não repitam as tentativas em sincronia.
+- CircuitBreaker: com o serviço fora do ar, para de enviar requisições e
+  falha na hora, testando de tempos em tempos se ele voltou.
+"""
+
+import asyncio
+import random
+import threading
+import time
+from typing import Callable, Dict, Optional, Tuple
+
+
+class TokenBucket:
+    """Balde de fichas thread-safe com reserva antecipada"""
+
+    def __init__(self, rate: float, capacity: Optional[float] = None,
+                 clock: Callable[[], float] = time.monotonic):
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(rate, 1.0)
+        self._clock = clock
+        self._tokens = self.capacity
+        self._last = clock()
+        self._lock = threading.Lock()
+
+    def reserve(self, tokens: float = 1.0) -> float:
+        """Reserva as fichas agora e retorna quantos segundos esperar para usá-las"""
+        with self._lock:
+            now = self._clock()
+            self._tokens = min(self.capacity, self._tokens + (now - self._last) * self.rate)
+            self._last = now
+            # O saldo pode ficar negativo: quem reservar depois espera a dívida
+            self._tokens -= tokens
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self.rate
+
+
+class RateLimiter:
+    """Limites de requisições/s e caracteres/s compartilhados pelo processo"""
+
+    def __init__(self, requests_per_second: float = 0.0, chars_per_second: float = 0.0,
+                 clock: Callable[[], float] = time.monotonic):
+        self._clock = clock
+        self.requests = TokenBucket(requests_per_second, clock=clock) if requests_per_second > 0 else None
+        self.chars = TokenBucket(chars_per_second, clock=clock) if chars_per_second > 0 else None
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def pause(self, seconds: Optional[float]) -> None:
+        """Retry-After recebido: ninguém envia nada até o prazo acabar"""
+        if not seconds:
+            return
+        with self._lock:
+            self._paused_until = max(self._paused_until, self._clock() + seconds)
+
+    def reserve(self, chars: int = 0) -> float:
+        """Reserva uma requisição de 'chars' caracteres; retorna a espera necessária"""
+        wait = 0.0
+        if self.requests is not None:
+            wait = max(wait, self.requests.reserve(1))
+        if self.chars is not None and chars:
+            wait = max(wait, self.chars.reserve(chars))
+        with self._lock:
+            wait = max(wait, self._paused_until - self._clock())
+        return wait
+
+    def acquire(self, chars: int = 0) -> None:
+        """Bloqueia a thread até a requisição caber no orçamento"""
+        wait = self.reserve(chars)
+        if wait > 0:
+            time.sleep(wait)
+
+    async def aacquire(self, chars: int = 0) -> None:
+        """Versão assíncrona de acquire (não bloqueia o event loop)"""
+        wait = self.reserve(chars)
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+
+_shared_limiters: Dict[Tuple[str, float, float], RateLimiter] = {}
+_shared_lock = threading.Lock()
+
+
+def shared_rate_limiter(name: str, requests_per_second: float = 0.0,
+                        chars_per_second: float = 0.0) -> RateLimiter:
+    """Retorna o limitador único do processo para o serviço 'name' com esses limites"""
+    key = (name, requests_per_second, chars_per_second)
+    with _shared_lock:
+        if key not in _shared_limiters:
+            _shared_limiters[key] = RateLimiter(requests_per_second, chars_per_second)
+        return _shared_limiters[key]
+
+
+class BackoffPolicy:
+    """Backoff exponencial com full jitter e respeito ao Retry-After"""
+
+    def __init__(self, retries: int = 3, base_delay: float = 0.3, factor: float = 1.8,
+                 max_delay: float = 30.0, rng: Optional[random.Random] = None):
+        self.retries = retries
+        self.base_delay = base_delay
+        self.factor = factor
+        self.max_delay = max_delay
+        self._rng = rng or random.Random()
+
+    def delay(self, attempt: int, retry_after: Optional[float] = None) -> float:
+        """Espera antes da tentativa attempt+1: uniforme em [0, base·factor^attempt]"""
+        ceiling = min(self.max_delay, self.base_delay * self.factor ** attempt)
+        wait = self._rng.uniform(0.0, ceiling)
+        if retry_after:
+            wait = max(wait, min(retry_after, self.max_delay))
+        return wait
+
+
+DEFAULT_BACKOFF = BackoffPolicy()
+
+
+class CircuitBreaker:
+    """Disjuntor: abre após falhas seguidas e deixa passar uma sonda por vez depois do prazo"""
+
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+    def __init__(self, failure_threshold: int = 10, reset_timeout: float = 30.0,
+                 clock: Callable[[], float] = time.monotonic):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self.failures = 0
+        self.times_opened = 0
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+        self._clock = clock
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        """Pode enviar uma requisição agora?"""
+        with self._lock:
+            if self.state == self.CLOSED:
+                return True
+            if self.state == self.OPEN:
+                if self._clock() - self._opened_at < self.reset_timeout:
+                    return False
+                self.state = self.HALF_OPEN
+            # Meio aberto: só uma sonda de cada vez
+            if self._probe_in_flight:
+                return False
+            self._probe_in_flight = True
+            return True
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.state = self.CLOSED
+            self.failures = 0
+            self._probe_in_flight = False
+
+    def release(self) -> None:
+        """Devolve a vaga da sonda sem resultado (requisição cancelada ou interrompida)"""
+        with self._lock:
+            self._probe_in_flight = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._probe_in_flight = False
+            self.failures += 1
+            if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+                if self.state != self.OPEN:
+                    self.times_opened += 1
+                self.state = self.OPEN
+                self._opened_at = self._clock()
@@ -0,0 +1,109 @@
+"""
+Cache único do tradutor do Valheim (CLI) e do tradutor universal (GUI).
+
+As duas ferramentas abrem o mesmo banco (chave origem + destino + texto), então
+um texto traduzido por uma não é pago de novo pela outra. Na abertura, os caches
+antigos de cada ferramenta (JSON e SQLite) entram uma única vez; o
+translations.yaml já gerado entra uma vez por versão do arquivo. A leitura
+também é a mesma: lookup_cached descarta os "ignorados" gravados sob as regras
+de outra ferramenta.
+"""
+
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional
+
+from cache_store import KIND_SKIPPED, CacheEntry, EvictionPolicy, SQLiteCacheStore
+from collected_yaml import iter_entries
+from skip_rules import SkipRules
+
+SHARED_CACHE_NAME = "shared_translations_cache.sqlite3"
+
+# Par de idiomas do cache antigo do Valheim (chaveado só pelo texto)
+VALHEIM_SRC = 'en'
+VALHEIM_DEST = 'pt'
+
+# Caches de cada ferramenta antes do cache único
+LEGACY_STORES = ("universal_translations_cache.sqlite3", "translations_cache.sqlite3")
+LEGACY_UNIVERSAL_JSON = "universal_translations_cache.json"
+LEGACY_VALHEIM_JSON = "translations_cache.json"
+
+
+def open_shared_cache(cache_dir: Path, eviction: Optional[EvictionPolicy] = None,
+                      log: Optional[Callable[[str], None]] = None) -> SQLiteCacheStore:
+    """Abre o cache único da pasta e importa os caches antigos que ainda não entraram"""
+    cache_dir = Path(cache_dir)
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    store = SQLiteCacheStore(cache_dir / SHARED_CACHE_NAME, eviction=eviction)
+    imported = import_legacy(store, cache_dir)
+    if imported and log is not None:
+        log(f"   ✓ Caches antigos incorporados ao cache único: {imported} entradas")
+    return store
+
+
+def import_legacy(store: SQLiteCacheStore, cache_dir: Path) -> int:
+    """Caches antigos das duas ferramentas (cada arquivo uma vez só); retorna quantas entradas vieram"""
+    cache_dir = Path(cache_dir)
+    total = 0
+    for name in LEGACY_STORES:
+        total += store.import_store(cache_dir / name)
+    total += store.migrate_json(cache_dir / LEGACY_UNIVERSAL_JSON)
+    total += store.migrate_json(cache_dir / LEGACY_VALHEIM_JSON, VALHEIM_SRC, VALHEIM_DEST)
+    return total
+
+
+def _signature(path: Path) -> str:
+    stat = path.stat()
+    return f"{stat.st_size}:{stat.st_mtime_ns}"
+
+
+def import_yaml_translations(store: SQLiteCacheStore, path: Path, src: str = VALHEIM_SRC,
+                             dest: str = VALHEIM_DEST, batch: int = 5000) -> int:
+    """
+    Incorpora um translations.yaml ("original: tradução") sem sobrescrever o
+    cache. Lido em streaming e só quando o arquivo mudou desde a última vez.
+    """
+    path = Path(path)
+    if not path.exists():
+        return 0
+    marker = f"imported:{path.name}"
+    signature = _signature(path)
+    if store.meta(marker) == signature:
+        return 0
+    total = 0
+    found: Dict[str, str] = {}
+    try:
+        for key, value in iter_entries(str(path)):
+            if key and value and key != value:
+                found.setdefault(key, value)
+            if len(found) >= batch:
+                total += store.put_missing(src, dest, found)
+                found = {}
+    except (OSError, UnicodeDecodeError):
+        return total
+    total += store.put_missing(src, dest, found)
+    store.set_meta(marker, signature)
+    return total
+
+
+def mark_imported(store: SQLiteCacheStore, path: Path) -> None:
+    """Registra um arquivo gerado a partir do cache, para não ser relido na próxima abertura"""
+    path = Path(path)
+    if path.exists():
+        store.set_meta(f"imported:{path.name}", _signature(path))
+
+
+def lookup_cached(store: SQLiteCacheStore, src: str, dests: List[str], texts: Iterable[str],
+                  skip_rules: SkipRules) -> Dict[str, Dict[str, CacheEntry]]:
+    """
+    Resultados válidos do cache por idioma. Um "ignorado" só vale se as regras
+    de quem consulta também ignoram o texto (cada ferramenta tem seu perfil).
+    """
+    found = store.lookup_targets(src, dests, texts)
+    skipped = [text for entries in found.values()
+               for text, entry in entries.items() if entry.kind == KIND_SKIPPED]
+    if skipped:
+        agreed = skip_rules.skipped(skipped)
+        for entries in found.values():
+            for text in [t for t, e in entries.items() if e.kind == KIND_SKIPPED and t not in agreed]:
+                del entries[text]
+    return found
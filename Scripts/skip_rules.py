@@ -0,0 +1,181 @@
+"""
+Regras de "não traduzir" (ids técnicos, números, URLs...) por jogo.
+
+Cada perfil é um conjunto de regras simples (tamanho mínimo, prefixos,
+sufixos, trechos, regex) compilado uma vez em tuplas e regex prontas; um
+texto é classificado com poucas chamadas em C, em lote ou um a um (com o
+veredito memorizado). Os perfis embutidos podem
+ser estendidos ou sobrescritos por Config/skip_rules.json:
+
+    {
+      "rimworld": {"extends": "default", "prefixes": ["Rim_"], "patterns": ["[A-Z]\\w+Def"]}
+    }
+"""
+
+import json
+import os
+import re
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional, Pattern, Set
+
+# Arquivo de perfis do usuário (opcional), na raiz do projeto
+RULES_FILE = Path(__file__).parent.parent / "Config" / "skip_rules.json"
+# Variável de ambiente com o perfil a usar
+PROFILE_ENV_VAR = "UMT_SKIP_PROFILE"
+
+# Campos de um perfil; listas são somadas ao estender outro perfil
+PROFILE_FIELDS = {
+    'strip': True,            # aplica as regras ao texto sem espaços nas pontas
+    'min_length': 0,          # textos menores são ignorados
+    'numeric': False,         # só dígitos (e pontos)
+    'contains': [],           # trechos em qualquer posição (URLs, caminhos...)
+    'prefixes': [],
+    'suffixes': [],
+    'id_underscores': 0,      # ids com pelo menos N '_' e só [\w-[]] (0 = desligado)
+    'patterns': [],           # regex que precisam casar o texto inteiro
+}
+
+# Prefixos/sufixos técnicos comuns (valem nas duas pontas)
+_TECH_AFFIXES = ['piece_', 'rae_', 'sapling_', 'Pickable_', 'IG_', '_TW', '_id', '_ID', 'config_', 'mod_']
+
+BUILTIN_PROFILES: Dict[str, Dict[str, Any]] = {
+    # Regras do tradutor universal
+    'default': {
+        'min_length': 2,
+        'numeric': True,
+        'contains': ['http://', 'https://', 'www.', '@', 'C:\\', '/'],
+        'prefixes': _TECH_AFFIXES,
+        'suffixes': _TECH_AFFIXES,
+        'id_underscores': 2,
+    },
+    # Chaves do collected_items.yaml do Valheim
+    'valheim': {
+        'strip': False,       # a chave chega já sem as aspas; espaços dentro delas contam
+        'min_length': 3,
+        'prefixes': ['$', 'piece_', 'rae_', 'Ymir', 'RuneSphere_', 'IG_', 'sapling_', 'Pickable_',
+                     'PineTree_', 'Ashwood_', 'Yagluth'],
+        'suffixes': ['_TW'],
+        'id_underscores': 2,
+    },
+}
+
+# Vereditos memorizados por instância; acima disso a memória é reiniciada
+_MAX_MEMO = 1 << 20
+
+
+class SkipRules:
+    """Regras de um perfil compiladas; should_skip(texto) → bool, skipped(textos) → set"""
+
+    def __init__(self, profile: Dict[str, Any], name: str = 'custom'):
+        self.name = name
+        self.profile = {key: profile.get(key, default) for key, default in PROFILE_FIELDS.items()}
+        self._compile(self.profile)
+        self._memo: Dict[str, bool] = {}
+
+    def _compile(self, profile: Dict[str, Any]) -> None:
+        """
+        Prefixos/sufixos viram tuplas para startswith/endswith (em C); os
+        trechos, uma alternância de literais para search(); números e ids,
+        isdigit e uma regex ancorada; os padrões do perfil, outra regex.
+        """
+        def words(items: Iterable[str]) -> str:
+            # Mais longos primeiro: a alternância para na primeira que casar
+            return '|'.join(re.escape(w) for w in sorted(set(items), key=len, reverse=True))
+
+        self._strip = profile['strip']
+        self._min_length = profile['min_length']
+        self._prefixes = tuple(profile['prefixes'])
+        self._suffixes = tuple(profile['suffixes'])
+        self._contains: Optional[Pattern] = (re.compile(words(profile['contains']))
+                                             if profile['contains'] else None)
+        self._numeric = profile['numeric']
+        # Ids: primeiro confirma o alfabeto, depois conta os '_'
+        self._tokens: Optional[Pattern] = (
+            re.compile(r'(?=[\w\-\[\]]+\Z)(?:[^_]*_){%d}' % profile['id_underscores'])
+            if profile['id_underscores'] > 0 else None)
+        self._patterns: Optional[Pattern] = (
+            re.compile('|'.join('(?:%s)' % p for p in profile['patterns']), re.DOTALL)
+            if profile['patterns'] else None)
+
+    def should_skip(self, text: str) -> bool:
+        """Verifica se o texto deve ser ignorado (veredito memorizado)"""
+        if not text or not isinstance(text, str):
+            return True
+        verdict = self._memo.get(text)
+        if verdict is None:
+            verdict = bool(self.skipped((text,)))
+            if len(self._memo) >= _MAX_MEMO:
+                self._memo.clear()
+            self._memo[text] = verdict
+        return verdict
+
+    def skipped(self, texts: Iterable[str]) -> Set[str]:
+        """
+        Classifica vários textos de uma vez; retorna os que devem ser ignorados.
+        Sem memória: quem chama já passa textos únicos, e guardar um milhão de
+        vereditos custaria mais que recalcular.
+        """
+        # Regras em variáveis locais: o laço roda quase só em chamadas C
+        min_length, prefixes, suffixes = self._min_length, self._prefixes, self._suffixes
+        strip, numeric = self._strip, self._numeric
+        contains = self._contains.search if self._contains is not None else None
+        tokens = self._tokens.match if self._tokens is not None else None
+        patterns = self._patterns.fullmatch if self._patterns is not None else None
+        result: Set[str] = set()
+        add = result.add
+        for text in texts:
+            if not text or not isinstance(text, str):
+                add(text)
+                continue
+            s = text.strip() if strip else text
+            if (len(s) < min_length or not s
+                    or s.startswith(prefixes) or s.endswith(suffixes)
+                    or (contains is not None and contains(s) is not None)
+                    # Números e ids nunca têm espaço: texto comum não chega às regex
+                    or (' ' not in s and ((numeric and s.replace('.', '').isdigit())
+                                          or (tokens is not None and tokens(s) is not None)))
+                    or (patterns is not None and patterns(s) is not None)):
+                add(text)
+        return result
+
+
+def load_profiles(path: Path = RULES_FILE) -> Dict[str, Dict[str, Any]]:
+    """Perfis embutidos + os do arquivo de configuração (se existir)"""
+    profiles = {name: dict(rules) for name, rules in BUILTIN_PROFILES.items()}
+    if path.exists():
+        with open(path, 'r', encoding='utf-8') as f:
+            custom = json.load(f)
+        for name, rules in custom.items():
+            unknown = set(rules) - set(PROFILE_FIELDS) - {'extends'}
+            if unknown:
+                raise ValueError(f"Perfil '{name}': campos desconhecidos {sorted(unknown)}")
+            profiles[name] = dict(rules)
+    return profiles
+
+
+def _resolve(name: str, profiles: Dict[str, Dict[str, Any]], seen: Set[str]) -> Dict[str, Any]:
+    """Perfil com a herança ('extends') aplicada"""
+    if name not in profiles:
+        raise ValueError(f"Perfil de regras desconhecido: {name}")
+    if name in seen:
+        raise ValueError(f"Herança circular no perfil: {name}")
+    rules = profiles[name]
+    base_name = rules.get('extends')
+    if not base_name:
+        return rules
+    merged = dict(_resolve(base_name, profiles, seen | {name}))
+    for key, value in rules.items():
+        if key == 'extends':
+            continue
+        merged[key] = merged.get(key, []) + value if isinstance(value, list) else value
+    return merged
+
+
+def load_rules(name: str = 'default', path: Path = RULES_FILE) -> SkipRules:
+    """Compila o perfil 'name' (embutido ou do arquivo de configuração)"""
+    return SkipRules(_resolve(name, load_profiles(path), set()), name)
+
+
+def rules_from_env(default: str = 'default') -> SkipRules:
+    """Compila o perfil definido em UMT_SKIP_PROFILE (ou o padrão)"""
+    return load_rules(os.environ.get(PROFILE_ENV_VAR, default))
@@ -0,0 +1,60 @@
+"""
+Agrupamento de vários textos curtos numa única requisição de tradução.
+
+Os textos são unidos por quebra de linha (o Google Translate preserva as
+quebras de linha do texto de entrada), respeitando o limite de caracteres do
+backend. A resposta é dividida de volta e validada; apenas os grupos que
+voltam desalinhados são retraduzidos texto a texto (pelo AsyncTranslationEngine,
+que faz as requisições).
+"""
+
+from typing import List, Optional
+
+from translation_backends import BackendLimits
+
+
+class TextPacker:
+    """Empacota textos curtos em requisições únicas e desempacota o resultado"""
+
+    SEPARATOR = "\n"
+
+    def __init__(self, max_chars: int = 5000, max_items: int = 100):
+        self.max_chars = max_chars
+        self.max_items = max_items
+
+    @classmethod
+    def for_limits(cls, limits: BackendLimits) -> "TextPacker":
+        """Cria um empacotador respeitando os limites declarados pelo backend"""
+        return cls(limits.max_chars_per_request, limits.max_items_per_request)
+
+    def can_pack(self, text: str) -> bool:
+        """Textos com quebras de linha ou espaços nas bordas vão sozinhos"""
+        return (self.SEPARATOR not in text and text == text.strip()
+                and len(text) < self.max_chars)
+
+    def pack(self, texts: List[str]) -> List[List[str]]:
+        """Divide os textos em grupos que cabem numa requisição cada"""
+        packs: List[List[str]] = []
+        current: List[str] = []
+        size = 0
+        for text in texts:
+            if not self.can_pack(text):
+                packs.append([text])
+                continue
+            extra = len(text) + (len(self.SEPARATOR) if current else 0)
+            if current and (size + extra > self.max_chars or len(current) >= self.max_items):
+                packs.append(current)
+                current, size = [], 0
+                extra = len(text)
+            current.append(text)
+            size += extra
+        if current:
+            packs.append(current)
+        return packs
+
+    def split(self, pack: List[str], translated: str) -> Optional[List[str]]:
+        """Desfaz o agrupamento; retorna None se a resposta veio desalinhada"""
+        parts = [part.strip() for part in translated.strip(self.SEPARATOR).split(self.SEPARATOR)]
+        if len(parts) != len(pack) or not all(parts):
+            return None
+        return parts
@@ -0,0 +1,512 @@
+"""
+Backends de tradução intercambiáveis.
+
+Tanto o ValheiMTranslator quanto o UniversalModTranslator falam com o
+serviço de tradução apenas através de um TranslationBackend. Isso permite
+trocar o Google Translate por um simulador local (latência, erros e
+throttling configuráveis) ou por um backend de gravação/reprodução, para
+testar concorrência e tamanho de lote sem rede.
+
+Seleção por variável de ambiente (formato "nome:chave=valor,chave=valor"):
+
+    UMT_BACKEND=google
+    UMT_BACKEND=simulated:latency=lognormal,mean_ms=150,error_rate=0.02
+    UMT_BACKEND=record:path=Cache/gravacao.jsonl
+    UMT_BACKEND=replay:path=Cache/gravacao.jsonl,replay_latency=1
+    UMT_BACKEND=google:rps=5,cps=20000
+    UMT_BACKEND=google:pool=32,timeout=10,http2=1
+"""
+
+import asyncio
+import html
+import json
+import math
+import os
+import random
+import re
+import threading
+import time
+from concurrent.futures import Executor
+from dataclasses import dataclass
+from typing import Callable, Dict, Optional, Tuple
+from urllib.parse import urljoin
+
+from http_pool import DEFAULT_POOL_SIZE, DEFAULT_TIMEOUT, HttpTransport, PoolStats
+from resilience import CircuitBreaker, RateLimiter, shared_rate_limiter
+
+# deep-translator é opcional: só entra quando a página do Google não pôde ser lida
+try:
+    from deep_translator import GoogleTranslator
+    DEEP_TRANSLATOR_AVAILABLE = True
+except ImportError:
+    DEEP_TRANSLATOR_AVAILABLE = False
+
+BACKEND_ENV_VAR = "UMT_BACKEND"
+
+
+class BackendError(Exception):
+    """Falha ao chamar o serviço de tradução"""
+
+
+class CircuitOpenError(BackendError):
+    """O disjuntor está aberto: a requisição nem chegou a ser enviada"""
+
+
+class ThrottledError(BackendError):
+    """O serviço recusou a requisição por excesso de uso (HTTP 429)"""
+
+    def __init__(self, message: str = "Too Many Requests", retry_after: Optional[float] = None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+@dataclass(frozen=True)
+class BackendLimits:
+    """Limites declarados por um backend"""
+    max_chars_per_request: int = 5000
+    # Quantos textos curtos podem ser agrupados numa única requisição
+    max_items_per_request: int = 100
+    # Ritmo máximo sustentado (0 = sem limite)
+    requests_per_second: float = 0.0
+    chars_per_second: float = 0.0
+
+
+class TranslationBackend:
+    """Interface comum dos backends de tradução"""
+
+    name = "base"
+    limits = BackendLimits()
+    # True quando atranslate() não precisa de uma thread por requisição
+    native_async = False
+    # Conexões HTTP disponíveis (0 = sem limite); mais requisições simultâneas só esperariam
+    max_connections = 0
+
+    def translate(self, text: str, src_lang: str, dest_lang: str) -> str:
+        """Traduz um único texto (levanta BackendError em caso de falha)"""
+        raise NotImplementedError
+
+    async def atranslate(self, text: str, src_lang: str, dest_lang: str,
+                         executor: Optional[Executor] = None) -> str:
+        """Versão assíncrona; por padrão executa translate() numa thread do executor"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(executor, self.translate, text, src_lang, dest_lang)
+
+    def connection_stats(self) -> Optional[PoolStats]:
+        """Uso das conexões HTTP (None para backends sem rede)"""
+        return None
+
+
+class GoogleBackend(TranslationBackend):
+    """
+    Google Translate (página móvel) através do pool de conexões keep-alive.
+    Redirecionamentos são seguidos; se a página não trouxer a tradução (página
+    de consentimento, layout novo), usa o deep-translator quando instalado.
+    """
+
+    name = "google"
+    limits = BackendLimits(max_chars_per_request=5000, requests_per_second=10.0,
+                           chars_per_second=50000.0)
+
+    URL = "https://translate.google.com/m"
+    # A página móvel só traz o resultado no HTML simples para navegadores conhecidos
+    USER_AGENT = ("Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+                  "(KHTML, like Gecko) Chrome/120.0 Safari/537.36")
+    MAX_REDIRECTS = 5
+    # Elemento com a tradução na página de resposta (o segundo é o formato antigo)
+    _RESULT = re.compile(r'<div class="(?:t0|result-container)">(.*?)</div>', re.DOTALL)
+    _TAG = re.compile(r'<[^>]+>')
+    _REDIRECTS = (301, 302, 303, 307, 308)
+
+    def __init__(self, url: str = URL, pool: int = DEFAULT_POOL_SIZE,
+                 timeout: float = DEFAULT_TIMEOUT, http2: bool = False, fallback: bool = True):
+        self.url = url
+        # Uma conexão por requisição em voo: o motor não passa desse limite
+        self.max_connections = int(pool)
+        self.transport = HttpTransport(int(pool), float(timeout), bool(http2))
+        self.fallback = bool(fallback) and DEEP_TRANSLATOR_AVAILABLE
+
+    def _fetch(self, text: str, src_lang: str, dest_lang: str) -> str:
+        """HTML da página de resposta, seguindo redirecionamentos"""
+        url = self.url
+        params: Optional[Dict[str, str]] = {'sl': src_lang, 'tl': dest_lang, 'q': text}
+        headers = {'User-Agent': self.USER_AGENT}
+        for _ in range(self.MAX_REDIRECTS + 1):
+            try:
+                response = self.transport.get(url, params, headers=headers)
+            except Exception as e:
+                raise BackendError(f"Falha de conexão: {e}") from e
+            if response.status in self._REDIRECTS:
+                location = response.headers.get('Location')
+                if not location:
+                    raise BackendError(f"HTTP {response.status} sem Location")
+                # O destino já traz a consulta inteira
+                url, params = urljoin(url, location), None
+                continue
+            if response.status == 429:
+                try:
+                    retry_after: Optional[float] = float(response.headers.get('Retry-After', ''))
+                except ValueError:
+                    retry_after = None  # ausente ou em formato de data
+                raise ThrottledError(retry_after=retry_after)
+            if response.status >= 300:
+                raise BackendError(f"HTTP {response.status}")
+            return response.text()
+        raise BackendError(f"Mais de {self.MAX_REDIRECTS} redirecionamentos")
+
+    def translate(self, text: str, src_lang: str, dest_lang: str) -> str:
+        if not text.strip():
+            return text
+        page = self._fetch(text, src_lang, dest_lang)
+        match = self._RESULT.search(page)
+        if match is None:
+            # Erro comum (nova tentativa depois), nunca uma tradução vazia
+            if self.fallback:
+                return self._translate_fallback(text, src_lang, dest_lang)
+            raise BackendError("Tradução não encontrada na resposta")
+        translated = html.unescape(self._TAG.sub('', match.group(1))).strip()
+        if not translated:
+            raise BackendError("Resposta sem tradução")
+        return translated
+
+    @staticmethod
+    def _translate_fallback(text: str, src_lang: str, dest_lang: str) -> str:
+        try:
+            translated = GoogleTranslator(source=src_lang, target=dest_lang).translate(text)
+        except Exception as e:
+            raise BackendError(f"deep-translator: {e}") from e
+        if not translated:
+            raise BackendError("deep-translator: resposta vazia")
+        return translated
+
+    def connection_stats(self) -> Optional[PoolStats]:
+        return self.transport.stats
+
+
+def pseudo_translate(text: str, src_lang: str, dest_lang: str) -> str:
+    """Tradução falsa e determinística usada pelo simulador (linha a linha)"""
+    return "\n".join(f"[{dest_lang}] {line}" if line.strip() else line
+                     for line in text.split("\n"))
+
+
+class SimulatedBackend(TranslationBackend):
+    """Backend offline que imita latência, falhas e throttling de um serviço real"""
+
+    name = "simulated"
+    native_async = True
+
+    LATENCY_MODELS = ('fixed', 'uniform', 'exponential', 'lognormal')
+
+    def __init__(self, latency: str = 'lognormal', mean_ms: float = 120.0,
+                 sigma: float = 0.5, per_char_ms: float = 0.0,
+                 error_rate: float = 0.0, throttle_rate: float = 0.0,
+                 capacity_rps: float = 0.0, retry_after: float = 1.0,
+                 misalign_rate: float = 0.0, saturation: int = 0,
+                 max_chars_per_request: int = 5000, seed: Optional[int] = None,
+                 transform: Callable[[str, str, str], str] = pseudo_translate):
+        if latency not in self.LATENCY_MODELS:
+            raise ValueError(f"Modelo de latência desconhecido: {latency}")
+        self.latency = latency
+        self.mean_ms = mean_ms
+        self.sigma = sigma
+        self.per_char_ms = per_char_ms
+        self.error_rate = error_rate
+        self.throttle_rate = throttle_rate
+        self.capacity_rps = capacity_rps
+        self.retry_after = retry_after
+        self.misalign_rate = misalign_rate
+        # Acima de "saturation" requisições simultâneas a latência cresce
+        self.saturation = saturation
+        self.in_flight = 0
+        self.limits = BackendLimits(max_chars_per_request=max_chars_per_request)
+        self.transform = transform
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._window_start = time.monotonic()
+        self._window_count = 0
+        self.calls = 0
+
+    def sample_latency(self, text: str) -> float:
+        """Sorteia a latência (em segundos) de uma requisição"""
+        mean = self.mean_ms / 1000.0
+        with self._lock:
+            if self.latency == 'fixed':
+                base = mean
+            elif self.latency == 'uniform':
+                base = self._rng.uniform(0.0, 2 * mean)
+            elif self.latency == 'exponential':
+                base = self._rng.expovariate(1.0 / mean) if mean > 0 else 0.0
+            else:
+                # Média da lognormal igual a mean: mu = ln(mean) - sigma²/2
+                mu = math.log(mean) - self.sigma ** 2 / 2 if mean > 0 else 0.0
+                base = self._rng.lognormvariate(mu, self.sigma) if mean > 0 else 0.0
+            if self.saturation and self.in_flight > self.saturation:
+                base *= self.in_flight / self.saturation
+        return base + len(text) * self.per_char_ms / 1000.0
+
+    def check_failure(self) -> None:
+        """Decide se a requisição atual falha, é limitada ou passa"""
+        with self._lock:
+            self.calls += 1
+            now = time.monotonic()
+            if now - self._window_start >= 1.0:
+                self._window_start = now
+                self._window_count = 0
+            self._window_count += 1
+            over_capacity = self.capacity_rps > 0 and self._window_count > self.capacity_rps
+            roll = self._rng.random()
+        if over_capacity or roll < self.throttle_rate:
+            raise ThrottledError(retry_after=self.retry_after)
+        if roll < self.throttle_rate + self.error_rate:
+            raise BackendError("Falha simulada do serviço")
+
+    def _begin(self, text: str) -> float:
+        if len(text) > self.limits.max_chars_per_request:
+            raise BackendError(f"Texto excede {self.limits.max_chars_per_request} caracteres")
+        with self._lock:
+            self.in_flight += 1
+        return self.sample_latency(text)
+
+    def _respond(self, text: str, src_lang: str, dest_lang: str) -> str:
+        with self._lock:
+            self.in_flight -= 1
+        self.check_failure()
+        translated = self.transform(text, src_lang, dest_lang)
+        if self.misalign_rate and '\n' in translated:
+            with self._lock:
+                misalign = self._rng.random() < self.misalign_rate
+            if misalign:
+                # Imita o serviço juntando duas linhas de um texto agrupado
+                translated = translated.replace('\n', ' ', 1)
+        return translated
+
+    def translate(self, text: str, src_lang: str, dest_lang: str) -> str:
+        time.sleep(self._begin(text))
+        return self._respond(text, src_lang, dest_lang)
+
+    async def atranslate(self, text: str, src_lang: str, dest_lang: str,
+                         executor: Optional[Executor] = None) -> str:
+        # Nativo do asyncio: centenas de requisições simultâneas sem threads
+        await asyncio.sleep(self._begin(text))
+        return self._respond(text, src_lang, dest_lang)
+
+
+class RecordReplayBackend(TranslationBackend):
+    """Grava as respostas de outro backend ou as reproduz de um arquivo JSONL"""
+
+    name = "replay"
+
+    def __init__(self, path: str, inner: Optional[TranslationBackend] = None,
+                 replay_latency: bool = False):
+        self.path = path
+        self.inner = inner
+        self.replay_latency = replay_latency
+        self.recording = inner is not None
+        self.limits = inner.limits if inner is not None else BackendLimits()
+        self.max_connections = inner.max_connections if inner is not None else 0
+        self._lock = threading.Lock()
+        self._records: Dict[Tuple[str, str, str], dict] = {}
+        if not self.recording:
+            self._records = self.load_records(path)
+
+    @staticmethod
+    def load_records(path: str) -> Dict[Tuple[str, str, str], dict]:
+        """Lê uma gravação; a última resposta para cada texto prevalece"""
+        records = {}
+        if os.path.exists(path):
+            with open(path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    if not line.strip():
+                        continue
+                    rec = json.loads(line)
+                    records[(rec['src'], rec['dest'], rec['text'])] = rec
+        return records
+
+    def _append(self, rec: dict) -> None:
+        with self._lock:
+            with open(self.path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(rec, ensure_ascii=False) + '\n')
+
+    def connection_stats(self) -> Optional[PoolStats]:
+        return self.inner.connection_stats() if self.inner is not None else None
+
+    def translate(self, text: str, src_lang: str, dest_lang: str) -> str:
+        if self.recording:
+            rec = {'src': src_lang, 'dest': dest_lang, 'text': text}
+            start = time.monotonic()
+            try:
+                result = self.inner.translate(text, src_lang, dest_lang)
+            except ThrottledError as e:
+                rec.update(error='throttled', retry_after=e.retry_after,
+                           latency=time.monotonic() - start)
+                self._append(rec)
+                raise
+            except BackendError as e:
+                rec.update(error=str(e), latency=time.monotonic() - start)
+                self._append(rec)
+                raise
+            rec.update(result=result, latency=time.monotonic() - start)
+            self._append(rec)
+            return result
+
+        rec = self._records.get((src_lang, dest_lang, text))
+        if rec is None:
+            raise BackendError(f"Texto não encontrado na gravação: {text[:40]!r}")
+        if self.replay_latency:
+            time.sleep(rec.get('latency', 0.0))
+        if rec.get('error') == 'throttled':
+            raise ThrottledError(retry_after=rec.get('retry_after'))
+        if 'error' in rec:
+            raise BackendError(rec['error'])
+        return rec['result']
+
+
+class BackendWrapper(TranslationBackend):
+    """Base para backends que decoram outro backend"""
+
+    def __init__(self, inner: TranslationBackend):
+        self.inner = inner
+        self.name = inner.name
+        self.limits = inner.limits
+        self.native_async = inner.native_async
+        self.max_connections = inner.max_connections
+
+    def translate(self, text: str, src_lang: str, dest_lang: str) -> str:
+        return self.inner.translate(text, src_lang, dest_lang)
+
+    def connection_stats(self) -> Optional[PoolStats]:
+        return self.inner.connection_stats()
+
+    async def atranslate(self, text: str, src_lang: str, dest_lang: str,
+                         executor: Optional[Executor] = None) -> str:
+        return await self.inner.atranslate(text, src_lang, dest_lang, executor)
+
+
+class RateLimitedBackend(BackendWrapper):
+    """Passa cada chamada pelo limitador de ritmo compartilhado do processo"""
+
+    def __init__(self, inner: TranslationBackend, limiter: RateLimiter):
+        super().__init__(inner)
+        self.limiter = limiter
+
+    def translate(self, text: str, src_lang: str, dest_lang: str) -> str:
+        self.limiter.acquire(len(text))
+        try:
+            return self.inner.translate(text, src_lang, dest_lang)
+        except ThrottledError as e:
+            # Retry-After vale para todas as threads, não só para esta
+            self.limiter.pause(e.retry_after)
+            raise
+
+    async def atranslate(self, text: str, src_lang: str, dest_lang: str,
+                         executor: Optional[Executor] = None) -> str:
+        await self.limiter.aacquire(len(text))
+        try:
+            return await self.inner.atranslate(text, src_lang, dest_lang, executor)
+        except ThrottledError as e:
+            self.limiter.pause(e.retry_after)
+            raise
+
+
+class CircuitBreakerBackend(BackendWrapper):
+    """Falha na hora (CircuitOpenError) enquanto o serviço parece fora do ar"""
+
+    def __init__(self, inner: TranslationBackend, breaker: CircuitBreaker):
+        super().__init__(inner)
+        self.breaker = breaker
+
+    def _before(self) -> None:
+        if not self.breaker.allow():
+            raise CircuitOpenError("Serviço de tradução indisponível (disjuntor aberto)")
+
+    def _after(self, error: Optional[BaseException]) -> None:
+        # 429 mostra que o serviço está de pé; só falhas reais contam
+        if error is None or isinstance(error, ThrottledError):
+            self.breaker.record_success()
+        elif isinstance(error, Exception):
+            self.breaker.record_failure()
+        else:
+            # Cancelamento/Ctrl+C não diz nada do serviço, mas a sonda não pode ficar presa
+            self.breaker.release()
+
+    def translate(self, text: str, src_lang: str, dest_lang: str) -> str:
+        self._before()
+        try:
+            result = self.inner.translate(text, src_lang, dest_lang)
+        except BaseException as e:
+            self._after(e)
+            raise
+        self._after(None)
+        return result
+
+    async def atranslate(self, text: str, src_lang: str, dest_lang: str,
+                         executor: Optional[Executor] = None) -> str:
+        self._before()
+        try:
+            result = await self.inner.atranslate(text, src_lang, dest_lang, executor)
+        except BaseException as e:
+            self._after(e)
+            raise
+        self._after(None)
+        return result
+
+
+# ---------------------- Fábrica ----------------------
+
+def _parse_value(value: str):
+    for cast in (int, float):
+        try:
+            return cast(value)
+        except ValueError:
+            pass
+    return value
+
+
+def parse_backend_spec(spec: str) -> Tuple[str, Dict[str, object]]:
+    """Separa "nome:chave=valor,..." em nome e opções"""
+    name, _, raw_opts = spec.strip().partition(':')
+    options = {}
+    for part in filter(None, (p.strip() for p in raw_opts.split(','))):
+        key, _, value = part.partition('=')
+        options[key.strip()] = _parse_value(value.strip())
+    return name.strip().lower() or 'google', options
+
+
+def _build_backend(name: str, options: Dict[str, object]) -> TranslationBackend:
+    if name == 'google':
+        return GoogleBackend(**options)
+    if name in ('simulated', 'sim'):
+        return SimulatedBackend(**options)
+    if name == 'record':
+        path = options.pop('path')
+        inner_name, inner_options = parse_backend_spec(str(options.pop('inner', 'google')))
+        return RecordReplayBackend(str(path), inner=_build_backend(inner_name, inner_options))
+    if name == 'replay':
+        return RecordReplayBackend(str(options['path']),
+                                   replay_latency=bool(options.get('replay_latency', 0)))
+    raise ValueError(f"Backend desconhecido: {name}")
+
+
+def create_backend(spec: str = "google") -> TranslationBackend:
+    """
+    Cria um backend a partir de uma especificação textual.
+    As opções rps/cps (requisições e caracteres por segundo) valem para
+    qualquer backend e substituem os limites declarados por ele; as opções
+    breaker_threshold/breaker_timeout configuram o disjuntor.
+    """
+    name, options = parse_backend_spec(spec)
+    rps = options.pop('rps', None)
+    cps = options.pop('cps', None)
+    breaker = CircuitBreaker(int(options.pop('breaker_threshold', 10)),
+                             float(options.pop('breaker_timeout', 30.0)))
+    backend = _build_backend(name, options)
+    rps = backend.limits.requests_per_second if rps is None else float(rps)
+    cps = backend.limits.chars_per_second if cps is None else float(cps)
+    # Mesmo sem limites de ritmo o limitador aplica o Retry-After a todos
+    backend = RateLimitedBackend(backend, shared_rate_limiter(backend.name, rps, cps))
+    # Disjuntor por fora: com o circuito aberto nem se gasta ficha do limitador
+    return CircuitBreakerBackend(backend, breaker)
+
+
+def backend_from_env(default: str = "google") -> TranslationBackend:
+    """Cria o backend configurado em UMT_BACKEND (ou o padrão)"""
+    return create_backend(os.environ.get(BACKEND_ENV_VAR, default))
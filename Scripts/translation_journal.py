@@ -0,0 +1,135 @@
+"""
+Diário (write-ahead log) das traduções produzidas durante a execução.
+
+Cada lote traduzido é anexado ao diário e sincronizado com o disco antes de
+entrar no buffer do cache. Se a execução for interrompida (Ctrl+C, falha,
+janela fechada), as traduções já pagas são reaplicadas ao cache na próxima
+abertura. Depois que o cache grava o buffer, o diário é esvaziado.
+
+Cada processo tem o seu diário ("<banco>.<pid>-<id>.journal"), travado
+enquanto o processo vive: dois processos no mesmo cache não se atropelam, e
+quem abre o cache só reaplica os diários sem dono (processo encerrado).
+"""
+
+import json
+import os
+import uuid
+from pathlib import Path
+from typing import Dict, Iterator, List, Tuple
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+JOURNAL_SUFFIX = '.journal'
+# No Windows a trava é por intervalo de bytes: um byte bem depois do conteúdo
+_LOCK_OFFSET = 1 << 40
+
+
+def _try_lock(f) -> bool:
+    """Trava exclusiva sem esperar; o sistema a solta quando o processo morre"""
+    try:
+        if fcntl is not None:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        else:
+            f.seek(_LOCK_OFFSET)
+            msvcrt.locking(f.fileno(), msvcrt.LK_NBLCK, 1)
+    except OSError:
+        return False
+    return True
+
+
+class TranslationJournal:
+    """Arquivo JSONL apenas-acréscimo com fsync a cada lote"""
+
+    def __init__(self, path: Path, _file=None):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        if _file is None:
+            _file = open(self.path, 'ab')
+            if not _try_lock(_file):
+                _file.close()
+                raise OSError(f"Diário em uso por outro processo: {self.path}")
+        self._file = _file
+
+    @classmethod
+    def create(cls, db_path: Path) -> 'TranslationJournal':
+        """Diário novo deste processo para o banco"""
+        db_path = Path(db_path)
+        name = f"{db_path.name}.{os.getpid()}-{uuid.uuid4().hex[:8]}{JOURNAL_SUFFIX}"
+        return cls(db_path.with_name(name))
+
+    @classmethod
+    def orphans(cls, db_path: Path) -> List['TranslationJournal']:
+        """
+        Diários do banco deixados por processos encerrados (inclui o nome
+        antigo "<banco>.journal"); ficam travados por quem os recebe.
+        """
+        db_path = Path(db_path)
+        if not db_path.parent.exists():
+            return []
+        # "<banco>.<pid>-<id>.journal" e o antigo "<banco>.journal"
+        prefix = db_path.name + '.'
+        found = []
+        for path in sorted(db_path.parent.iterdir()):
+            name = path.name
+            if not (name.startswith(prefix) and name.endswith(JOURNAL_SUFFIX)):
+                continue
+            try:
+                f = open(path, 'ab')
+            except OSError:
+                continue
+            # Outro processo vivo (ou quem já reaplicou e apagou o arquivo)
+            if not _try_lock(f) or os.fstat(f.fileno()).st_nlink == 0:
+                f.close()
+                continue
+            found.append(cls(path, f))
+        return found
+
+    def append(self, src: str, dest: str, translations: Dict[str, str]) -> None:
+        """Grava um lote de traduções de forma durável"""
+        if not translations:
+            return
+        f = self._file
+        f.write((json.dumps({'src': src, 'dest': dest, 'items': translations},
+                            ensure_ascii=False) + '\n').encode('utf-8'))
+        f.flush()
+        os.fsync(f.fileno())
+
+    def entries(self) -> Iterator[Tuple[str, str, Dict[str, str]]]:
+        """Lê os lotes gravados; uma última linha incompleta (queda no meio da escrita) é ignorada"""
+        if not self.path.exists():
+            return
+        with open(self.path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    rec = json.loads(line)
+                except ValueError:
+                    continue
+                yield rec['src'], rec['dest'], rec['items']
+
+    def truncate(self) -> None:
+        """Esvazia o diário (chamado depois que o cache gravou tudo)"""
+        if self._file is not None:
+            self._file.truncate(0)
+
+    def remove(self) -> None:
+        """Fecha e apaga o diário (já reaplicado ou vazio)"""
+        try:
+            # Ainda travado: ninguém mais o reaplica entre apagar e fechar
+            self.path.unlink()
+        except OSError:
+            # O Windows não apaga um arquivo aberto
+            self.close()
+            try:
+                self.path.unlink()
+            except OSError:
+                pass
+        self.close()
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
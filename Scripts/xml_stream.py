@@ -0,0 +1,161 @@
+"""
+Leitura incremental de XML com a posição em bytes de cada texto.
+
+O arquivo (mapeado em memória) é entregue ao expat em blocos. Nenhuma árvore
+é montada: só a pilha de índices do elemento atual e o texto em andamento,
+então a memória depende da profundidade, não do tamanho do arquivo. Para cada
+texto traduzível (texto de elemento, texto depois de um elemento — o "tail" —
+e atributos selecionados) sai o endereço e o intervalo de bytes no original,
+em ordem de documento; a escrita copia o resto do arquivo como está, com
+declaração, comentários e codificação intactos.
+"""
+
+import re
+from typing import Any, Dict, Iterable, Iterator, List, NamedTuple, Optional, Pattern, Tuple
+from xml.parsers import expat
+
+from line_index import MappedFile
+
+CHUNK_SIZE = 1 << 20
+
+# Atributos traduzidos por padrão (ids e nomes técnicos ficam de fora)
+DEFAULT_ATTRIBUTES = ('label', 'description', 'title', 'text', 'tooltip', 'caption', 'message')
+
+# Caminho até o texto: índices dos filhos a partir da raiz + 'text', 'tail' ou '@atributo'
+Address = Tuple[Any, ...]
+
+_DECLARED_ENCODING = re.compile(rb'(?:\xef\xbb\xbf)?<\?xml[^>]*?encoding\s*=\s*["\']([A-Za-z0-9._-]+)')
+# Tag de abertura completa (atributos entre aspas podem conter '>')
+_START_TAG = re.compile(rb'<[^\s/>]+(?:\s+[^\s=/>]+\s*=\s*(?:"[^"]*"|\'[^\']*\'))*\s*/?>')
+
+
+class XmlText(NamedTuple):
+    """Texto encontrado: endereço, intervalo [start, end) em bytes e valor decodificado"""
+    address: Address
+    start: int
+    end: int
+    value: str
+    quote: Optional[bytes]  # aspas do atributo; None para texto
+
+
+def document_encoding(head: bytes) -> str:
+    """Codificação declarada no início do arquivo (UTF-8 se não houver declaração)"""
+    if head.startswith((b'\xff\xfe', b'\xfe\xff')):
+        raise ValueError("XML em UTF-16 não é suportado")
+    match = _DECLARED_ENCODING.match(head)
+    return match.group(1).decode('ascii') if match else 'utf-8'
+
+
+class _Scanner:
+    """Handlers do expat; acumula os textos achados em 'found'"""
+
+    def __init__(self, mapped: MappedFile, attributes: Iterable[str]):
+        self.mapped = mapped
+        self.attributes = frozenset(attributes)
+        self.attribute_patterns: Dict[str, Pattern[bytes]] = {}
+        self.parser = parser = expat.ParserCreate()
+        parser.StartElementHandler = self.start
+        parser.EndElementHandler = self.end
+        parser.CharacterDataHandler = self.chars
+        parser.CommentHandler = self.markup
+        parser.ProcessingInstructionHandler = self.markup
+        parser.StartCdataSectionHandler = self.cdata_start
+        parser.EndCdataSectionHandler = self.cdata_end
+        self.found: List[XmlText] = []
+        self.path: List[int] = []      # índices do elemento atual (sem a raiz)
+        self.children: List[int] = []  # filhos já vistos em cada nível aberto
+        # Texto em andamento: dono (endereço), início, fim e partes decodificadas
+        self.owner: Optional[Address] = None
+        self.seg_start: Optional[int] = None
+        self.seg_end: Optional[int] = None
+        self.parts: List[str] = []
+        self.in_chars = False
+
+    def chars(self, data: str) -> None:
+        if self.owner is None:
+            return  # fora da raiz
+        if self.seg_start is None:
+            self.seg_start = self.parser.CurrentByteIndex
+        self.parts.append(data)
+        self.in_chars = True
+
+    def markup(self, *_) -> None:
+        # Comentário depois do texto fica fora do trecho (no meio do texto, vai junto com ele)
+        if self.in_chars:
+            self.seg_end = self.parser.CurrentByteIndex
+            self.in_chars = False
+
+    def cdata_start(self) -> None:
+        self.markup()
+        if self.owner is not None and self.seg_start is None:
+            self.seg_start = self.parser.CurrentByteIndex
+
+    def cdata_end(self) -> None:
+        # O trecho inclui o "]]>": a tradução substitui a seção CDATA inteira
+        self.in_chars = False
+        if self.seg_start is not None:
+            self.seg_end = self.parser.CurrentByteIndex + 3
+
+    def close_segment(self) -> None:
+        self.markup()
+        if self.parts:
+            value = ''.join(self.parts)
+            if value.strip():
+                self.found.append(XmlText(self.owner, self.seg_start, self.seg_end, value, None))
+            self.parts = []
+        self.seg_start = self.seg_end = None
+
+    def start(self, name: str, attrs: dict) -> None:
+        index = self.parser.CurrentByteIndex
+        self.close_segment()
+        if self.children:
+            self.path.append(self.children[-1])
+            self.children[-1] += 1
+        self.children.append(0)
+        address = tuple(self.path)
+        if self.attributes.intersection(attrs):
+            self.find_attributes(index, address, attrs)
+        self.owner = address + ('text',)
+
+    def find_attributes(self, index: int, address: Address, attrs: dict) -> None:
+        data = self.mapped.data
+        tag = _START_TAG.match(data, index)
+        if tag is None:
+            return
+        for name, value in attrs.items():
+            if name not in self.attributes or not value.strip():
+                continue
+            pattern = self.attribute_patterns.get(name)
+            if pattern is None:
+                pattern = re.compile(rb'\s' + re.escape(name.encode('utf-8')) + rb'\s*=\s*(["\'])')
+                self.attribute_patterns[name] = pattern
+            match = pattern.search(data, index, tag.end())
+            if match is None:
+                continue
+            quote = match.group(1)
+            close = data.find(quote, match.end(), tag.end())
+            self.found.append(XmlText(address + ('@' + name,), match.end(), close, value, quote))
+
+    def end(self, name: str) -> None:
+        self.close_segment()
+        self.children.pop()
+        address = tuple(self.path)
+        if self.path:
+            self.path.pop()
+        # Texto depois da tag de fechamento pertence ao "tail" deste elemento
+        self.owner = address + ('tail',) if self.children else None
+
+
+def scan(mapped: MappedFile, attributes: Iterable[str] = DEFAULT_ATTRIBUTES,
+         chunk_size: int = CHUNK_SIZE) -> Iterator[XmlText]:
+    """Textos traduzíveis do arquivo, em ordem de documento"""
+    scanner = _Scanner(mapped, attributes)
+    try:
+        for offset in range(0, mapped.size, chunk_size):
+            scanner.parser.Parse(mapped.slice(offset, offset + chunk_size), False)
+            yield from scanner.found
+            scanner.found.clear()
+        scanner.parser.Parse(b'', True)
+    except expat.ExpatError as e:
+        raise ValueError(f"XML inválido: {e}") from None
+    yield from scanner.found
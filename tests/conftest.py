@@ -0,0 +1,5 @@
+import sys
+from pathlib import Path
+
+# Os módulos ficam soltos em Scripts/ e importam uns aos outros pelo nome
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "Scripts"))
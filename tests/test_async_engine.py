@@ -0,0 +1,49 @@
+import time
+
+from async_engine import AIMDController
+
+
+def test_slow_start_adds_one_per_success():
+    controller = AIMDController(initial=4, max_limit=6)
+    for _ in range(5):
+        controller.on_success(0.01)
+    assert controller.limit == 6
+
+
+def test_throttle_halves_once_per_round_trip():
+    controller = AIMDController(initial=16)
+    controller.on_success(0.05)
+    controller.on_throttle()
+    assert controller.limit == 8
+    assert not controller.slow_start
+    # Respostas da mesma rajada não reduzem de novo
+    controller.on_throttle()
+    assert controller.limit == 8
+    time.sleep(0.1)
+    controller.on_error()
+    assert controller.limit == 4
+
+
+def test_additive_increase_after_slow_start():
+    controller = AIMDController(initial=4)
+    controller.on_success(0.001)
+    controller.on_throttle()
+    limit = controller.limit
+    for _ in range(limit):
+        controller.on_success(0.001)
+    assert controller.limit == limit + 1
+
+
+def test_latency_growth_reduces_limit():
+    controller = AIMDController(initial=10, smoothing=1.0)
+    controller.on_success(0.001)
+    controller.on_success(0.01)  # média acima de 2× a base: congestionamento
+    assert controller.limit < 11
+
+
+def test_limit_never_below_minimum():
+    controller = AIMDController(initial=2, min_limit=1)
+    for _ in range(5):
+        controller.on_throttle()
+        time.sleep(0.001)
+    assert controller.limit == 1
@@ -0,0 +1,35 @@
+from batch_planner import BatchPlanner
+
+
+def test_units_respect_char_and_item_budget():
+    planner = BatchPlanner(max_chars=50, max_items=4)
+    texts = [f"text number {i}" * (1 + i % 3) for i in range(40)]
+    units = planner.plan(texts)
+    assert sorted(t for unit in units for t in unit.texts) == sorted(texts)
+    for unit in units:
+        assert len(unit) <= 4
+        assert unit.chars == sum(len(t) + 1 for t in unit.texts)
+        assert unit.chars <= 50 or len(unit) == 1
+
+
+def test_longest_texts_first_and_costliest_units_first():
+    planner = BatchPlanner(max_chars=30, max_items=10, request_overhead=200)
+    units = planner.plan(["a" * 5, "b" * 20, "c" * 2, "d" * 12, "e" * 8])
+    # Longos primeiro: b sozinho (b + d passaria de 30), depois d, e, a; c sobra
+    assert [unit.texts for unit in units] == [["d" * 12, "e" * 8, "a" * 5], ["b" * 20], ["c" * 2]]
+    assert [unit.cost for unit in units] == [228, 221, 203]
+
+
+def test_oversized_text_gets_its_own_unit():
+    planner = BatchPlanner(max_chars=20, max_items=10)
+    big = "x" * 100
+    units = planner.plan(["short", big, "tiny"])
+    assert [big] in [unit.texts for unit in units]
+    assert units[0].texts == [big]
+    assert any(unit.texts == ["short", "tiny"] for unit in units)
+
+
+def test_multiline_texts_cost_one_request_each():
+    planner = BatchPlanner(request_overhead=100)
+    unit = planner.plan(["one\ntwo", "three\nfour", "plain"])[0]
+    assert unit.cost == 3 * 100 + unit.chars
@@ -0,0 +1,217 @@
+import subprocess
+import sys
+import textwrap
+import threading
+import time
+from dataclasses import replace
+from pathlib import Path
+
+from cache_store import KIND_FAILED, KIND_SKIPPED, EvictionPolicy, SQLiteCacheStore
+
+SCRIPTS = Path(__file__).resolve().parent.parent / "Scripts"
+
+
+def test_journal_of_live_process_is_left_alone(tmp_path):
+    db = tmp_path / "cache.sqlite3"
+    first = SQLiteCacheStore(db, flush_every=10 ** 6, flush_interval=10 ** 6)
+    second = None
+    try:
+        first.put_many('en', 'pt', {'Sword': 'Espada'})
+        second = SQLiteCacheStore(db)
+        assert second.replayed == 0
+        assert first.journal.path.exists()
+    finally:
+        if second is not None:
+            second.close()
+        first.close()
+
+
+def test_failed_entries_expire(tmp_path):
+    store = SQLiteCacheStore(tmp_path / "cache.sqlite3", ttls={KIND_FAILED: 0.2})
+    try:
+        store.put_outcomes('en', 'pt', ['Sword'], KIND_FAILED)
+        assert store.lookup_many('en', 'pt', ['Sword'])['Sword'].kind == KIND_FAILED
+        # Falha recente não conta como acerto
+        assert store.stats.hits == 0
+        store.flush()
+        time.sleep(0.3)
+        assert store.lookup_many('en', 'pt', ['Sword']) == {}
+    finally:
+        store.close()
+
+
+def test_journal_replayed_after_kill(tmp_path):
+    db = tmp_path / "cache.sqlite3"
+    # Processo que grava no diário e morre antes de o cache gravar o banco
+    code = textwrap.dedent(f"""
+        import os, sys
+        sys.path.insert(0, {str(SCRIPTS)!r})
+        from cache_store import SQLiteCacheStore
+        store = SQLiteCacheStore({str(db)!r}, flush_every=10 ** 6, flush_interval=10 ** 6)
+        store.put_many('en', 'pt', {{'Sword': 'Espada', 'Axe': 'Machado'}})
+        os._exit(1)
+    """)
+    subprocess.run([sys.executable, "-c", code], check=False)
+    assert list(tmp_path.glob("cache.sqlite3.*.journal"))
+
+    store = SQLiteCacheStore(db)
+    try:
+        assert store.replayed == 2
+        found = store.lookup_many('en', 'pt', ['Sword', 'Axe'])
+        assert {text: entry.value for text, entry in found.items()} == {'Sword': 'Espada', 'Axe': 'Machado'}
+    finally:
+        store.close()
+    assert not list(tmp_path.glob("*.journal"))
+
+
+def test_pending_results_are_visible_before_flush(tmp_path):
+    store = SQLiteCacheStore(tmp_path / "cache.sqlite3", flush_every=10 ** 6, flush_interval=10 ** 6)
+    try:
+        store.put_many('en', 'pt', {'Sword': 'Espada'})
+        store.flush()
+        store.put_many('en', 'pt', {'Axe': 'Machado'})
+        # Falha pendente não esconde a tradução já gravada
+        store.put_outcomes('en', 'pt', ['Sword'], KIND_FAILED)
+        assert store.get_many('en', 'pt', ['Sword', 'Axe']) == {'Sword': 'Espada', 'Axe': 'Machado'}
+    finally:
+        store.close()
+
+
+def test_concurrent_writers_share_one_commit_thread(tmp_path):
+    db = tmp_path / "cache.sqlite3"
+    store = SQLiteCacheStore(db, flush_every=50)
+    try:
+        def write(worker):
+            for i in range(200):
+                store.put('en', 'pt', f'text {worker}-{i}', f'texto {worker}-{i}')
+
+        threads = [threading.Thread(target=write, args=(w,)) for w in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        store.flush()
+        assert len(store) == 1600
+    finally:
+        store.close()
+    reopened = SQLiteCacheStore(db)
+    try:
+        assert reopened.get('en', 'pt', 'text 7-199') == 'texto 7-199'
+        assert len(reopened) == 1600
+    finally:
+        reopened.close()
+
+
+def _fill(store, dest, count):
+    store.put_many('en', dest, {f'text {i}': f'{dest} {i}' for i in range(count)})
+    store.flush()
+    return [f'text {i}' for i in range(count)]
+
+
+def test_partition_loaded_on_demand_and_kept_in_budget(tmp_path):
+    # Cada linha custa ~210 bytes: um par de 10 linhas cabe, dois não
+    store = SQLiteCacheStore(tmp_path / "cache.sqlite3", memory_budget=3000)
+    try:
+        pt = _fill(store, 'pt', 10)
+        es = _fill(store, 'es', 10)
+        # Poucas consultas não compensam ler o par inteiro
+        assert store.get_many('en', 'pt', pt[:1]) == {'text 0': 'pt 0'}
+        assert store.loaded_pairs == []
+        assert len(store.get_many('en', 'pt', pt)) == 10
+        assert store.loaded_pairs == [('en', 'pt')]
+        assert 0 < store.memory_used <= 3000
+        # O par novo entra e o usado há mais tempo sai
+        assert len(store.get_many('en', 'es', es)) == 10
+        assert store.loaded_pairs == [('en', 'es')]
+        # A partição carregada acompanha as gravações
+        store.put_many('en', 'es', {'text 0': 'novo'})
+        store.flush()
+        assert store.get('en', 'es', 'text 0') == 'novo'
+    finally:
+        store.close()
+
+
+def test_pair_over_budget_is_never_loaded(tmp_path):
+    store = SQLiteCacheStore(tmp_path / "cache.sqlite3", memory_budget=3000)
+    try:
+        texts = _fill(store, 'pt', 20)
+        for _ in range(3):
+            assert len(store.get_many('en', 'pt', texts)) == 20
+        assert store.loaded_pairs == []
+        assert store.memory_used == 0
+    finally:
+        store.close()
+
+
+def test_stats_since_counts_one_run(tmp_path):
+    store = SQLiteCacheStore(tmp_path / "cache.sqlite3")
+    try:
+        store.put_many('en', 'pt', {'Sword': 'Espada'})
+        store.lookup_many('en', 'pt', ['Sword', 'Axe'])
+        start = replace(store.stats)
+        store.lookup_many('en', 'pt', ['Sword'])
+        run = store.stats.since(start)
+        assert (run.hits, run.misses, run.inserts) == (1, 0, 0)
+        assert (store.stats.hits, store.stats.misses) == (2, 1)
+    finally:
+        store.close()
+
+
+def test_evict_drops_least_recently_hit(tmp_path):
+    store = SQLiteCacheStore(tmp_path / "cache.sqlite3")
+    try:
+        for text, translation in (('Sword', 'Espada'), ('Axe', 'Machado'), ('Bow', 'Arco')):
+            store.put('en', 'pt', text, translation)
+            store.flush()
+            time.sleep(0.02)
+        # O acerto renova a entrada mais antiga: quem sai é a segunda
+        assert store.get('en', 'pt', 'Sword') == 'Espada'
+        store.flush()
+        assert store.evict(EvictionPolicy(max_entries=2)) == 1
+        assert store.get_many('en', 'pt', ['Sword', 'Axe', 'Bow']) == {'Sword': 'Espada', 'Bow': 'Arco'}
+        assert store.stats.evicted == 1
+    finally:
+        store.close()
+
+
+def test_evict_drops_idle_entries(tmp_path):
+    store = SQLiteCacheStore(tmp_path / "cache.sqlite3")
+    try:
+        store.put('en', 'pt', 'Sword', 'Espada')
+        store.flush()
+        time.sleep(0.3)
+        store.put('en', 'pt', 'Axe', 'Machado')
+        store.flush()
+        assert store.evict(EvictionPolicy(max_idle=0.2)) == 1
+        assert store.get_many('en', 'pt', ['Sword', 'Axe']) == {'Axe': 'Machado'}
+    finally:
+        store.close()
+
+
+def test_compact_drops_expired_outcomes(tmp_path):
+    store = SQLiteCacheStore(tmp_path / "cache.sqlite3", ttls={KIND_FAILED: 0.1, KIND_SKIPPED: 0.1})
+    try:
+        store.put_many('en', 'pt', {'Sword': 'Espada'})
+        store.put_outcomes('en', 'pt', ['Axe'], KIND_FAILED)
+        store.put_outcomes('en', 'pt', ['item_id_01'], KIND_SKIPPED)
+        store.flush()
+        assert len(store) == 3
+        time.sleep(0.2)
+        before, after = store.compact()
+        assert len(store) == 1
+        assert store.get('en', 'pt', 'Sword') == 'Espada'
+        assert after <= before
+    finally:
+        store.close()
+
+
+def test_limits_applied_on_close(tmp_path):
+    db = tmp_path / "cache.sqlite3"
+    store = SQLiteCacheStore(db, eviction=EvictionPolicy.parse("max_entries=2"))
+    store.put_many('en', 'pt', {f'text {i}': f'texto {i}' for i in range(5)})
+    store.close()
+    reopened = SQLiteCacheStore(db)
+    try:
+        assert len(reopened) == 2
+    finally:
+        reopened.close()
@@ -0,0 +1,25 @@
+from collected_yaml import scan, write_translated
+
+
+def _translate(tmp_path, content: bytes, translations):
+    src = tmp_path / "collected_items.yaml"
+    src.write_bytes(content)
+    index = str(tmp_path / "items.index")
+    out = tmp_path / "translations.yaml"
+    result = scan(str(src), index, lambda text: False)
+    write_translated(str(src), index, str(out), translations)
+    return result, out.read_bytes()
+
+
+def test_crlf_round_trip_keeps_line_endings(tmp_path):
+    content = b"# header\r\nWooden Sword: Wooden Sword\r\nkept: other\r\nBig Stone: Big Stone\r\n"
+    result, out = _translate(tmp_path, content, {"Wooden Sword": "Espada", "Big Stone": "Pedra"})
+    assert result.texts == ["Wooden Sword", "Big Stone"]
+    assert out == (b"# header\r\nWooden Sword: \"Espada\"\r\nkept: other\r\n"
+                   b"Big Stone: \"Pedra\"\r\n")
+
+
+def test_untranslated_lines_are_byte_identical(tmp_path):
+    content = b"a: a\nb: c\n  Indented: Indented\nlast: last"
+    _, out = _translate(tmp_path, content, {"a": "A", "Indented": "Recuado", "last": "fim"})
+    assert out == b'a: "A"\nb: c\n  Indented: "Recuado"\nlast: "fim"'
@@ -0,0 +1,129 @@
+import json
+
+import pytest
+
+from format_adapters import get_adapter
+
+
+def _round_trip(tmp_path, format_type, name, data: bytes, translate, **options) -> bytes:
+    src = tmp_path / name
+    dst = tmp_path / ("out_" + name)
+    src.write_bytes(data)
+    adapter = get_adapter(format_type, **options)
+    doc = adapter.read(src)
+    slots = list(adapter.slots(doc))
+    adapter.apply(doc, {slot.address: translate(slot.text) for slot in slots})
+    adapter.write(dst, doc)
+    adapter.close(doc)
+    return dst.read_bytes()
+
+
+def test_json_duplicate_keys_get_distinct_addresses(tmp_path):
+    data = b'{"name": "Sword", "name": "Axe", "item": {"desc": "Sharp"}, "item": {"desc": "Heavy"}}'
+    src = tmp_path / "dup.json"
+    src.write_bytes(data)
+    adapter = get_adapter('JSON')
+    addresses = [slot.address for slot in adapter.slots(adapter.read(src))]
+    assert len(addresses) == len(set(addresses)) == 4
+
+    out = _round_trip(tmp_path, 'JSON', "dup.json", data, lambda text: text.upper())
+    assert out == data.replace(b'"Sword"', b'"SWORD"').replace(b'"Axe"', b'"AXE"') \
+        .replace(b'"Sharp"', b'"SHARP"').replace(b'"Heavy"', b'"HEAVY"')
+    # O módulo json fica com a última ocorrência: a tradução dela não se perdeu
+    assert json.loads(out)["item"]["desc"] == "HEAVY"
+
+
+def test_csv_rejects_fill_target_that_is_also_a_text_column(tmp_path):
+    with pytest.raises(ValueError):
+        get_adapter('CSV', columns=['en'], fill={'en': 'desc'})
+    with pytest.raises(ValueError):
+        get_adapter('CSV', fill={'pt': 'en', 'en': 'desc'})
+    # Nome e índice da mesma coluna: detectado ao ler o cabeçalho
+    src = tmp_path / "items.csv"
+    src.write_bytes(b"id,en,pt\n1,Sword,\n")
+    adapter = get_adapter('CSV', columns=['en'], fill={1: 'id'})
+    with pytest.raises(ValueError):
+        list(adapter.slots(adapter.read(src)))
+
+
+def test_csv_crlf_round_trip(tmp_path):
+    data = b'id,text\r\n1,"Hello, you"\r\n2,World\r\n'
+    out = _round_trip(tmp_path, 'CSV', "items.csv", data, lambda text: text.upper(), columns=['text'])
+    assert out == b'id,text\r\n1,"HELLO, YOU"\r\n2,WORLD\r\n'
+
+
+def test_txt_blank_lines_are_not_slots(tmp_path):
+    src = tmp_path / "lines.txt"
+    src.write_bytes(b'Hello\n   \n\nWorld\n')
+    adapter = get_adapter('TXT')
+    doc = adapter.read(src)
+    try:
+        assert [(slot.address, slot.text) for slot in adapter.slots(doc)] == [((0,), 'Hello'), ((3,), 'World')]
+    finally:
+        adapter.close(doc)
+
+
+def test_txt_crlf_round_trip(tmp_path):
+    data = b'Hello\r\n\r\n  World\r\n'
+    out = _round_trip(tmp_path, 'TXT', "lines.txt", data, lambda text: text.upper())
+    assert out == b'HELLO\r\n\r\n  WORLD\r\n'
+
+
+def test_yaml_round_trip_keeps_structure_and_styles(tmp_path):
+    data = (b'# comment\nname: "Iron Sword"\nid: 42\nenabled: true\n'
+            b'desc: |\n  Line one\n  Line two\nlist:\n  - Open\n  - \'Close it\'\n'
+            b'ref: &a Anchor text\nother: *a\n')
+    out = _round_trip(tmp_path, 'YAML', "items.yaml", data, lambda text: text.upper())
+    assert out == (b'# comment\nname: "IRON SWORD"\nid: 42\nenabled: true\n'
+                   b'desc: |\n  LINE ONE\n  LINE TWO\nlist:\n  - OPEN\n  - \'CLOSE IT\'\n'
+                   b'ref: &a ANCHOR TEXT\nother: *a\n')
+
+
+def test_yaml_duplicate_keys_round_trip(tmp_path):
+    data = b'name: Sword\nname: Axe\n'
+    out = _round_trip(tmp_path, 'YAML', "dup.yaml", data, lambda text: text.upper())
+    assert out == b'name: SWORD\nname: AXE\n'
+
+
+def test_yaml_crlf_round_trip(tmp_path):
+    data = b'a: Hello\r\nb:\r\n  - Open\r\n'
+    out = _round_trip(tmp_path, 'YAML', "crlf.yaml", data, lambda text: text.upper())
+    assert out == b'a: HELLO\r\nb:\r\n  - OPEN\r\n'
+
+
+def test_xml_round_trip_keeps_untranslated_bytes(tmp_path):
+    data = (b'<?xml version="1.0" encoding="utf-8"?>\n'
+            b'<!-- Sword list -->\n'
+            b'<items>\n'
+            b'  <item id="sword" label="Iron Sword">  Sharp blade <b>very</b> heavy  </item>\n'
+            b'  <note><![CDATA[Raw <text>]]></note>\n'
+            b'</items>\n')
+    out = _round_trip(tmp_path, 'XML', "items.xml", data, lambda text: text.upper())
+    # A seção CDATA traduzida vira texto escapado equivalente
+    assert out == data.replace(b'Iron Sword', b'IRON SWORD').replace(b'Sharp blade', b'SHARP BLADE') \
+        .replace(b'very', b'VERY').replace(b'heavy', b'HEAVY') \
+        .replace(b'<![CDATA[Raw <text>]]>', b'RAW &lt;TEXT&gt;')
+    # Sem tradução nada muda, nem a seção CDATA
+    assert _round_trip(tmp_path, 'XML', "items.xml", data, lambda text: text) == data
+
+
+def test_xml_slots_cover_text_tail_and_attributes(tmp_path):
+    src = tmp_path / "items.xml"
+    src.write_bytes(b'<items><item id="x" label="Sword">Sharp<b>Bold</b>Tail</item></items>')
+    adapter = get_adapter('XML')
+    slots = {slot.address: slot.text for slot in adapter.slots(adapter.read(src))}
+    assert slots == {(0, '@label'): 'Sword', (0, 'text'): 'Sharp', (0, 0, 'text'): 'Bold', (0, 0, 'tail'): 'Tail'}
+
+
+def test_xml_round_trip_keeps_declared_encoding(tmp_path):
+    data = '<?xml version="1.0" encoding="iso-8859-1"?>\n<a title="Café">Ação</a>\n'.encode('iso-8859-1')
+    out = _round_trip(tmp_path, 'XML', "latin.xml", data, lambda text: text + ' ç€')
+    # '€' não existe em latin-1: vira referência de caractere
+    assert out == '<?xml version="1.0" encoding="iso-8859-1"?>\n<a title="Café ç&#8364;">Ação ç&#8364;</a>\n' \
+        .encode('iso-8859-1')
+
+
+def test_xml_translation_is_escaped(tmp_path):
+    data = b'<a label="Sword">Axe</a>'
+    out = _round_trip(tmp_path, 'XML', "esc.xml", data, lambda text: 'A & "B" <C>')
+    assert out == b'<a label="A &amp; &quot;B&quot; &lt;C&gt;">A &amp; "B" &lt;C&gt;</a>'
@@ -0,0 +1,98 @@
+import http.client
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from http_pool import ConnectionPool, HttpTransport
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        server = self.server
+        with server.lock:
+            server.clients.add(self.client_address)
+        time.sleep(server.delay)
+        body = self.path.encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/plain; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+        # Fecha a conexão sem avisar o cliente (como um keep-alive vencido)
+        self.close_connection = server.drop_idle
+
+    do_POST = do_GET
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), _Handler)
+    server.daemon_threads = True
+    server.lock = threading.Lock()
+    server.clients = set()
+    server.delay = 0.0
+    server.drop_idle = False
+    thread = threading.Thread(target=server.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def _url(server, path='/') -> str:
+    return f"http://127.0.0.1:{server.server_address[1]}{path}"
+
+
+def test_connection_is_reused(server):
+    transport = HttpTransport(pool_size=4, timeout=5)
+    try:
+        for i in range(5):
+            response = transport.get(_url(server, '/echo'), params={'n': i})
+            assert response.status == 200
+            assert response.text() == f'/echo?n={i}'
+        stats = transport.stats
+        assert (stats.requests, stats.opened, stats.reused) == (5, 1, 4)
+        assert len(server.clients) == 1
+    finally:
+        transport.close()
+
+
+def test_pool_bounds_concurrent_connections(server):
+    server.delay = 0.1
+    pool = ConnectionPool('http', '127.0.0.1', server.server_address[1], size=2, timeout=5)
+    try:
+        with ThreadPoolExecutor(max_workers=6) as executor:
+            statuses = list(executor.map(lambda i: pool.request('GET', f'/{i}').status, range(6)))
+        assert statuses == [200] * 6
+        assert pool.stats.opened <= 2
+        assert len(server.clients) <= 2
+        assert pool.stats.waited >= 1
+        assert pool.stats.requests == 6
+    finally:
+        pool.close()
+
+
+def test_stale_keep_alive_is_retried_once(server):
+    server.drop_idle = True
+    pool = ConnectionPool('http', '127.0.0.1', server.server_address[1], size=1, timeout=5)
+    try:
+        assert pool.request('GET', '/first').body == b'/first'
+        time.sleep(0.1)
+        # A conexão guardada já foi fechada pelo servidor: GET é reenviado numa nova
+        assert pool.request('GET', '/second').body == b'/second'
+        assert (pool.stats.stale, pool.stats.opened, pool.stats.requests) == (1, 2, 2)
+        time.sleep(0.1)
+        # POST não idempotente não é reenviado
+        with pytest.raises((http.client.HTTPException, ConnectionError)):
+            pool.request('POST', '/third', body=b'x')
+        assert pool.request('POST', '/fourth', body=b'x', idempotent=True).body == b'/fourth'
+    finally:
+        pool.close()
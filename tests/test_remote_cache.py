@@ -0,0 +1,68 @@
+import http.client
+import json
+import threading
+
+import pytest
+
+from cache_store import SQLiteCacheStore
+from remote_cache import CacheServer, RemoteCache
+
+
+@pytest.fixture
+def server(tmp_path):
+    store = SQLiteCacheStore(tmp_path / "server.sqlite3")
+    server = CacheServer(('127.0.0.1', 0), store)
+    thread = threading.Thread(target=server.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+    store.close()
+
+
+def _url(server) -> str:
+    return f"http://127.0.0.1:{server.server_address[1]}"
+
+
+def test_round_trip(server):
+    client = RemoteCache(_url(server))
+    try:
+        client.put_many('en', 'pt', {'Sword': 'Espada', 'Axe': 'Machado'})
+        assert client.flush()
+        assert client.get_many('en', 'pt', ['Sword', 'Axe', 'Bow']) == {'Sword': 'Espada', 'Axe': 'Machado'}
+        assert client.stats.sent == 2
+        assert (client.stats.lookups, client.stats.hits) == (3, 2)
+    finally:
+        client.close()
+
+
+@pytest.mark.parametrize("method, path, payload", [
+    ('POST', '/lookup', {'src': 'en', 'dest': 'pt', 'texts': 'Sword'}),
+    ('POST', '/lookup', {'src': 'en', 'dest': 'pt', 'texts': [1]}),
+    ('PUT', '/entries', {'src': 'en', 'dest': 'pt', 'translations': ['Sword']}),
+    ('PUT', '/entries', {'src': 'en', 'dest': 'pt', 'translations': {'Sword': None}}),
+])
+def test_invalid_payload_is_rejected(server, method, path, payload):
+    conn = http.client.HTTPConnection('127.0.0.1', server.server_address[1], timeout=5)
+    try:
+        conn.request(method, path, json.dumps(payload))
+        response = conn.getresponse()
+        response.read()
+        assert response.status == 400
+    finally:
+        conn.close()
+
+
+def test_flush_returns_when_send_fails(server):
+    client = RemoteCache(_url(server))
+
+    def broken(pending):
+        raise RuntimeError("falha inesperada")
+
+    client._send = broken
+    try:
+        client.put_many('en', 'pt', {'Sword': 'Espada'})
+        assert client.flush(timeout=5)
+        assert client.stats.dropped == 1
+    finally:
+        client.close()
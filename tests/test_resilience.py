@@ -0,0 +1,173 @@
+import asyncio
+import random
+
+import pytest
+
+from resilience import BackoffPolicy, CircuitBreaker, RateLimiter, TokenBucket
+from translation_backends import (BackendError, CircuitBreakerBackend, CircuitOpenError, RateLimitedBackend,
+                                  SimulatedBackend, ThrottledError)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+    def advance(self, seconds: float) -> None:
+        self.now += seconds
+
+
+def test_token_bucket_wait_grows_with_debt():
+    clock = FakeClock()
+    bucket = TokenBucket(rate=10, clock=clock)
+    assert [bucket.reserve() for _ in range(10)] == [0.0] * 10
+    assert bucket.reserve() == pytest.approx(0.1)
+    assert bucket.reserve() == pytest.approx(0.2)
+    clock.advance(0.2)
+    assert bucket.reserve() == pytest.approx(0.1)
+    # Parado, o saldo volta só até a capacidade
+    clock.advance(60)
+    assert [bucket.reserve() for _ in range(10)] == [0.0] * 10
+    assert bucket.reserve() > 0
+
+
+def test_rate_limiter_uses_the_slowest_budget():
+    clock = FakeClock()
+    limiter = RateLimiter(requests_per_second=100, chars_per_second=1000, clock=clock)
+    assert limiter.reserve(chars=1000) == 0.0
+    assert limiter.reserve(chars=500) == pytest.approx(0.5)
+    assert RateLimiter(clock=clock).reserve(chars=10 ** 6) == 0.0
+
+
+def test_pause_is_a_floor_for_every_caller():
+    clock = FakeClock()
+    limiter = RateLimiter(clock=clock)
+    limiter.pause(None)
+    limiter.pause(0)
+    assert limiter.reserve() == 0.0
+    limiter.pause(2.0)
+    # Um Retry-After menor não encurta a pausa em curso
+    limiter.pause(1.0)
+    assert limiter.reserve() == pytest.approx(2.0)
+    clock.advance(1.5)
+    assert limiter.reserve() == pytest.approx(0.5)
+    clock.advance(1.0)
+    assert limiter.reserve() == 0.0
+
+
+def test_throttled_response_pauses_the_shared_limiter():
+    clock = FakeClock()
+    limiter = RateLimiter(clock=clock)
+    backend = RateLimitedBackend(
+        SimulatedBackend(latency='fixed', mean_ms=0, throttle_rate=1.0, retry_after=3.0), limiter)
+    with pytest.raises(ThrottledError):
+        backend.translate("Sword", 'en', 'pt')
+    assert limiter.reserve() == pytest.approx(3.0)
+
+
+def test_backoff_jitter_stays_within_exponential_ceiling():
+    policy = BackoffPolicy(base_delay=0.5, factor=2.0, max_delay=5.0, rng=random.Random(1))
+    for attempt in range(8):
+        ceiling = min(5.0, 0.5 * 2.0 ** attempt)
+        delays = [policy.delay(attempt) for _ in range(500)]
+        assert all(0.0 <= d <= ceiling for d in delays)
+        # Full jitter: espalhado pelo intervalo inteiro, não colado no teto
+        assert min(delays) < ceiling * 0.1 and max(delays) > ceiling * 0.9
+
+
+def test_backoff_respects_retry_after_up_to_max_delay():
+    policy = BackoffPolicy(base_delay=0.1, factor=2.0, max_delay=5.0, rng=random.Random(2))
+    assert all(policy.delay(0, retry_after=3.0) >= 3.0 for _ in range(100))
+    assert all(policy.delay(0, retry_after=60.0) <= 5.0 for _ in range(100))
+
+
+def _breaker(clock, threshold=3, timeout=30.0):
+    return CircuitBreaker(failure_threshold=threshold, reset_timeout=timeout, clock=clock)
+
+
+def test_breaker_opens_after_consecutive_failures():
+    breaker = _breaker(FakeClock())
+    for _ in range(2):
+        assert breaker.allow()
+        breaker.record_failure()
+    assert breaker.state == CircuitBreaker.CLOSED
+    # Um sucesso zera a contagem
+    breaker.record_success()
+    for _ in range(3):
+        assert breaker.allow()
+        breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+    assert breaker.times_opened == 1
+    assert not breaker.allow()
+
+
+def test_breaker_half_open_lets_one_probe_through():
+    clock = FakeClock()
+    breaker = _breaker(clock, threshold=1)
+    breaker.record_failure()
+    clock.advance(29)
+    assert not breaker.allow()
+    clock.advance(1)
+    assert breaker.allow()
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    assert not breaker.allow()
+    breaker.record_success()
+    assert breaker.state == CircuitBreaker.CLOSED
+    assert breaker.allow() and breaker.allow()
+
+
+def test_failed_probe_reopens_for_a_full_timeout():
+    clock = FakeClock()
+    breaker = _breaker(clock, threshold=5)
+    for _ in range(5):
+        breaker.record_failure()
+    clock.advance(30)
+    assert breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+    assert breaker.times_opened == 2
+    clock.advance(29)
+    assert not breaker.allow()
+    clock.advance(1)
+    assert breaker.allow()
+
+
+def test_cancelled_probe_frees_the_slot():
+    clock = FakeClock()
+    breaker = _breaker(clock, threshold=1)
+    backend = CircuitBreakerBackend(
+        SimulatedBackend(latency='fixed', mean_ms=10_000), breaker)
+    breaker.record_failure()
+    clock.advance(30)
+
+    async def cancel_probe():
+        probe = asyncio.ensure_future(backend.atranslate("Sword", 'en', 'pt'))
+        await asyncio.sleep(0.01)
+        probe.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await probe
+
+    asyncio.run(cancel_probe())
+    # Sem resultado: continua meio aberto, mas a próxima sonda pode sair
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    assert breaker.allow()
+
+
+def test_breaker_backend_fails_fast_while_open():
+    clock = FakeClock()
+    breaker = _breaker(clock, threshold=2)
+    backend = CircuitBreakerBackend(SimulatedBackend(latency='fixed', mean_ms=0, error_rate=1.0), breaker)
+    for _ in range(2):
+        with pytest.raises(BackendError):
+            backend.translate("Sword", 'en', 'pt')
+    with pytest.raises(CircuitOpenError):
+        backend.translate("Sword", 'en', 'pt')
+    assert backend.inner.calls == 2
+    # 429 mostra que o serviço está de pé: fecha o circuito
+    backend.inner.error_rate, backend.inner.throttle_rate = 0.0, 1.0
+    clock.advance(30)
+    with pytest.raises(ThrottledError):
+        backend.translate("Sword", 'en', 'pt')
+    assert breaker.state == CircuitBreaker.CLOSED
@@ -0,0 +1,75 @@
+import random
+import re
+
+import pytest
+
+from skip_rules import SkipRules, load_rules
+
+
+# Predicados originais (antes dos perfis), copiados como referência
+def baseline_universal_should_skip(text):
+    if not text or not isinstance(text, str):
+        return True
+    text = text.strip()
+    if len(text) < 2 or text.isdigit() or text.replace('.', '').isdigit():
+        return True
+    if any(x in text for x in ['http://', 'https://', 'www.', '@', 'C:\\', '/']):
+        return True
+    if text.count('_') >= 2 and re.match(r'^[\w\-\[\]]+$', text):
+        return True
+    tech_patterns = ['piece_', 'rae_', 'sapling_', 'Pickable_', 'IG_', '_TW', '_id', '_ID', 'config_', 'mod_']
+    if any(text.startswith(p) or text.endswith(p) for p in tech_patterns):
+        return True
+    return False
+
+
+def baseline_valheim_should_skip_key(norm_key):
+    if len(norm_key) < 3:
+        return True
+    if norm_key.startswith('$'):
+        return True
+    if norm_key.startswith(('piece_', 'rae_', 'Ymir', 'RuneSphere_', 'IG_', 'sapling_', 'Pickable_',
+                            'PineTree_', 'Ashwood_', 'Yagluth')):
+        return True
+    if norm_key.endswith('_TW'):
+        return True
+    if norm_key.count('_') >= 2 and re.fullmatch(r"[\w\-\[\]]+", norm_key):
+        return True
+    return False
+
+
+SAMPLES = [
+    "", " ", "a", "ab", "abc", " ab ", "  a  ", "42", "3.14", "1.2.3", "١٢٣", "²", "12 34",
+    "Iron Sword", "Hello, world!", "Open the door", "https://example.com", "see www.site.org",
+    "user@mail.com", "C:\\Games\\mod", "path/to/file", "piece_wood", "rae_Helmet", "sapling_birch",
+    "Pickable_Stone", "IG_Item", "item_TW", "sword_id", "sword_ID", "config_x", "mod_name", "xmod_",
+    "$item_sword", "$ab", "Ymir flesh", "RuneSphere_1", "PineTree_log", "Ashwood_bow", "Yagluth thing",
+    "item_sword_01", "a_b_c", "a_b", "a_b c_d", "[Tag]_x_y", "some-id_with_dash", "Ação_café_pão",
+    "line\nbreak", "tab\there", "trailing_id\n", " $x", "x ", "_TW", "__", "a__", "Sword\u00a0of_a_b",
+]
+
+FRAGMENTS = ["Sword", "of", " ", "_", "-", "$", ".", "/", "@", "1", "23", "piece_", "_TW", "_id",
+             "Ymir", "[", "]", "é", "\t", "www.", "mod_", "IG_", "x"]
+
+
+def _corpus():
+    rng = random.Random(1234)
+    generated = ["".join(rng.choice(FRAGMENTS) for _ in range(rng.randint(0, 6))) for _ in range(5000)]
+    return SAMPLES + generated
+
+
+@pytest.mark.parametrize("profile, reference", [
+    ('default', baseline_universal_should_skip),
+    ('valheim', baseline_valheim_should_skip_key),
+])
+def test_builtin_profiles_match_original_predicates(profile, reference, tmp_path):
+    rules = load_rules(profile, tmp_path / "missing.json")
+    corpus = _corpus()
+    expected = {text for text in corpus if reference(text)}
+    assert rules.skipped(corpus) == expected
+    assert {text for text in corpus if rules.should_skip(text)} == expected
+
+
+def test_profile_patterns_match_whole_text():
+    rules = SkipRules({'min_length': 2, 'patterns': [r'[A-Z]\w+Def']}, 'custom')
+    assert rules.skipped(["ThingDef", "Thing Def", "a", "Plain text", "ThingDefs here"]) == {"ThingDef", "a"}
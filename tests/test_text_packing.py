@@ -0,0 +1,51 @@
+from async_engine import AsyncTranslationEngine
+from resilience import BackoffPolicy
+from text_packing import TextPacker
+from translation_backends import SimulatedBackend
+
+
+def test_pack_respects_char_and_item_limits():
+    packer = TextPacker(max_chars=20, max_items=3)
+    texts = ["aaaa", "bbbb", "cccc", "dddd", "eeeeeeeeeeeeeee", "ff"]
+    packs = packer.pack(texts)
+    assert [text for pack in packs for text in pack] == texts
+    for pack in packs:
+        assert len(pack) <= 3
+        assert len(packer.SEPARATOR.join(pack)) <= 20
+    assert packs[0] == ["aaaa", "bbbb", "cccc"]
+
+
+def test_texts_that_cannot_be_packed_go_alone():
+    packer = TextPacker(max_chars=20)
+    texts = ["short", "two\nlines", " padded ", "x" * 25, "other"]
+    packs = packer.pack(texts)
+    for text in ("two\nlines", " padded ", "x" * 25):
+        assert [text] in packs
+    assert ["short", "other"] in packs
+    assert sorted(text for pack in packs for text in pack) == sorted(texts)
+
+
+def test_split_aligned_response():
+    packer = TextPacker()
+    assert packer.split(["Sword", "Axe"], "Espada\nMachado\n") == ["Espada", "Machado"]
+    assert packer.split(["Sword", "Axe"], " Espada \n Machado") == ["Espada", "Machado"]
+
+
+def test_split_rejects_misaligned_or_mangled_response():
+    packer = TextPacker()
+    pack = ["Sword", "Axe", "Bow"]
+    # Linhas juntadas, linha a mais, linha vazia no meio, separador trocado
+    for response in ("Espada Machado\nArco", "Espada\nMachado\nArco\nExtra",
+                     "Espada\n\nArco", "Espada | Machado | Arco"):
+        assert packer.split(pack, response) is None
+
+
+def test_misaligned_packs_fall_back_to_one_text_per_request():
+    backend = SimulatedBackend(latency='fixed', mean_ms=0, misalign_rate=1.0)
+    engine = AsyncTranslationEngine(backend, backoff=BackoffPolicy(retries=1))
+    texts = [f"Item {i}" for i in range(10)]
+    results, failed, rejected = engine.translate_units([texts], 'en', 'pt')
+    assert results == {text: f"[pt] {text}" for text in texts}
+    assert failed == rejected == []
+    assert engine.misaligned_packs == 1
+    assert engine.requests == 1 + len(texts)
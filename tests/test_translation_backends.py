@@ -0,0 +1,81 @@
+import pytest
+
+from translation_backends import (BackendError, RecordReplayBackend, SimulatedBackend, ThrottledError,
+                                  create_backend, pseudo_translate)
+
+
+def _outcomes(backend, n):
+    """Sequência de resultados do simulador: 'ok', 'error' ou 'throttled'"""
+    outcomes = []
+    for i in range(n):
+        try:
+            backend.translate(f"text {i}", 'en', 'pt')
+            outcomes.append('ok')
+        except ThrottledError:
+            outcomes.append('throttled')
+        except BackendError:
+            outcomes.append('error')
+    return outcomes
+
+
+def test_simulator_is_deterministic_with_seed():
+    def make():
+        return SimulatedBackend(latency='lognormal', mean_ms=50, error_rate=0.2, throttle_rate=0.1, seed=7)
+    first, second = make(), make()
+    assert [first.sample_latency("abc") for _ in range(20)] == [second.sample_latency("abc") for _ in range(20)]
+    fast = dict(latency='fixed', mean_ms=0, error_rate=0.2, throttle_rate=0.1, seed=7)
+    assert _outcomes(SimulatedBackend(**fast), 200) == _outcomes(SimulatedBackend(**fast), 200)
+
+
+def test_simulator_latency_models():
+    fixed = SimulatedBackend(latency='fixed', mean_ms=100, per_char_ms=1)
+    assert fixed.sample_latency("x" * 10) == pytest.approx(0.11)
+    uniform = SimulatedBackend(latency='uniform', mean_ms=100, seed=1)
+    assert all(0.0 <= uniform.sample_latency("") <= 0.2 for _ in range(200))
+    for model in ('exponential', 'lognormal'):
+        backend = SimulatedBackend(latency=model, mean_ms=100, seed=1)
+        samples = [backend.sample_latency("") for _ in range(5000)]
+        assert sum(samples) / len(samples) == pytest.approx(0.1, rel=0.1)
+    with pytest.raises(ValueError):
+        SimulatedBackend(latency='gaussian')
+
+
+def test_simulator_error_and_throttle_rates():
+    outcomes = _outcomes(SimulatedBackend(latency='fixed', mean_ms=0, error_rate=0.25, seed=3), 2000)
+    assert outcomes.count('error') / len(outcomes) == pytest.approx(0.25, abs=0.04)
+    assert 'throttled' not in outcomes
+    assert set(_outcomes(SimulatedBackend(latency='fixed', mean_ms=0, error_rate=1.0), 50)) == {'error'}
+    throttling = SimulatedBackend(latency='fixed', mean_ms=0, throttle_rate=1.0, retry_after=2.5)
+    with pytest.raises(ThrottledError) as info:
+        throttling.translate("text", 'en', 'pt')
+    assert info.value.retry_after == 2.5
+
+
+def test_simulator_translates_line_by_line():
+    backend = SimulatedBackend(latency='fixed', mean_ms=0)
+    assert backend.translate("Sword\nAxe", 'en', 'pt') == "[pt] Sword\n[pt] Axe"
+    with pytest.raises(BackendError):
+        SimulatedBackend(latency='fixed', mean_ms=0, max_chars_per_request=5).translate("too long", 'en', 'pt')
+
+
+def test_record_then_replay(tmp_path):
+    path = str(tmp_path / "recording.jsonl")
+    texts = [f"text {i}" for i in range(40)]
+    inner = SimulatedBackend(latency='fixed', mean_ms=0, error_rate=0.3, throttle_rate=0.1, seed=5)
+    recorded = _outcomes(RecordReplayBackend(path, inner=inner), len(texts))
+    assert {'ok', 'error', 'throttled'} <= set(recorded)
+
+    replay = RecordReplayBackend(path)
+    assert _outcomes(replay, len(texts)) == recorded
+    ok = recorded.index('ok')
+    assert replay.translate(texts[ok], 'en', 'pt') == pseudo_translate(texts[ok], 'en', 'pt')
+    # Texto fora da gravação é erro, não uma chamada ao serviço
+    with pytest.raises(BackendError):
+        replay.translate("never recorded", 'en', 'pt')
+
+
+def test_backend_spec_builds_replay(tmp_path):
+    path = tmp_path / "recording.jsonl"
+    record = create_backend(f"record:path={path},inner=sim")
+    assert record.translate("Sword", 'en', 'pt') == "[pt] Sword"
+    assert create_backend(f"replay:path={path}").translate("Sword", 'en', 'pt') == "[pt] Sword"
@@ -0,0 +1,33 @@
+import ValheiMTranslator
+
+TEXTS = [f"Item number {i}" for i in range(40)]
+# Um texto por requisição (max_chars_per_request), latência mínima
+SIM = "sim:latency=fixed,mean_ms=1,max_chars_per_request=20,breaker_threshold=2"
+
+
+def _run(monkeypatch, spec: str) -> str:
+    monkeypatch.setenv("UMT_BACKEND", spec)
+    ValheiMTranslator.main()
+    with open("Traduzido/translations.yaml", encoding="utf-8") as f:
+        return f.read()
+
+
+def test_texts_rejected_during_outage_are_sent_on_next_run(tmp_path, monkeypatch, capsys):
+    for name in ("UMT_REMOTE_CACHE", "UMT_CACHE_LIMITS", "UMT_SKIP_PROFILE"):
+        monkeypatch.delenv(name, raising=False)
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "Original").mkdir()
+    (tmp_path / "Original" / "collected_items.yaml").write_text(
+        "".join(f"{text}: {text}\n" for text in TEXTS), encoding="utf-8")
+
+    # Serviço fora do ar: o disjuntor abre e a maioria nem chega a ser enviada
+    out = _run(monkeypatch, SIM + ",error_rate=1.0")
+    assert "[pt]" not in out
+    assert "Não enviados" in capsys.readouterr().out
+
+    # Serviço de volta: nada foi gravado como falha, tudo é traduzido agora
+    out = _run(monkeypatch, SIM)
+    log = capsys.readouterr().out
+    translated = sum(f"{text}: \"[pt] {text}\"" in out for text in TEXTS)
+    assert translated == len(TEXTS)
+    assert "Nada novo para traduzir" not in log